@@ -2,8 +2,8 @@ from setup_db import get_connection, close_connection
 
 def check_data():
     """Check data in database"""
+    conn = get_connection()
     try:
-        conn = get_connection()
         if not conn:
             print("Cannot connect to database")
             return
@@ -29,10 +29,11 @@ def check_data():
             print(f"   - {record[0]}: ({record[1]}, {record[2]}) - {record[3]}")
         
         cursor.close()
-        close_connection(conn)
         
     except Exception as e:
         print(f"Error: {e}")
+    finally:
+        close_connection(conn)
 
 if __name__ == "__main__":
     check_data()
\ No newline at end of file
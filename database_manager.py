@@ -4,8 +4,8 @@ from setup_db import get_connection, close_connection
 
 def cleanup_old_data(days_to_keep=30):
     """Delete data older than X days"""
+    conn = get_connection()
     try:
-        conn = get_connection()
         if not conn:
             print("Cannot connect to database")
             return False
@@ -38,17 +38,18 @@ def cleanup_old_data(days_to_keep=30):
             print("No old data to delete")
         
         cursor.close()
-        close_connection(conn)
         return True
         
     except Exception as e:
         print(f"Error deleting old data: {e}")
         return False
+    finally:
+        close_connection(conn)
 
 def get_database_stats():
     """Display database statistics"""
+    conn = get_connection()
     try:
-        conn = get_connection()
         if not conn:
             print("Cannot connect to database")
             return
@@ -103,15 +104,16 @@ def get_database_stats():
             print(f"  {date}: {count} records")
         
         cursor.close()
-        close_connection(conn)
         
     except Exception as e:
         print(f"Error fetching statistics: {e}")
+    finally:
+        close_connection(conn)
 
 def remove_duplicates():
     """Delete duplicate data"""
+    conn = get_connection()
     try:
-        conn = get_connection()
         if not conn:
             print("Cannot connect to database")
             return False
@@ -150,17 +152,18 @@ def remove_duplicates():
             print("No duplicate data found")
         
         cursor.close()
-        close_connection(conn)
         return True
         
     except Exception as e:
         print(f"Error deleting duplicates: {e}")
         return False
+    finally:
+        close_connection(conn)
 
 def set_data_retention_limit(max_records=1000):
     """Set maximum record limit"""
+    conn = get_connection()
     try:
-        conn = get_connection()
         if not conn:
             print("Cannot connect to database")
             return False
@@ -188,12 +191,13 @@ def set_data_retention_limit(max_records=1000):
             print(f"Database has {total_count} records, no deletion needed")
         
         cursor.close()
-        close_connection(conn)
         return True
         
     except Exception as e:
         print(f"Error setting data limit: {e}")
         return False
+    finally:
+        close_connection(conn)
 
 def main():
     """Database management menu"""
@@ -1,29 +1,262 @@
 import tkinter as tk
+import tkinter.font as tkfont
 from tkinter import ttk, messagebox, filedialog
 import pandas as pd
 import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import seaborn as sns
 import numpy as np
 from datetime import datetime, timedelta
 import threading
-import subprocess
-import sys
+import bisect
+from functools import lru_cache
+import queue
+from concurrent.futures import ThreadPoolExecutor
 import os
 import json
+import time
 
 # Import project modules with error handling
 try:
-    from setup_db import get_connection, close_connection, setup_database
+    from setup_db import get_connection, close_connection, setup_database, DB_POOL
     from predictor import (load_combined_data, load_data_from_db, train_model, 
                           predict_flood_risk, create_flood_labels, 
                           generate_advanced_training_data)
+    # Crawlers run in-process on a background thread
+    import rainfall_crawler
+    import river_level_crawler
+    import requests
+    from requests.adapters import HTTPAdapter
     IMPORT_SUCCESS = True
 except ImportError as e:
     print(f"Critical import error: {e}. Some features may not work.")
     IMPORT_SUCCESS = False
 
+# Combobox choices shared by every widget that needs them
+LOCATIONS = ("Hanoi", "Ho_Chi_Minh_City", "Da_Nang", "Hue", "Can_Tho", "Hai_Phong", "Nha_Trang")
+LOCATION_DISPLAY = tuple(s.replace("_", " ") for s in LOCATIONS)
+LOCATION_BY_DISPLAY = dict(zip(LOCATION_DISPLAY, LOCATIONS))
+TREND_VALUES = ("stable", "rising", "falling")
+DATE_RANGES = ("1 day", "7 days", "30 days", "All")
+DATE_RANGE_DAYS = {"1 day": 1, "7 days": 7, "30 days": 30, "All": None}
+
+# Water levels (cm) at which alert levels 1, 2 and 3 start
+ALERT_THRESHOLDS = (180.0, 220.0, 270.0)
+
+# Alert level shift applied for the predicted risk level
+RISK_ALERT_SHIFT = {'HIGH': 1, 'LOW': -1}
+
+# Rows in one Excel worksheet, header included
+EXCEL_MAX_ROWS = 1048576
+
+# Flood probability (0-1) used when the model gives no combined score
+FALLBACK_PROB = {'LOW': 0.15, 'MODERATE': 0.50, 'HIGH': 0.85}
+
+# Pie chart labels and colors indexed by risk class
+RISK_LEVEL_LABELS = np.array(['LOW', 'MODERATE', 'HIGH'])
+RISK_LEVEL_COLORS = np.array(['green', 'orange', 'red'])
+FLOOD_RISK_LABELS = np.array(['No Flood', 'Flood'])
+FLOOD_RISK_COLORS = np.array(['green', 'red'])
+
+@lru_cache(maxsize=None)
+def _font(family, size, weight='normal'):
+    """Return a shared Tk font so each family/size/weight is resolved only once"""
+    return tkfont.Font(family=family, size=size, weight=weight)
+
+class AsyncFigureCanvasTkAgg(FigureCanvasTkAgg):
+    """Tk canvas that rasterizes the figure on a worker thread"""
+    
+    def __init__(self, figure, master=None):
+        super().__init__(figure, master)
+        self._render_queue = queue.Queue()
+        # Reentrant so blit_animated can run inside a mutating() block
+        self._render_lock = threading.RLock()
+        self._backgrounds = {}
+        self._layout_pending = False
+        threading.Thread(target=self._render_worker, daemon=True).start()
+
+    def mutating(self):
+        """Context manager that keeps the render worker off the figure while it is changed"""
+        return self._render_lock
+
+    def resize(self, event):
+        """Resize the figure only while the render worker is not drawing it"""
+        with self.mutating():
+            super().resize(event)
+
+    def _update_device_pixel_ratio(self, event=None):
+        """Change the figure dpi only while the render worker is not drawing it"""
+        with self.mutating():
+            super()._update_device_pixel_ratio(event)
+
+    def draw_idle(self, layout=False):
+        """Queue an Agg render once Tk is idle; repeated requests collapse into one"""
+        # tight_layout is run by the render worker, just before it draws
+        self._layout_pending |= layout
+        if self._idle_draw_id:
+            return
+        
+        def queue_render(*args):
+            self._idle_draw_id = None
+            if self._render_queue.empty():
+                self._render_queue.put(None)
+        
+        self._idle_draw_id = self._tkcanvas.after_idle(queue_render)
+
+    def _render_worker(self):
+        """Render queued requests and hand the finished buffer to Tk"""
+        while True:
+            self._render_queue.get()
+            try:
+                with self._render_lock:
+                    if self._layout_pending:
+                        self._layout_pending = False
+                        self.figure.tight_layout()
+                    FigureCanvasAgg.draw(self)
+                    self._draw_animated()
+                self._tkcanvas.after(0, self._blit_buffer)
+            except Exception as e:
+                print(f"Error rendering chart: {e}")
+
+    def _blit_buffer(self):
+        """Copy the rendered RGBA buffer into the Tk PhotoImage"""
+        with self._render_lock:
+            self.blit()
+
+    def _draw_animated(self):
+        """Cache each axes background, then draw its animated artists on top"""
+        self._backgrounds = {}
+        for ax in self.figure.axes:
+            animated = [artist for artist in ax.get_children() if artist.get_animated()]
+            if animated:
+                self._backgrounds[ax] = self.copy_from_bbox(ax.bbox)
+                for artist in animated:
+                    ax.draw_artist(artist)
+
+    def blit_animated(self, axes):
+        """Redraw only the animated artists of axes; False if a full draw is needed"""
+        if self._idle_draw_id or not self._render_queue.empty():
+            return False
+        if not all(ax in self._backgrounds for ax in axes):
+            return False
+        
+        with self._render_lock:
+            for ax in axes:
+                self.restore_region(self._backgrounds[ax])
+                for artist in ax.get_children():
+                    if artist.get_animated():
+                        ax.draw_artist(artist)
+                self.blit(ax.bbox)
+        return True
+
 class FloodPredictionGUI:
+    # Seconds a report result set is reused before querying again
+    REPORT_CACHE_TTL = 300
+    
+    # Rows removed by Cleanup; the daily rollup drops the days whose raw data is gone
+    _CLEANUP_CONDITIONS = {
+        'rainfall_data': "created_at < DATE_SUB(NOW(), INTERVAL 90 DAY)",
+        'river_level_data': "created_at < DATE_SUB(NOW(), INTERVAL 90 DAY)",
+        'daily_correlation': "day < CURDATE() - INTERVAL 90 DAY",
+    }
+    
+    # Insert for one prediction row, built once for every save
+    _INSERT_PREDICTION_SQL = """
+        INSERT INTO flood_predictions 
+        (location_name, prediction_time, risk_level, probability, 
+         weather_factor, river_factor, combined_score,
+         rainfall_1h, rainfall_3h, water_level, 
+         alert_level_exceeded, recommendations, model_version)
+        VALUES (%s, NOW(), %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+    """
+    
+    # Report datasets, each filtered BETWEEN a (start, end) pair
+    _REPORT_QUERIES = (
+        # Chart 1: Daily average rainfall
+        """
+        SELECT DATE(created_at) as date, 
+               AVG(rainfall_1h) as avg_rainfall
+        FROM rainfall_data 
+        WHERE created_at BETWEEN %s AND %s
+        GROUP BY DATE(created_at)
+        ORDER BY date
+        """,
+        # Chart 2: Average water level by location
+        """
+        SELECT location_name, AVG(water_level) as avg_level
+        FROM river_level_data 
+        WHERE created_at BETWEEN %s AND %s
+        GROUP BY location_name
+        ORDER BY avg_level DESC
+        """,
+        # Chart 3: Flood risk distribution
+        """
+        SELECT risk_level, COUNT(*) as count
+        FROM flood_predictions 
+        WHERE prediction_time BETWEEN %s AND %s
+        GROUP BY risk_level
+        """,
+        # Chart 4: Correlation between rainfall and water level (daily rollup kept by the crawlers)
+        """
+        SELECT location_name, avg_rainfall, avg_water
+        FROM daily_correlation
+        WHERE day BETWEEN DATE(%s) AND DATE(%s)
+        LIMIT 100
+        """
+    )
+
+    # Lookup tables and text templates for prediction results
+    ALERT_NAMES = {1: "Low Alert", 2: "Moderate Alert", 3: "High Alert"}
+    RISK_COLORS = {'LOW': '#27ae60', 'MODERATE': '#f39c12', 'HIGH': '#e74c3c'}
+    RISK_INFO = {
+        'LOW': '✓ Low flood risk\nContinue normal activities',
+        'MODERATE': '⚠ Moderate flood risk\nStay alert and monitor situation',
+        'HIGH': '⚠ High flood risk!\nPrepare for evacuation if needed'
+    }
+    
+    _RULE = '=' * 50
+    _RESULT_TEMPLATE = """
+{rule}
+FLOOD RISK PREDICTION RESULT
+{rule}
+
+Location: {location}
+Prediction Time: {time}
+
+INPUT DATA:
+-----------
+Temperature: {temperature:.1f}°C
+Humidity: {humidity:.1f}%
+Pressure: {pressure:.1f} hPa
+Rainfall (1h): {rainfall_1h:.1f} mm
+Rainfall (3h): {rainfall_3h:.1f} mm
+"""
+    _RIVER_TEMPLATE = """
+Water Level: {water_level:.1f} cm
+Flow Rate: {flow_rate:.1f} m³/s
+Trend: {trend}
+"""
+    _PREDICTION_TEMPLATE = """
+PREDICTION RESULT:
+------------------
+Risk Level: {risk_level}
+Flood Probability: {probability:.2f}%
+Alert Level: Level {alert_level} - {alert_name}
+"""
+    _FACTORS_TEMPLATE = """
+RISK FACTORS:
+-------------
+Weather Risk Factor: {weather_factor:.4f}
+River Risk Factor: {river_factor:.4f}
+Combined Risk Score: {combined_score:.4f}
+"""
+    _RECOMMENDATIONS_TEMPLATE = """
+RECOMMENDATIONS:
+----------------
+{recommendations}
+"""
+
     def __init__(self, root):
         self.root = root
         self.root.title("Flood Prediction System")
@@ -36,12 +269,55 @@ class FloodPredictionGUI:
         self.is_advanced = False
         self.current_data = None
         
+        # (y_true, y_pred) on rows the last trained model did not fit on
+        self._eval_set = None
+        
+        # Latest status bar message waiting for the idle flush
+        self._pending_status = None
+        self._status_flush_id = None
+        
         # UI components (init to None to avoid errors)
         self.rainfall_tree = None
         self.river_tree = None
         self.predictions_tree = None
         self.dashboard_fig = None
         self.reports_fig = None
+        self._report_artists = {}
+        
+        # Data treeviews load rows page by page as they are scrolled
+        self._page_size = 25
+        self._pages = {}
+        
+        # Shared database connections
+        self.db_pool = DB_POOL if IMPORT_SUCCESS else None
+        
+        # Data summary SQL, built once the existing tables are known
+        self._summary_sql = None
+        
+        # Last dashboard dataframe and the data version it was loaded at
+        self._df_cache = None
+        self._df_cache_key = None
+        self._last_refresh_key = None
+        
+        # Persistent dashboard artists, redrawn in place between refreshes
+        self._trend_lines = {}
+        self._static_chart_key = None
+        self._charted_df = None
+        self._dashboard_laid_out = False
+        
+        # Report result sets by time range: {range: (data, fetched_at)}
+        self._report_cache = {}
+        self._report_cache_version = 0
+        
+        # HTTP connections kept alive between weather crawls
+        self._http_session = None
+        if IMPORT_SUCCESS:
+            self._http_session = requests.Session()
+            self._http_session.mount('https://', HTTPAdapter(pool_maxsize=16))
+        
+        # Worker threads for database, pandas and training work
+        self._executor = ThreadPoolExecutor(max_workers=2)
+        self._db_executor = ThreadPoolExecutor(max_workers=4)
         
         # Create interface
         self.setup_styles()
@@ -61,13 +337,20 @@ class FloodPredictionGUI:
             style = ttk.Style()
             style.theme_use('clam')
             
+            # Named fonts are resolved by Tk once and shared by every styled widget
+            self._fonts = {
+                'title': _font('Arial', 16, 'bold'),
+                'header': _font('Arial', 12, 'bold'),
+                'body': _font('Arial', 10, 'bold')
+            }
+            
             # Main colors
-            style.configure('Title.TLabel', font=('Arial', 16, 'bold'), foreground='#2c3e50')
-            style.configure('Header.TLabel', font=('Arial', 12, 'bold'), foreground='#34495e')
-            style.configure('Success.TLabel', foreground='#27ae60', font=('Arial', 10, 'bold'))
-            style.configure('Warning.TLabel', foreground='#f39c12', font=('Arial', 10, 'bold'))
-            style.configure('Error.TLabel', foreground='#e74c3c', font=('Arial', 10, 'bold'))
-            style.configure('Accent.TButton', foreground='white', font=('Arial', 10, 'bold'))
+            style.configure('Title.TLabel', font=self._fonts['title'], foreground='#2c3e50')
+            style.configure('Header.TLabel', font=self._fonts['header'], foreground='#34495e')
+            style.configure('Success.TLabel', foreground='#27ae60', font=self._fonts['body'])
+            style.configure('Warning.TLabel', foreground='#f39c12', font=self._fonts['body'])
+            style.configure('Error.TLabel', foreground='#e74c3c', font=self._fonts['body'])
+            style.configure('Accent.TButton', foreground='white', font=self._fonts['body'])
         except Exception as e:
             print(f"Style setup error: {e}")
 
@@ -111,6 +394,10 @@ class FloodPredictionGUI:
             self.notebook = ttk.Notebook(self.root)
             self.notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
             
+            # Rarely used tabs are built the first time they are selected
+            self._lazy_tabs = {}
+            self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
+            
             # Tab 1: Dashboard
             self.create_dashboard_tab()
             
@@ -126,225 +413,215 @@ class FloodPredictionGUI:
             # Tab 5: Settings
             self.create_settings_tab()
         except Exception as e:
+            import traceback
+            print(traceback.format_exc())
             messagebox.showerror("Error", f"Interface creation failed: {str(e)}")
 
     def create_dashboard_tab(self):
         """Dashboard Tab - System Overview"""
-        try:
-            dashboard_frame = ttk.Frame(self.notebook)
-            self.notebook.add(dashboard_frame, text="Dashboard")
-            
-            # Left frame - System information
-            left_frame = ttk.LabelFrame(dashboard_frame, text="System Status", padding=10)
-            left_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5, pady=5)
-            
-            # Database status
-            ttk.Label(left_frame, text="Database Status:", style='Header.TLabel').pack(anchor='w')
-            self.db_status_label = ttk.Label(left_frame, text="Checking...", style='Warning.TLabel')
-            self.db_status_label.pack(anchor='w', pady=(0,10))
-            
-            # Model status
-            ttk.Label(left_frame, text="Model Status:", style='Header.TLabel').pack(anchor='w')
-            self.model_status_label = ttk.Label(left_frame, text="Not Trained", style='Error.TLabel')
-            self.model_status_label.pack(anchor='w', pady=(0,10))
-            
-            # Data summary
-            ttk.Label(left_frame, text="Data Statistics:", style='Header.TLabel').pack(anchor='w')
-            self.data_summary_text = tk.Text(left_frame, height=8, wrap=tk.WORD)
-            result_scroll = ttk.Scrollbar(left_frame, orient="vertical", command=self.data_summary_text.yview)
-            self.data_summary_text.configure(yscrollcommand=result_scroll.set)
-            self.data_summary_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-            result_scroll.pack(side=tk.RIGHT, fill=tk.Y)
-            
-            # Refresh button
-            ttk.Button(left_frame, text="Refresh", command=self.refresh_dashboard).pack(anchor='ne', padx=10, pady=10)
-            
-            # Right frame - Charts
-            right_frame = ttk.LabelFrame(dashboard_frame, text="Overview Charts", padding=10)
-            right_frame.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True, padx=5, pady=5)
-            
-            # Matplotlib figure
-            self.dashboard_fig, self.dashboard_axes = plt.subplots(2, 2, figsize=(8, 6))
-            self.dashboard_fig.suptitle("System Data Statistics")
-            
-            self.dashboard_canvas = FigureCanvasTkAgg(self.dashboard_fig, right_frame)
-            self.dashboard_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-        except Exception as e:
-            messagebox.showerror("Error", f"Dashboard creation failed: {str(e)}")
+        dashboard_frame = ttk.Frame(self.notebook)
+        self.notebook.add(dashboard_frame, text="Dashboard")
+        
+        # Left frame - System information
+        left_frame = ttk.LabelFrame(dashboard_frame, text="System Status", padding=10)
+        left_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5, pady=5)
+        
+        # Database status
+        ttk.Label(left_frame, text="Database Status:", style='Header.TLabel').pack(anchor='w')
+        self.db_status_label = ttk.Label(left_frame, text="Checking...", style='Warning.TLabel')
+        self.db_status_label.pack(anchor='w', pady=(0,10))
+        
+        # Model status
+        ttk.Label(left_frame, text="Model Status:", style='Header.TLabel').pack(anchor='w')
+        self.model_status_label = ttk.Label(left_frame, text="Not Trained", style='Error.TLabel')
+        self.model_status_label.pack(anchor='w', pady=(0,10))
+        
+        # Data summary
+        ttk.Label(left_frame, text="Data Statistics:", style='Header.TLabel').pack(anchor='w')
+        self.data_summary_var = tk.StringVar()
+        ttk.Label(left_frame, textvariable=self.data_summary_var, justify=tk.LEFT,
+                  anchor='nw', wraplength=300).pack(fill=tk.BOTH, expand=True)
+        
+        # Refresh button
+        ttk.Button(left_frame, text="Refresh", command=self.refresh_dashboard).pack(anchor='ne', padx=10, pady=10)
+        
+        # Right frame - Charts
+        right_frame = ttk.LabelFrame(dashboard_frame, text="Overview Charts", padding=10)
+        right_frame.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True, padx=5, pady=5)
+        
+        # Matplotlib figure
+        self.dashboard_fig, self.dashboard_axes = plt.subplots(2, 2, figsize=(8, 6))
+        self.dashboard_fig.suptitle("System Data Statistics")
+        
+        self.dashboard_canvas = AsyncFigureCanvasTkAgg(self.dashboard_fig, right_frame)
+        self.dashboard_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
 
     def create_prediction_tab(self):
         """Prediction Tab - Perform flood prediction"""
-        try:
-            prediction_frame = ttk.Frame(self.notebook)
-            self.notebook.add(prediction_frame, text="Prediction")
-            
-            # Top frame - Input parameters
-            input_frame = ttk.LabelFrame(prediction_frame, text="Enter Prediction Data", padding=10)
-            input_frame.pack(fill=tk.X, padx=10, pady=5)
-            
-            # Create 2 columns for input
-            left_input = ttk.Frame(input_frame)
-            left_input.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=10)
-            
-            right_input = ttk.Frame(input_frame)
-            right_input.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True, padx=10)
-            
-            # Left column - Weather data
-            ttk.Label(left_input, text="Weather Data:", style='Header.TLabel').pack(anchor='w')
-            
-            # Temperature
-            ttk.Label(left_input, text="Temperature (°C):").pack(anchor='w', pady=(10,0))
-            self.temp_var = tk.DoubleVar(value=26.0)
-            temp_frame = ttk.Frame(left_input)
-            temp_frame.pack(fill=tk.X, pady=2)
-            temp_scale = tk.Scale(temp_frame, from_=15, to=40, resolution=0.1, 
-                                 orient=tk.HORIZONTAL, variable=self.temp_var)
-            temp_scale.pack(side=tk.LEFT, fill=tk.X, expand=True)
-            self.temp_value_label = ttk.Label(temp_frame, text="26.0°C", width=8)
-            self.temp_value_label.pack(side=tk.RIGHT)
-            temp_scale.config(command=lambda v: self.temp_value_label.config(text=f"{float(v):.1f}°C"))
-            
-            # Humidity
-            ttk.Label(left_input, text="Humidity (%):").pack(anchor='w', pady=(10,0))
-            self.humidity_var = tk.DoubleVar(value=70.0)
-            humidity_frame = ttk.Frame(left_input)
-            humidity_frame.pack(fill=tk.X, pady=2)
-            humidity_scale = tk.Scale(humidity_frame, from_=20, to=100, resolution=1, 
-                                     orient=tk.HORIZONTAL, variable=self.humidity_var)
-            humidity_scale.pack(side=tk.LEFT, fill=tk.X, expand=True)
-            self.humidity_value_label = ttk.Label(humidity_frame, text="70%", width=8)
-            self.humidity_value_label.pack(side=tk.RIGHT)
-            humidity_scale.config(command=lambda v: self.humidity_value_label.config(text=f"{int(float(v))}%"))
-            
-            # Pressure
-            ttk.Label(left_input, text="Pressure (hPa):").pack(anchor='w', pady=(10,0))
-            self.pressure_var = tk.DoubleVar(value=1013.0)
-            pressure_frame = ttk.Frame(left_input)
-            pressure_frame.pack(fill=tk.X, pady=2)
-            pressure_scale = tk.Scale(pressure_frame, from_=950, to=1050, resolution=1, 
-                                     orient=tk.HORIZONTAL, variable=self.pressure_var)
-            pressure_scale.pack(side=tk.LEFT, fill=tk.X, expand=True)
-            self.pressure_value_label = ttk.Label(pressure_frame, text="1013hPa", width=8)
-            self.pressure_value_label.pack(side=tk.RIGHT)
-            pressure_scale.config(command=lambda v: self.pressure_value_label.config(text=f"{int(float(v))}hPa"))
-            
-            # Rainfall 1h
-            ttk.Label(left_input, text="Rainfall 1h (mm):").pack(anchor='w', pady=(10,0))
-            self.rainfall_1h_var = tk.DoubleVar(value=0.0)
-            rainfall_1h_frame = ttk.Frame(left_input)
-            rainfall_1h_frame.pack(fill=tk.X, pady=2)
-            rainfall_1h_scale = tk.Scale(rainfall_1h_frame, from_=0, to=100, resolution=0.1, 
-                                     orient=tk.HORIZONTAL, variable=self.rainfall_1h_var)
-            rainfall_1h_scale.pack(side=tk.LEFT, fill=tk.X, expand=True)
-            self.rainfall_1h_value_label = ttk.Label(rainfall_1h_frame, text="0.0mm", width=8)
-            self.rainfall_1h_value_label.pack(side=tk.RIGHT)
-            rainfall_1h_scale.config(command=lambda v: self.rainfall_1h_value_label.config(text=f"{float(v):.1f}mm"))
-            
-            # Rainfall 3h
-            ttk.Label(left_input, text="Rainfall 3h (mm):").pack(anchor='w', pady=(10,0))
-            self.rainfall_3h_var = tk.DoubleVar(value=0.0)
-            rainfall_3h_frame = ttk.Frame(left_input)
-            rainfall_3h_frame.pack(fill=tk.X, pady=2)
-            rainfall_3h_scale = tk.Scale(rainfall_3h_frame, from_=0, to=300, resolution=0.5, 
-                                     orient=tk.HORIZONTAL, variable=self.rainfall_3h_var)
-            rainfall_3h_scale.pack(side=tk.LEFT, fill=tk.X, expand=True)
-            self.rainfall_3h_value_label = ttk.Label(rainfall_3h_frame, text="0.0mm", width=8)
-            self.rainfall_3h_value_label.pack(side=tk.RIGHT)
-            rainfall_3h_scale.config(command=lambda v: self.rainfall_3h_value_label.config(text=f"{float(v):.1f}mm"))
-            
-            # Wind speed
-            ttk.Label(left_input, text="Wind Speed (km/h):").pack(anchor='w', pady=(10,0))
-            self.wind_var = tk.DoubleVar(value=10.0)
-            wind_frame = ttk.Frame(left_input)
-            wind_frame.pack(fill=tk.X, pady=2)
-            wind_scale = tk.Scale(wind_frame, from_=0, to=100, resolution=1, 
-                                 orient=tk.HORIZONTAL, variable=self.wind_var)
-            wind_scale.pack(side=tk.LEFT, fill=tk.X, expand=True)
-            self.wind_value_label = ttk.Label(wind_frame, text="10km/h", width=8)
-            self.wind_value_label.pack(side=tk.RIGHT)
-            wind_scale.config(command=lambda v: self.wind_value_label.config(text=f"{int(float(v))}km/h"))
-            
-            # Right column - River data
-            ttk.Label(right_input, text="River Data:", style='Header.TLabel').pack(anchor='w')
-            
-            # Water level
-            ttk.Label(right_input, text="Water Level (cm):").pack(anchor='w', pady=(10,0))
-            self.water_level_var = tk.DoubleVar(value=150.0)
-            water_frame = ttk.Frame(right_input)
-            water_frame.pack(fill=tk.X, pady=2)
-            water_scale = tk.Scale(water_frame, from_=50, to=500, resolution=1, 
-                                  orient=tk.HORIZONTAL, variable=self.water_level_var)
-            water_scale.pack(side=tk.LEFT, fill=tk.X, expand=True)
-            self.water_value_label = ttk.Label(water_frame, text="150cm", width=8)
-            self.water_value_label.pack(side=tk.RIGHT)
-            water_scale.config(command=lambda v: self.water_value_label.config(text=f"{int(float(v))}cm"))
-            
-            # Flow rate
-            ttk.Label(right_input, text="Flow Rate (m³/s):").pack(anchor='w', pady=(10,0))
-            self.flow_rate_var = tk.DoubleVar(value=800.0)
-            flow_frame = ttk.Frame(right_input)
-            flow_frame.pack(fill=tk.X, pady=2)
-            flow_scale = tk.Scale(flow_frame, from_=100, to=3000, resolution=10, 
-                                 orient=tk.HORIZONTAL, variable=self.flow_rate_var)
-            flow_scale.pack(side=tk.LEFT, fill=tk.X, expand=True)
-            self.flow_value_label = ttk.Label(flow_frame, text="800m³/s", width=8)
-            self.flow_value_label.pack(side=tk.RIGHT)
-            flow_scale.config(command=lambda v: self.flow_value_label.config(text=f"{int(float(v))}m³/s"))
-            
-            # Trend
-            ttk.Label(right_input, text="Water Level Trend:").pack(anchor='w', pady=(10,0))
-            self.trend_var = tk.StringVar(value="stable")
-            trend_combo = ttk.Combobox(right_input, textvariable=self.trend_var, 
-                                      values=["stable", "rising", "falling"], state="readonly")
-            trend_combo.pack(fill=tk.X, pady=2)
-            
-            # Location
-            ttk.Label(right_input, text="Location:").pack(anchor='w', pady=(10,0))
-            self.location_var = tk.StringVar(value="Hanoi")
-            location_combo = ttk.Combobox(right_input, textvariable=self.location_var,
-                                         values=["Hanoi", "Ho_Chi_Minh_City", "Da_Nang", 
-                                                "Hue", "Can_Tho", "Hai_Phong", "Nha_Trang"])
-            location_combo.pack(fill=tk.X, pady=2)
-            
-            # Bind event to load data when location is selected
-            location_combo.bind("<<ComboboxSelected>>", self.on_location_selected)
-            
-            # Predict button
-            predict_btn = ttk.Button(right_input, text="PREDICT FLOOD", 
-                                    command=self.perform_prediction, style='Accent.TButton')
-            predict_btn.pack(pady=20, ipadx=20, ipady=10)
-            
-            # Bottom frame - Results
-            result_frame = ttk.LabelFrame(prediction_frame, text="Prediction Results", padding=10)
-            result_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
-            
-            # Left result - Text result
-            left_result = ttk.Frame(result_frame)
-            left_result.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0,10))
-            
-            self.result_text = tk.Text(left_result, height=15, wrap=tk.WORD, font=('Courier', 10))
-            result_scroll = ttk.Scrollbar(left_result, orient="vertical", command=self.result_text.yview)
-            self.result_text.configure(yscrollcommand=result_scroll.set)
-            self.result_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-            result_scroll.pack(side=tk.RIGHT, fill=tk.Y)
-            
-            # Right result - Risk visualization
-            right_result = ttk.LabelFrame(result_frame, text="Visual Display", padding=10)
-            right_result.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True)
-            
-            # Risk level display
-            self.risk_display_frame = ttk.Frame(right_result)
-            self.risk_display_frame.pack(fill=tk.BOTH, expand=True)
-        except Exception as e:
-            messagebox.showerror("Error", f"Prediction tab creation failed: {str(e)}")
+        prediction_frame = ttk.Frame(self.notebook)
+        self.notebook.add(prediction_frame, text="Prediction")
+        
+        # Top frame - Input parameters
+        input_frame = ttk.LabelFrame(prediction_frame, text="Enter Prediction Data", padding=10)
+        input_frame.pack(fill=tk.X, padx=10, pady=5)
+        
+        # Create 2 columns for input
+        left_input = ttk.Frame(input_frame)
+        left_input.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=10)
+        
+        right_input = ttk.Frame(input_frame)
+        right_input.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True, padx=10)
+        
+        # Left column - Weather data
+        ttk.Label(left_input, text="Weather Data:", style='Header.TLabel').pack(anchor='w')
+        
+        # Temperature
+        ttk.Label(left_input, text="Temperature (°C):").pack(anchor='w', pady=(10,0))
+        self.temp_var = tk.DoubleVar(value=26.0)
+        temp_frame = ttk.Frame(left_input)
+        temp_frame.pack(fill=tk.X, pady=2)
+        temp_scale = tk.Scale(temp_frame, from_=15, to=40, resolution=0.1, 
+                             orient=tk.HORIZONTAL, variable=self.temp_var)
+        temp_scale.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        self.temp_value_label = ttk.Label(temp_frame, text="26.0°C", width=8)
+        self.temp_value_label.pack(side=tk.RIGHT)
+        temp_scale.config(command=lambda v: self.temp_value_label.config(text=f"{float(v):.1f}°C"))
+        
+        # Humidity
+        ttk.Label(left_input, text="Humidity (%):").pack(anchor='w', pady=(10,0))
+        self.humidity_var = tk.DoubleVar(value=70.0)
+        ttk.Spinbox(left_input, from_=20, to=100, increment=1,
+                    textvariable=self.humidity_var, width=8).pack(anchor='w', pady=2)
+        
+        # Pressure
+        ttk.Label(left_input, text="Pressure (hPa):").pack(anchor='w', pady=(10,0))
+        self.pressure_var = tk.DoubleVar(value=1013.0)
+        ttk.Spinbox(left_input, from_=950, to=1050, increment=1,
+                    textvariable=self.pressure_var, width=8).pack(anchor='w', pady=2)
+        
+        # Rainfall 1h
+        ttk.Label(left_input, text="Rainfall 1h (mm):").pack(anchor='w', pady=(10,0))
+        self.rainfall_1h_var = tk.DoubleVar(value=0.0)
+        rainfall_1h_frame = ttk.Frame(left_input)
+        rainfall_1h_frame.pack(fill=tk.X, pady=2)
+        rainfall_1h_scale = tk.Scale(rainfall_1h_frame, from_=0, to=100, resolution=0.1, 
+                                 orient=tk.HORIZONTAL, variable=self.rainfall_1h_var)
+        rainfall_1h_scale.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        self.rainfall_1h_value_label = ttk.Label(rainfall_1h_frame, text="0.0mm", width=8)
+        self.rainfall_1h_value_label.pack(side=tk.RIGHT)
+        rainfall_1h_scale.config(command=lambda v: self.rainfall_1h_value_label.config(text=f"{float(v):.1f}mm"))
+        
+        # Rainfall 3h
+        ttk.Label(left_input, text="Rainfall 3h (mm):").pack(anchor='w', pady=(10,0))
+        self.rainfall_3h_var = tk.DoubleVar(value=0.0)
+        rainfall_3h_frame = ttk.Frame(left_input)
+        rainfall_3h_frame.pack(fill=tk.X, pady=2)
+        rainfall_3h_scale = tk.Scale(rainfall_3h_frame, from_=0, to=300, resolution=0.5, 
+                                 orient=tk.HORIZONTAL, variable=self.rainfall_3h_var)
+        rainfall_3h_scale.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        self.rainfall_3h_value_label = ttk.Label(rainfall_3h_frame, text="0.0mm", width=8)
+        self.rainfall_3h_value_label.pack(side=tk.RIGHT)
+        rainfall_3h_scale.config(command=lambda v: self.rainfall_3h_value_label.config(text=f"{float(v):.1f}mm"))
+        
+        # Wind speed
+        ttk.Label(left_input, text="Wind Speed (km/h):").pack(anchor='w', pady=(10,0))
+        self.wind_var = tk.DoubleVar(value=10.0)
+        ttk.Spinbox(left_input, from_=0, to=100, increment=1,
+                    textvariable=self.wind_var, width=8).pack(anchor='w', pady=2)
+        
+        # Right column - River data
+        ttk.Label(right_input, text="River Data:", style='Header.TLabel').pack(anchor='w')
+        
+        # Water level
+        ttk.Label(right_input, text="Water Level (cm):").pack(anchor='w', pady=(10,0))
+        self.water_level_var = tk.DoubleVar(value=150.0)
+        ttk.Spinbox(right_input, from_=50, to=500, increment=1,
+                    textvariable=self.water_level_var, width=8).pack(anchor='w', pady=2)
+        
+        # Flow rate
+        ttk.Label(right_input, text="Flow Rate (m³/s):").pack(anchor='w', pady=(10,0))
+        self.flow_rate_var = tk.DoubleVar(value=800.0)
+        ttk.Spinbox(right_input, from_=100, to=3000, increment=10,
+                    textvariable=self.flow_rate_var, width=8).pack(anchor='w', pady=2)
+        
+        # Trend
+        ttk.Label(right_input, text="Water Level Trend:").pack(anchor='w', pady=(10,0))
+        self.trend_var = tk.StringVar(value="stable")
+        trend_combo = ttk.Combobox(right_input, textvariable=self.trend_var, 
+                                  values=TREND_VALUES, state="readonly")
+        trend_combo.pack(fill=tk.X, pady=2)
+        
+        # Location
+        ttk.Label(right_input, text="Location:").pack(anchor='w', pady=(10,0))
+        self.location_var = tk.StringVar(value="Hanoi")
+        location_combo = ttk.Combobox(right_input, textvariable=self.location_var,
+                                     values=LOCATION_DISPLAY)
+        location_combo.pack(fill=tk.X, pady=2)
+        
+        # Bind event to load data when location is selected
+        location_combo.bind("<<ComboboxSelected>>", self.on_location_selected)
+        
+        # Predict button
+        predict_btn = ttk.Button(right_input, text="PREDICT FLOOD", 
+                                command=self.perform_prediction, style='Accent.TButton')
+        predict_btn.pack(pady=20, ipadx=20, ipady=10)
+        
+        # Bottom frame - Results
+        result_frame = ttk.LabelFrame(prediction_frame, text="Prediction Results", padding=10)
+        result_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        
+        # Left result - Text result
+        left_result = ttk.Frame(result_frame)
+        left_result.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0,10))
+        
+        self.result_text = tk.Text(left_result, height=15, wrap=tk.WORD, font=_font('Courier', 10))
+        result_scroll = ttk.Scrollbar(left_result, orient="vertical", command=self.result_text.yview)
+        self.result_text.configure(yscrollcommand=result_scroll.set)
+        self.result_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        result_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        # Right result - Risk visualization
+        right_result = ttk.LabelFrame(result_frame, text="Visual Display", padding=10)
+        right_result.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True)
+        
+        # Risk level display, reconfigured in place after each prediction
+        self.risk_display_frame = ttk.Frame(right_result)
+        self.risk_display_frame.pack(fill=tk.BOTH, expand=True)
+        
+        self.risk_label = tk.Label(self.risk_display_frame, 
+                                  text="",
+                                  font=_font('Arial', 48, 'bold'),
+                                  bg='white')
+        
+        self.prob_frame = ttk.Frame(self.risk_display_frame)
+        ttk.Label(self.prob_frame, text="Flood Probability:", 
+                 font=_font('Arial', 12, 'bold')).pack()
+        self.risk_progress = ttk.Progressbar(self.prob_frame, length=300, mode='determinate')
+        self.risk_progress.pack(pady=5)
+        self.prob_value_label = ttk.Label(self.prob_frame, text="", 
+                                         font=_font('Arial', 14, 'bold'))
+        self.prob_value_label.pack()
+        
+        self.risk_info_label = tk.Label(self.risk_display_frame,
+                                       text="",
+                                       font=_font('Arial', 11),
+                                       justify=tk.CENTER)
+
+    def selected_location(self):
+        """Return the database name of the location shown in the combobox"""
+        location = self.location_var.get()
+        return LOCATION_BY_DISPLAY.get(location, location)
 
     def on_location_selected(self, event):
         """Load latest river data for selected location and update UI"""
         try:
-            location = self.location_var.get()
+            location = self.selected_location()
             
-            conn = get_connection()
-            if conn:
+            with self.db_pool.acquire() as conn:
+                if not conn:
+                    messagebox.showerror("Error", "Cannot connect to database")
+                    return
+                
                 cursor = conn.cursor()
                 
                 # Query latest river data for the selected location
@@ -359,15 +636,11 @@ class FloodPredictionGUI:
                 if result:
                     water_level, flow_rate, trend = result
                     
-                    # Update slider variables
+                    # Update input variables
                     self.water_level_var.set(float(water_level))
                     self.flow_rate_var.set(float(flow_rate))
                     self.trend_var.set(trend)
                     
-                    # Update slider labels
-                    self.water_value_label.config(text=f"{int(water_level)}cm")
-                    self.flow_value_label.config(text=f"{int(flow_rate)}m³/s")
-                    
                     # Update status
                     self.update_status(f"Loaded data for {location}")
                 else:
@@ -375,14 +648,9 @@ class FloodPredictionGUI:
                     self.water_level_var.set(150.0)
                     self.flow_rate_var.set(800.0)
                     self.trend_var.set("stable")
-                    self.water_value_label.config(text="150cm")
-                    self.flow_value_label.config(text="800m³/s")
                     self.update_status(f"No river data found for {location}, using defaults")
                 
                 cursor.close()
-                close_connection(conn)
-            else:
-                messagebox.showerror("Error", "Cannot connect to database")
                 
         except Exception as e:
             self.update_status("Error loading location data")
@@ -390,271 +658,296 @@ class FloodPredictionGUI:
 
     def create_data_tab(self):
         """Data Tab - Manage and view data"""
-        try:
-            data_frame = ttk.Frame(self.notebook)
-            self.notebook.add(data_frame, text="Data")
-            
-            # Create sub-notebook for Rainfall, River, and Predictions data
-            self.data_notebook = ttk.Notebook(data_frame)
-            self.data_notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
-            
-            # Rainfall Data sub-tab
-            self.create_rainfall_data_subtab()
-            
-            # River Level Data sub-tab
-            self.create_river_data_subtab()
-            
-            # Predictions Data sub-tab
-            self.create_predictions_data_subtab()
-            
-            # Control panel for both sub-tabs
-            control_frame = ttk.LabelFrame(data_frame, text="Data Control", padding=10)
-            control_frame.pack(fill=tk.X, padx=10, pady=5)
-            
-            # Buttons row
-            btn_frame = ttk.Frame(control_frame)
-            btn_frame.pack(fill=tk.X, pady=2)
-            
-            ttk.Button(btn_frame, text="Crawl Weather", 
-                      command=self.crawl_weather_data).pack(side=tk.LEFT, padx=5)
-            ttk.Button(btn_frame, text="Crawl River", 
-                      command=self.crawl_river_data).pack(side=tk.LEFT, padx=5)
-            ttk.Button(btn_frame, text="Refresh All Data", 
-                      command=self.refresh_all_data).pack(side=tk.LEFT, padx=5)
-            ttk.Button(btn_frame, text="Cleanup DB", 
-                      command=self.cleanup_database).pack(side=tk.LEFT, padx=5)
-        except Exception as e:
-            messagebox.showerror("Error", f"Data tab creation failed: {str(e)}")
+        data_frame = ttk.Frame(self.notebook)
+        self.notebook.add(data_frame, text="Data")
+        
+        # Create sub-notebook for Rainfall, River, and Predictions data
+        self.data_notebook = ttk.Notebook(data_frame)
+        self.data_notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        
+        # Rainfall Data sub-tab
+        self.create_rainfall_data_subtab()
+        
+        # River Level Data sub-tab
+        self.create_river_data_subtab()
+        
+        # Predictions Data sub-tab
+        self.create_predictions_data_subtab()
+        
+        # Control panel for both sub-tabs
+        control_frame = ttk.LabelFrame(data_frame, text="Data Control", padding=10)
+        control_frame.pack(fill=tk.X, padx=10, pady=5)
+        
+        # Buttons row
+        btn_frame = ttk.Frame(control_frame)
+        btn_frame.pack(fill=tk.X, pady=2)
+        
+        ttk.Button(btn_frame, text="Crawl Weather", 
+                  command=self.crawl_weather_data).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Crawl River", 
+                  command=self.crawl_river_data).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Refresh All Data", 
+                  command=self.refresh_all_data).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Cleanup DB", 
+                  command=self.cleanup_database).pack(side=tk.LEFT, padx=5)
 
     def create_rainfall_data_subtab(self):
         """Create Rainfall Data sub-tab"""
-        try:
-            rainfall_frame = ttk.Frame(self.data_notebook)
-            self.data_notebook.add(rainfall_frame, text="Rainfall Data")
-            
-            # Control frame for rainfall
-            rainfall_control = ttk.Frame(rainfall_frame)
-            rainfall_control.pack(fill=tk.X, padx=10, pady=5)
-            
-            ttk.Button(rainfall_control, text="Refresh Rainfall Data", 
-                      command=self.refresh_rainfall_data).pack(side=tk.LEFT, padx=5)
-            
-            # Treeview frame
-            tree_frame = ttk.Frame(rainfall_frame)
-            tree_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
-            
-            # Treeview for rainfall data
-            columns = ['Location', 'Time', 'Temperature', 'Humidity', 'Rainfall 1h', 'Rainfall 3h', 'Wind Speed']
-            self.rainfall_tree = ttk.Treeview(tree_frame, columns=columns, show='headings', height=20)
-            
-            # Set column headings and widths
-            column_widths = {'Location': 120, 'Time': 150, 'Temperature': 100, 'Humidity': 80, 
-                            'Rainfall 1h': 100, 'Rainfall 3h': 100, 'Wind Speed': 100}
-            
-            for col in columns:
-                self.rainfall_tree.heading(col, text=col)
-                self.rainfall_tree.column(col, width=column_widths.get(col, 100))
-            
-            # Scrollbars
-            v_scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=self.rainfall_tree.yview)
-            h_scrollbar = ttk.Scrollbar(tree_frame, orient=tk.HORIZONTAL, command=self.rainfall_tree.xview)
-            self.rainfall_tree.configure(yscrollcommand=v_scrollbar.set, xscrollcommand=h_scrollbar.set)
-            
-            # Pack treeview and scrollbars
-            self.rainfall_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-            v_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-            h_scrollbar.pack(side=tk.BOTTOM, fill=tk.X)
-        except Exception as e:
-            messagebox.showerror("Error", f"Rainfall sub-tab creation failed: {str(e)}")
+        rainfall_frame = ttk.Frame(self.data_notebook)
+        self.data_notebook.add(rainfall_frame, text="Rainfall Data")
+        
+        # Control frame for rainfall
+        rainfall_control = ttk.Frame(rainfall_frame)
+        rainfall_control.pack(fill=tk.X, padx=10, pady=5)
+        
+        ttk.Button(rainfall_control, text="Refresh Rainfall Data", 
+                  command=self.refresh_rainfall_data).pack(side=tk.LEFT, padx=5)
+        
+        # Treeview frame
+        tree_frame = ttk.Frame(rainfall_frame)
+        tree_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        
+        # Treeview for rainfall data
+        columns = ['Location', 'Time', 'Temperature', 'Humidity', 'Rainfall 1h', 'Rainfall 3h', 'Wind Speed']
+        self.rainfall_tree = ttk.Treeview(tree_frame, columns=columns, show='headings', height=20)
+        
+        # Set column headings and widths
+        column_widths = {'Location': 120, 'Time': 150, 'Temperature': 100, 'Humidity': 80, 
+                        'Rainfall 1h': 100, 'Rainfall 3h': 100, 'Wind Speed': 100}
+        
+        for col in columns:
+            self.rainfall_tree.heading(col, text=col)
+            self.rainfall_tree.column(col, width=column_widths.get(col, 100))
+        
+        # Scrollbars
+        v_scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=self.rainfall_tree.yview)
+        h_scrollbar = ttk.Scrollbar(tree_frame, orient=tk.HORIZONTAL, command=self.rainfall_tree.xview)
+        self.rainfall_tree.configure(xscrollcommand=h_scrollbar.set,
+                                     yscrollcommand=self.paged_scroll_command(
+                                         v_scrollbar, lambda: self.refresh_rainfall_data(append=True)))
+        
+        # Pack treeview and scrollbars
+        self.rainfall_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        v_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        h_scrollbar.pack(side=tk.BOTTOM, fill=tk.X)
 
     def create_river_data_subtab(self):
         """Create River Level Data sub-tab"""
-        try:
-            river_frame = ttk.Frame(self.data_notebook)
-            self.data_notebook.add(river_frame, text="River Level Data")
-            
-            # Control frame for river
-            river_control = ttk.Frame(river_frame)
-            river_control.pack(fill=tk.X, padx=10, pady=5)
-            
-            ttk.Button(river_control, text="Refresh River Data", 
-                      command=self.refresh_river_data).pack(side=tk.LEFT, padx=5)
-            
-            # Treeview frame
-            tree_frame = ttk.Frame(river_frame)
-            tree_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
-            
-            # Treeview for river data
-            columns = ['Location', 'Time', 'Water Level', 'Flow Rate', 'Trend']
-            self.river_tree = ttk.Treeview(tree_frame, columns=columns, show='headings', height=20)
-            
-            # Set column headings and widths
-            column_widths = {'Location': 120, 'Time': 150, 'Water Level': 100, 'Flow Rate': 100, 'Trend': 80}
-            
-            for col in columns:
-                self.river_tree.heading(col, text=col)
-                self.river_tree.column(col, width=column_widths.get(col, 100))
-            
-            # Scrollbars
-            v_scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=self.river_tree.yview)
-            h_scrollbar = ttk.Scrollbar(tree_frame, orient=tk.HORIZONTAL, command=self.river_tree.xview)
-            self.river_tree.configure(yscrollcommand=v_scrollbar.set, xscrollcommand=h_scrollbar.set)
-            
-            # Pack treeview and scrollbars
-            self.river_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-            v_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-            h_scrollbar.pack(side=tk.BOTTOM, fill=tk.X)
-        except Exception as e:
-            messagebox.showerror("Error", f"River sub-tab creation failed: {str(e)}")
+        river_frame = ttk.Frame(self.data_notebook)
+        self.data_notebook.add(river_frame, text="River Level Data")
+        
+        # Control frame for river
+        river_control = ttk.Frame(river_frame)
+        river_control.pack(fill=tk.X, padx=10, pady=5)
+        
+        ttk.Button(river_control, text="Refresh River Data", 
+                  command=self.refresh_river_data).pack(side=tk.LEFT, padx=5)
+        
+        # Treeview frame
+        tree_frame = ttk.Frame(river_frame)
+        tree_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        
+        # Treeview for river data
+        columns = ['Location', 'Time', 'Water Level', 'Flow Rate', 'Trend']
+        self.river_tree = ttk.Treeview(tree_frame, columns=columns, show='headings', height=20)
+        
+        # Set column headings and widths
+        column_widths = {'Location': 120, 'Time': 150, 'Water Level': 100, 'Flow Rate': 100, 'Trend': 80}
+        
+        for col in columns:
+            self.river_tree.heading(col, text=col)
+            self.river_tree.column(col, width=column_widths.get(col, 100))
+        
+        # Scrollbars
+        v_scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=self.river_tree.yview)
+        h_scrollbar = ttk.Scrollbar(tree_frame, orient=tk.HORIZONTAL, command=self.river_tree.xview)
+        self.river_tree.configure(xscrollcommand=h_scrollbar.set,
+                                  yscrollcommand=self.paged_scroll_command(
+                                      v_scrollbar, lambda: self.refresh_river_data(append=True)))
+        
+        # Pack treeview and scrollbars
+        self.river_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        v_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        h_scrollbar.pack(side=tk.BOTTOM, fill=tk.X)
 
     def create_predictions_data_subtab(self):
         """Create Predictions Data sub-tab"""
-        try:
-            predictions_frame = ttk.Frame(self.data_notebook)
-            self.data_notebook.add(predictions_frame, text="Predictions")
-            
-            # Treeview for predictions
-            columns = ('Location', 'Time', 'Risk', 'Probability', 'Water Level', 
-                      'Rain 1h', 'Rain 3h', 'Alert Level', 'Version')
-            self.predictions_tree = ttk.Treeview(predictions_frame, columns=columns, show='headings')
-            
-            # Define headings
-            column_widths = {
-                'Location': 100,
-                'Time': 150,
-                'Risk': 80,
-                'Probability': 90,
-                'Water Level': 90,
-                'Rain 1h': 80,
-                'Rain 3h': 80,
-                'Alert Level': 120,
-                'Version': 100
-            }
-            
-            for col in columns:
-                self.predictions_tree.heading(col, text=col)
-                self.predictions_tree.column(col, width=column_widths.get(col, 80))
-            
-            self.predictions_tree.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
-            
-            # Scrollbar
-            scrollbar = ttk.Scrollbar(predictions_frame, orient=tk.VERTICAL, 
-                                     command=self.predictions_tree.yview)
-            scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-            self.predictions_tree.configure(yscrollcommand=scrollbar.set)
-            
-            # Refresh button
-            ttk.Button(predictions_frame, text="Refresh", 
-                      command=self.refresh_predictions_data).pack(pady=5)
-            
-        except Exception as e:
-            print(f"Error creating predictions tab: {e}")
+        predictions_frame = ttk.Frame(self.data_notebook)
+        self.data_notebook.add(predictions_frame, text="Predictions")
+        
+        # Treeview for predictions
+        columns = ('Location', 'Time', 'Risk', 'Probability', 'Water Level', 
+                  'Rain 1h', 'Rain 3h', 'Alert Level', 'Version')
+        self.predictions_tree = ttk.Treeview(predictions_frame, columns=columns, show='headings')
+        
+        # Define headings
+        column_widths = {
+            'Location': 100,
+            'Time': 150,
+            'Risk': 80,
+            'Probability': 90,
+            'Water Level': 90,
+            'Rain 1h': 80,
+            'Rain 3h': 80,
+            'Alert Level': 120,
+            'Version': 100
+        }
+        
+        for col in columns:
+            self.predictions_tree.heading(col, text=col)
+            self.predictions_tree.column(col, width=column_widths.get(col, 80))
+        
+        self.predictions_tree.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        
+        # Scrollbar
+        scrollbar = ttk.Scrollbar(predictions_frame, orient=tk.VERTICAL, 
+                                 command=self.predictions_tree.yview)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.predictions_tree.configure(yscrollcommand=self.paged_scroll_command(
+            scrollbar, lambda: self.refresh_predictions_data(append=True)))
+        
+        # Refresh button
+        ttk.Button(predictions_frame, text="Refresh", 
+                  command=self.refresh_predictions_data).pack(pady=5)
+
+    def add_lazy_tab(self, text, builder):
+        """Add an empty tab whose widgets are built by builder(frame) on first selection"""
+        frame = ttk.Frame(self.notebook)
+        self.notebook.add(frame, text=text)
+        self._lazy_tabs[str(frame)] = (builder, frame)
+
+    def on_tab_changed(self, event):
+        """Build a lazy tab the first time it is shown"""
+        lazy_tab = self._lazy_tabs.pop(self.notebook.select(), None)
+        if lazy_tab:
+            builder, frame = lazy_tab
+            try:
+                builder(frame)
+            except Exception as e:
+                import traceback
+                print(traceback.format_exc())
+                messagebox.showerror("Error", f"Tab creation failed: {str(e)}")
 
     def create_reports_tab(self):
         """Reports Tab - Statistics and charts"""
-        try:
-            reports_frame = ttk.Frame(self.notebook)
-            self.notebook.add(reports_frame, text="Reports")
-            
-            # Control frame
-            control_frame = ttk.LabelFrame(reports_frame, text="Report Options", padding=10)
-            control_frame.pack(fill=tk.X, padx=10, pady=5)
-            
-            # Date range selection
-            ttk.Label(control_frame, text="Time Range:").pack(side=tk.LEFT)
-            self.date_range_var = tk.StringVar(value="7 days")
-            date_combo = ttk.Combobox(control_frame, textvariable=self.date_range_var,
-                                     values=["1 day", "7 days", "30 days", "All"],
-                                     state="readonly", width=15)
-            date_combo.pack(side=tk.LEFT, padx=5)
-            
-            ttk.Button(control_frame, text="Generate Report", 
-                      command=self.generate_reports).pack(side=tk.LEFT, padx=10)
-            ttk.Button(control_frame, text="Export to Excel", 
-                      command=self.export_to_excel).pack(side=tk.LEFT, padx=5)
-            
-            # Charts frame
-            charts_frame = ttk.LabelFrame(reports_frame, text="Analysis Charts", padding=10)
-            charts_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
-            
-            # Matplotlib figure for reports
-            self.reports_fig, self.reports_axes = plt.subplots(2, 2, figsize=(12, 8))
-            self.reports_fig.suptitle("Flood Data Analysis Report")
-            
-            self.reports_canvas = FigureCanvasTkAgg(self.reports_fig, charts_frame)
-            self.reports_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-        except Exception as e:
-            messagebox.showerror("Error", f"Reports tab creation failed: {str(e)}")
+        self.add_lazy_tab("Reports", self.build_reports_tab)
+
+    def build_reports_tab(self, reports_frame):
+        """Build the Reports tab widgets"""
+        # Control frame
+        control_frame = ttk.LabelFrame(reports_frame, text="Report Options", padding=10)
+        control_frame.pack(fill=tk.X, padx=10, pady=5)
+        
+        # Date range selection
+        ttk.Label(control_frame, text="Time Range:").pack(side=tk.LEFT)
+        self.date_range_var = tk.StringVar(value="7 days")
+        date_combo = ttk.Combobox(control_frame, textvariable=self.date_range_var,
+                                 values=DATE_RANGES,
+                                 state="readonly", width=15)
+        date_combo.pack(side=tk.LEFT, padx=5)
+        
+        ttk.Button(control_frame, text="Generate Report", 
+                  command=self.generate_reports).pack(side=tk.LEFT, padx=10)
+        ttk.Button(control_frame, text="Export to Excel", 
+                  command=self.export_to_excel).pack(side=tk.LEFT, padx=5)
+        
+        # Charts frame
+        charts_frame = ttk.LabelFrame(reports_frame, text="Analysis Charts", padding=10)
+        charts_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        
+        # Matplotlib figure for reports
+        self.reports_fig, self.reports_axes = plt.subplots(2, 2, figsize=(12, 8))
+        self.reports_fig.suptitle("Flood Data Analysis Report")
+        
+        self.reports_canvas = AsyncFigureCanvasTkAgg(self.reports_fig, charts_frame)
+        self.reports_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
 
     def create_settings_tab(self):
         """Settings Tab - System configuration"""
-        try:
-            settings_frame = ttk.Frame(self.notebook)
-            self.notebook.add(settings_frame, text="Settings")
-            
-            # Database settings
-            db_frame = ttk.LabelFrame(settings_frame, text="Database Settings", padding=15)
-            db_frame.pack(fill=tk.X, padx=10, pady=5)
-            
-            # Create grid
-            ttk.Label(db_frame, text="Host:").grid(row=0, column=0, sticky='w', pady=5)
-            self.db_host_var = tk.StringVar(value="localhost")
-            ttk.Entry(db_frame, textvariable=self.db_host_var, width=30).grid(row=0, column=1, padx=10, pady=5)
-            
-            ttk.Label(db_frame, text="Port:").grid(row=1, column=0, sticky='w', pady=5)
-            self.db_port_var = tk.StringVar(value="3306")
-            ttk.Entry(db_frame, textvariable=self.db_port_var, width=30).grid(row=1, column=1, padx=10, pady=5)
-            
-            ttk.Label(db_frame, text="Username:").grid(row=2, column=0, sticky='w', pady=5)
-            self.db_user_var = tk.StringVar(value="root")
-            ttk.Entry(db_frame, textvariable=self.db_user_var, width=30).grid(row=2, column=1, padx=10, pady=5)
-            
-            ttk.Label(db_frame, text="Password:").grid(row=3, column=0, sticky='w', pady=5)
-            self.db_pass_var = tk.StringVar(value="")
-            ttk.Entry(db_frame, textvariable=self.db_pass_var, show="*", width=30).grid(row=3, column=1, padx=10, pady=5)
-            
-            # Buttons
-            btn_frame = ttk.Frame(db_frame)
-            btn_frame.grid(row=4, column=0, columnspan=2, pady=15)
-            ttk.Button(btn_frame, text="Test Connection", command=self.test_db_connection).pack(side=tk.LEFT, padx=5)
-            ttk.Button(btn_frame, text="Save Settings", command=self.save_db_settings).pack(side=tk.LEFT, padx=5)
-            
-            # API settings
-            api_frame = ttk.LabelFrame(settings_frame, text="API Settings", padding=15)
-            api_frame.pack(fill=tk.X, padx=10, pady=5)
-            
-            ttk.Label(api_frame, text="Windy API Key:").grid(row=0, column=0, sticky='w', pady=5)
-            self.api_key_var = tk.StringVar()
-            ttk.Entry(api_frame, textvariable=self.api_key_var, width=50, show="*").grid(row=0, column=1, padx=10, pady=5)
-            
-            api_btn_frame = ttk.Frame(api_frame)
-            api_btn_frame.grid(row=1, column=0, columnspan=2, pady=10)
-            ttk.Button(api_btn_frame, text="Test API", command=self.test_api_key).pack(side=tk.LEFT, padx=5)
-            ttk.Button(api_btn_frame, text="Save API Key", command=self.save_api_key).pack(side=tk.LEFT, padx=5)
-            
-            # Model settings
-            model_frame = ttk.LabelFrame(settings_frame, text="Model Settings", padding=15)
-            model_frame.pack(fill=tk.X, padx=10, pady=5)
-            
-            ttk.Label(model_frame, text="Number of Random Forest Trees:").grid(row=0, column=0, sticky='w', pady=5)
-            self.n_estimators_var = tk.IntVar(value=150)
-            estimators_frame = ttk.Frame(model_frame)
-            estimators_frame.grid(row=0, column=1, sticky='ew', padx=10, pady=5)
-            ttk.Scale(estimators_frame, from_=50, to=500, orient=tk.HORIZONTAL, 
-                     variable=self.n_estimators_var).pack(side=tk.LEFT, fill=tk.X, expand=True)
-            self.estimators_label = ttk.Label(estimators_frame, text="150")
-            self.estimators_label.pack(side=tk.RIGHT)
-            
-            ttk.Label(model_frame, text="Max Depth:").grid(row=1, column=0, sticky='w', pady=5)
-            self.max_depth_var = tk.IntVar(value=10)
-            depth_frame = ttk.Frame(model_frame)
-            depth_frame.grid(row=1, column=1, sticky='ew', padx=10, pady=5)
-            ttk.Scale(depth_frame, from_=1, to=30, orient=tk.HORIZONTAL,
-                     variable=self.max_depth_var).pack(side=tk.LEFT, fill=tk.X, expand=True)
-            self.depth_label = ttk.Label(depth_frame, text="10")
-            self.depth_label.pack(side=tk.RIGHT)
-        except Exception as e:
-            messagebox.showerror("Error", f"Settings tab creation failed: {str(e)}")
+        self.add_lazy_tab("Settings", self.build_settings_tab)
+
+    def build_settings_tab(self, settings_frame):
+        """Build the Settings tab widgets"""
+        # Database settings
+        db_frame = ttk.LabelFrame(settings_frame, text="Database Settings", padding=15)
+        db_frame.pack(fill=tk.X, padx=10, pady=5)
+        
+        # Create grid
+        ttk.Label(db_frame, text="Host:").grid(row=0, column=0, sticky='w', pady=5)
+        self.db_host_var = tk.StringVar(value="localhost")
+        ttk.Entry(db_frame, textvariable=self.db_host_var, width=30).grid(row=0, column=1, padx=10, pady=5)
+        
+        ttk.Label(db_frame, text="Port:").grid(row=1, column=0, sticky='w', pady=5)
+        self.db_port_var = tk.StringVar(value="3306")
+        ttk.Entry(db_frame, textvariable=self.db_port_var, width=30).grid(row=1, column=1, padx=10, pady=5)
+        
+        ttk.Label(db_frame, text="Username:").grid(row=2, column=0, sticky='w', pady=5)
+        self.db_user_var = tk.StringVar(value="root")
+        ttk.Entry(db_frame, textvariable=self.db_user_var, width=30).grid(row=2, column=1, padx=10, pady=5)
+        
+        ttk.Label(db_frame, text="Password:").grid(row=3, column=0, sticky='w', pady=5)
+        self.db_pass_var = tk.StringVar(value="")
+        ttk.Entry(db_frame, textvariable=self.db_pass_var, show="*", width=30).grid(row=3, column=1, padx=10, pady=5)
+        
+        # Buttons
+        btn_frame = ttk.Frame(db_frame)
+        btn_frame.grid(row=4, column=0, columnspan=2, pady=15)
+        ttk.Button(btn_frame, text="Test Connection", command=self.test_db_connection).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Save Settings", command=self.save_db_settings).pack(side=tk.LEFT, padx=5)
+        
+        # API settings
+        api_frame = ttk.LabelFrame(settings_frame, text="API Settings", padding=15)
+        api_frame.pack(fill=tk.X, padx=10, pady=5)
+        
+        ttk.Label(api_frame, text="Windy API Key:").grid(row=0, column=0, sticky='w', pady=5)
+        self.api_key_var = tk.StringVar()
+        ttk.Entry(api_frame, textvariable=self.api_key_var, width=50, show="*").grid(row=0, column=1, padx=10, pady=5)
+        
+        api_btn_frame = ttk.Frame(api_frame)
+        api_btn_frame.grid(row=1, column=0, columnspan=2, pady=10)
+        ttk.Button(api_btn_frame, text="Test API", command=self.test_api_key).pack(side=tk.LEFT, padx=5)
+        ttk.Button(api_btn_frame, text="Save API Key", command=self.save_api_key).pack(side=tk.LEFT, padx=5)
+        
+        # Model settings
+        model_frame = ttk.LabelFrame(settings_frame, text="Model Settings", padding=15)
+        model_frame.pack(fill=tk.X, padx=10, pady=5)
+        
+        ttk.Label(model_frame, text="Number of Random Forest Trees:").grid(row=0, column=0, sticky='w', pady=5)
+        self.n_estimators_var = tk.IntVar(value=50)
+        estimators_frame = ttk.Frame(model_frame)
+        estimators_frame.grid(row=0, column=1, sticky='ew', padx=10, pady=5)
+        ttk.Scale(estimators_frame, from_=50, to=500, orient=tk.HORIZONTAL, 
+                 variable=self.n_estimators_var).pack(side=tk.LEFT, fill=tk.X, expand=True)
+        self.estimators_label = ttk.Label(estimators_frame, text="50")
+        self.estimators_label.pack(side=tk.RIGHT)
+        
+        ttk.Label(model_frame, text="Max Depth:").grid(row=1, column=0, sticky='w', pady=5)
+        self.max_depth_var = tk.IntVar(value=6)
+        depth_frame = ttk.Frame(model_frame)
+        depth_frame.grid(row=1, column=1, sticky='ew', padx=10, pady=5)
+        ttk.Scale(depth_frame, from_=1, to=30, orient=tk.HORIZONTAL,
+                 variable=self.max_depth_var).pack(side=tk.LEFT, fill=tk.X, expand=True)
+        self.depth_label = ttk.Label(depth_frame, text="6")
+        self.depth_label.pack(side=tk.RIGHT)
+        
+        # Keep the value labels in sync with the scales
+        self._label_jobs = {}
+        self.n_estimators_var.trace_add('write', lambda *args: self.schedule_label_update(
+            self.estimators_label, self.n_estimators_var))
+        self.max_depth_var.trace_add('write', lambda *args: self.schedule_label_update(
+            self.depth_label, self.max_depth_var))
+
+    def schedule_label_update(self, label, var):
+        """Show var in label once the scale has been still for 50 ms"""
+        job = self._label_jobs.get(label)
+        if job:
+            self.root.after_cancel(job)
+        
+        def update():
+            self._label_jobs.pop(label, None)
+            label.config(text=str(var.get()))
+        
+        self._label_jobs[label] = self.root.after(50, update)
 
     def create_status_bar(self):
         """Create status bar"""
@@ -674,14 +967,21 @@ class FloodPredictionGUI:
             print(f"Status bar creation error: {e}")
 
     def update_status(self, message, show_progress=False):
-        """Update status bar"""
+        """Update status bar; rapid updates collapse into one flush at idle time"""
+        self._pending_status = (message, show_progress)
+        if self._status_flush_id is None:
+            self._status_flush_id = self.root.after_idle(self._flush_status)
+
+    def _flush_status(self):
+        """Apply the latest queued status message"""
+        self._status_flush_id = None
+        message, show_progress = self._pending_status
         try:
             self.status_label.config(text=message)
             if show_progress:
                 self.progress_bar.start()
             else:
                 self.progress_bar.stop()
-            self.root.update_idletasks()
         except Exception as e:
             print(f"Status update error: {e}")
 
@@ -691,15 +991,29 @@ class FloodPredictionGUI:
             if not IMPORT_SUCCESS:
                 self.db_status_label.config(text="Import Error", style='Error.TLabel')
                 return
-            conn = get_connection()
-            if conn:
-                self.db_status_label.config(text="Connection Successful", style='Success.TLabel')
-                close_connection(conn)
-            else:
-                self.db_status_label.config(text="Not Connected", style='Error.TLabel')
+            with self.db_pool.acquire() as conn:
+                if conn:
+                    self.db_status_label.config(text="Connection Successful", style='Success.TLabel')
+                else:
+                    self.db_status_label.config(text="Not Connected", style='Error.TLabel')
         except Exception as e:
             self.db_status_label.config(text=f"Error: {str(e)}", style='Error.TLabel')
 
+    def run_in_background(self, work, on_done, on_error=None, executor=None):
+        """Run work on an executor and pass its result to on_done on the Tk thread"""
+        def finished(future):
+            try:
+                result = future.result()
+            except Exception as e:
+                import traceback
+                print(traceback.format_exc())
+                if on_error:
+                    self.root.after(0, on_error, e)
+                return
+            self.root.after(0, on_done, result)
+        
+        (executor or self._executor).submit(work).add_done_callback(finished)
+
     def refresh_dashboard(self):
         """Refresh dashboard"""
         try:
@@ -708,60 +1022,96 @@ class FloodPredictionGUI:
             # Check database
             self.check_database_connection()
             
-            # Update data summary
-            self.update_data_summary()
-            
-            # Update charts
-            self.update_dashboard_charts()
-            
-            self.update_status("Dashboard refreshed")
+            # Load summary and chart data in the background
+            self.run_in_background(self.load_dashboard_data, self.apply_dashboard_data,
+                                   self.on_dashboard_error)
         except Exception as e:
-            self.update_status(f"Error refreshing dashboard: {str(e)}")
-            messagebox.showerror("Error", f"Cannot refresh dashboard:\n{str(e)}")
+            self.on_dashboard_error(e)
 
-    def update_data_summary(self):
-        """Update data statistics"""
+    def load_dashboard_data(self):
+        """Query summary and chart data (runs on a worker thread)"""
+        summary, data_version, refresh_key = self.fetch_data_summary()
+        
+        # Nothing changed since the last refresh
+        if refresh_key is not None and refresh_key == self._last_refresh_key:
+            return None
+        
+        # Reuse the last dataframe while the underlying tables are unchanged
+        if data_version is not None and data_version == self._df_cache_key:
+            return {'summary': summary, 'df': self._df_cache, 'refresh_key': refresh_key}
+        
+        df = None
+        if IMPORT_SUCCESS:
+            df = load_combined_data()
+            if df is None or len(df) == 0:
+                df = load_data_from_db()
+        
+        self._df_cache = df
+        self._df_cache_key = data_version
+        
+        return {'summary': summary, 'df': df, 'refresh_key': refresh_key}
+
+    def apply_dashboard_data(self, data):
+        """Show loaded dashboard data in the widgets"""
+        if data is None:
+            self.update_status("Dashboard up to date")
+            return
+        
+        self.data_summary_var.set(data['summary'])
+        self.update_dashboard_charts(data['df'])
+        self._last_refresh_key = data['refresh_key']
+        self.update_status("Dashboard refreshed")
+
+    def on_dashboard_error(self, e):
+        """Report a failed dashboard refresh"""
+        self.update_status(f"Error refreshing dashboard: {str(e)}")
+        messagebox.showerror("Error", f"Cannot refresh dashboard:\n{str(e)}")
+
+    def build_summary_query(self, cursor):
+        """Build the data summary query for the tables that exist"""
+        cursor.execute("""
+            SELECT table_name FROM information_schema.tables
+            WHERE table_schema = DATABASE()
+        """)
+        existing = {row[0] for row in cursor.fetchall()}
+        
+        def count(table):
+            return f"(SELECT COUNT(*) FROM {table})" if table in existing else "0"
+        
+        def latest(table, column):
+            return f"(SELECT MAX({column}) FROM {table})" if table in existing else "NULL"
+        
+        return (f"SELECT {count('rainfall_data')}, {count('river_level_data')}, "
+                f"{count('flood_predictions')}, {latest('rainfall_data', 'created_at')}, "
+                f"{latest('river_level_data', 'created_at')}, {latest('flood_predictions', 'id')}")
+
+    def fetch_data_summary(self):
+        """Return (statistics text, data version, refresh key) - safe to call from a worker thread"""
         try:
-            self.data_summary_text.delete(1.0, tk.END)
-            
             if not IMPORT_SUCCESS:
-                self.data_summary_text.insert(tk.END, "Import error - cannot load data")
-                return
-            
-            conn = get_connection()
-            if not conn:
-                self.data_summary_text.insert(tk.END, "Cannot connect to database")
-                return
-            
-            cursor = conn.cursor()
+                return "Import error - cannot load data", None, None
             
-            # Count records
-            try:
-                cursor.execute("SELECT COUNT(*) FROM rainfall_data")
-                weather_count = cursor.fetchone()[0]
-            except:
-                weather_count = 0
+            with self.db_pool.acquire() as conn:
+                if not conn:
+                    return "Cannot connect to database", None, None
                 
-            try:
-                cursor.execute("SELECT COUNT(*) FROM river_level_data")
-                river_count = cursor.fetchone()[0]
-            except:
-                river_count = 0
+                cursor = conn.cursor()
                 
-            try:
-                cursor.execute("SELECT COUNT(*) FROM flood_predictions")
-                prediction_count = cursor.fetchone()[0]
-            except:
-                prediction_count = 0
-            
-            # Latest data
-            try:
-                cursor.execute("SELECT MAX(created_at) FROM rainfall_data")
-                latest_weather = cursor.fetchone()[0]
-            except:
-                latest_weather = "N/A"
-            
-            summary = f"""Weather Data: {weather_count} records
+                # Count records and latest data in a single round trip
+                if self._summary_sql is None:
+                    self._summary_sql = self.build_summary_query(cursor)
+                cursor.execute(self._summary_sql)
+                row = cursor.fetchone()
+                weather_count, river_count, prediction_count, latest_weather, latest_river, _ = row
+                
+                # Row counts plus the newest timestamps change whenever the data does;
+                # the full row also covers new predictions
+                data_version = (weather_count, river_count, latest_weather, latest_river)
+                refresh_key = row
+                if latest_weather is None:
+                    latest_weather = "N/A"
+                
+                summary = f"""Weather Data: {weather_count} records
 River Data: {river_count} records  
 Predictions Made: {prediction_count} records
 
@@ -770,146 +1120,197 @@ Latest Data: {latest_weather}
 Status: {'Complete' if river_count > 0 else 'Weather Only'}
 Model: {'3 Levels' if river_count > 0 else '2 Levels'}
 """
-            
-            self.data_summary_text.insert(tk.END, summary)
-            
-            cursor.close()
-            close_connection(conn)
+                
+                cursor.close()
+                return summary, data_version, refresh_key
             
         except Exception as e:
-            self.data_summary_text.insert(tk.END, f"Error: {str(e)}")
+            return f"Error: {str(e)}", None, None
 
-    def update_dashboard_charts(self):
-        """Update dashboard charts"""
-        try:
-            # Clear previous plots
+    def show_dashboard_message(self, message):
+        """Clear the dashboard charts and show a message instead"""
+        with self.dashboard_canvas.mutating():
             for ax in self.dashboard_axes.flat:
                 ax.clear()
-            
+            self._trend_lines = {}
+            self._static_chart_key = None
+            self._charted_df = None
+            
+            self.dashboard_axes[0,0].text(0.5, 0.5, message, 
+                                        ha='center', va='center', transform=self.dashboard_axes[0,0].transAxes)
+        self.dashboard_canvas.draw_idle()
+
+    def update_trend_line(self, ax, key, values, style, title, ylabel):
+        """Update a persistent trend line; return True if the axes need a full redraw"""
+        x = np.arange(len(values))
+        line = self._trend_lines.get(key)
+        
+        if line is None or line.axes is not ax:
+            self._trend_lines = {k: l for k, l in self._trend_lines.items() if l.axes is not ax}
+            ax.clear()
+            line, = ax.plot(x, values, style, markersize=3, animated=True)
+            ax.set_title(title)
+            ax.set_ylabel(ylabel)
+            ax.grid(True, alpha=0.3)
+            self._trend_lines[key] = line
+            return True
+        
+        # Same axes decoration, only the data moved
+        limits = (ax.get_xlim(), ax.get_ylim())
+        line.set_data(x, values)
+        ax.relim()
+        ax.autoscale_view()
+        return (ax.get_xlim(), ax.get_ylim()) != limits
+
+    def update_dashboard_charts(self, df):
+        """Update dashboard charts from loaded data"""
+        try:
             if not IMPORT_SUCCESS:
-                self.dashboard_axes[0,0].text(0.5, 0.5, 'Import error', 
-                                            ha='center', va='center', transform=self.dashboard_axes[0,0].transAxes)
-                self.dashboard_canvas.draw()
+                self.show_dashboard_message('Import error')
                 return
             
-            # Load data
-            df = load_combined_data()
-            if df is None or len(df) == 0:
-                df = load_data_from_db()
-            
             if df is None or len(df) == 0:
                 # No data available
-                self.dashboard_axes[0,0].text(0.5, 0.5, 'No data', 
-                                            ha='center', va='center', transform=self.dashboard_axes[0,0].transAxes)
-                self.dashboard_canvas.draw()
+                self.show_dashboard_message('No data')
                 return
             
-            # Chart 1: Temperature trend (Top-Left)
-            if len(df) > 0 and 'temperature' in df.columns:
-                temps = df['temperature'].tail(20).values
-                self.dashboard_axes[0,0].plot(temps, 'b-o', markersize=3)
-                self.dashboard_axes[0,0].set_title('Temperature Trend (Last 20 Samples)')
-                self.dashboard_axes[0,0].set_ylabel('°C')
-                self.dashboard_axes[0,0].grid(True, alpha=0.3)
-            
-            # Chart 2: Rainfall distribution (Top-Right)
-            if 'rainfall_1h' in df.columns:
-                rainfall_data = df['rainfall_1h'].values
-                rainfall_data = rainfall_data[rainfall_data >= 0]  # Remove negative values
-                self.dashboard_axes[0,1].hist(rainfall_data, bins=15, alpha=0.7, color='skyblue', edgecolor='black')
-                self.dashboard_axes[0,1].set_title('Rainfall Distribution')
-                self.dashboard_axes[0,1].set_xlabel('mm/h')
-                self.dashboard_axes[0,1].set_ylabel('Frequency')
-            
-            # Chart 3: Risk levels (Bottom-Left)
-            if 'flood_risk_level' in df.columns:
-                risk_counts = df['flood_risk_level'].value_counts().sort_index()
-                labels = ['LOW', 'MODERATE', 'HIGH']
-                colors = ['green', 'orange', 'red']
-                if len(risk_counts) > 0:
-                    self.dashboard_axes[1,0].pie(risk_counts.values, 
-                                                labels=[labels[i] for i in risk_counts.index],
-                                                colors=[colors[i] for i in risk_counts.index],
-                                                autopct='%1.1f%%', startangle=90)
-                    self.dashboard_axes[1,0].set_title('Risk Level Distribution')
-            elif 'flood_risk' in df.columns:
-                risk_counts = df['flood_risk'].value_counts()
-                labels = ['No Flood', 'Flood']
-                colors = ['green', 'red']
-                if len(risk_counts) > 0:
-                    self.dashboard_axes[1,0].pie(risk_counts.values, labels=labels, 
-                                                colors=colors, autopct='%1.1f%%', startangle=90)
-                    self.dashboard_axes[1,0].set_title('Flood Risk Distribution')
-            
-            # Chart 4: Water level trend (Bottom-Right)
-            if 'water_level' in df.columns:
-                water_levels = df['water_level'].tail(20).values
-                self.dashboard_axes[1,1].plot(water_levels, 'r-o', markersize=3)
-                self.dashboard_axes[1,1].set_title('Water Level Trend (Last 20 Samples)')
-                self.dashboard_axes[1,1].set_ylabel('cm')
-                self.dashboard_axes[1,1].grid(True, alpha=0.3)
+            # The cached dataframe is already on screen
+            if df is self._charted_df:
+                return
+            self._charted_df = df
+            
+            with self.dashboard_canvas.mutating():
+                full_redraw = False
+                
+                # Chart 1: Temperature trend (Top-Left)
+                if len(df) > 0 and 'temperature' in df.columns:
+                    temps = df['temperature'].to_numpy(copy=False)[-20:]
+                    full_redraw |= self.update_trend_line(self.dashboard_axes[0,0], 'temperature', temps, 'b-o',
+                                                          'Temperature Trend (Last 20 Samples)', '°C')
+                elif 'temperature' in self._trend_lines:
+                    self.dashboard_axes[0,0].clear()
+                    del self._trend_lines['temperature']
+                    full_redraw = True
                 
-                # Add alert levels if available
-                if 'alert_level_1' in df.columns:
-                    alert1 = df['alert_level_1'].iloc[0] if len(df) > 0 else 180
-                    alert2 = df['alert_level_2'].iloc[0] if len(df) > 0 else 220
-                    alert3 = df['alert_level_3'].iloc[0] if len(df) > 0 else 270
+                # Charts 2 and 3 are only re-plotted when their inputs change
+                rainfall_data = None
+                if 'rainfall_1h' in df.columns:
+                    rainfall_data = df['rainfall_1h'].to_numpy(copy=False)
                     
-                    self.dashboard_axes[1,1].axhline(y=alert1, color='green', linestyle='--', alpha=0.7, label='Low Alert')
-                    self.dashboard_axes[1,1].axhline(y=alert2, color='yellow', linestyle='--', alpha=0.7, label='Moderate Alert')
-                    self.dashboard_axes[1,1].axhline(y=alert3, color='red', linestyle='--', alpha=0.7, label='High Alert')
-                    self.dashboard_axes[1,1].legend()
-            else:
-                # Show humidity instead
-                if 'humidity' in df.columns:
-                    humidity_data = df['humidity'].tail(20).values
-                    self.dashboard_axes[1,1].plot(humidity_data, 'g-o', markersize=3)
-                    self.dashboard_axes[1,1].set_title('Humidity Trend')
-                    self.dashboard_axes[1,1].set_ylabel('%')
-                    self.dashboard_axes[1,1].grid(True, alpha=0.3)
-            
-            plt.tight_layout()
-            self.dashboard_canvas.draw()
-            
+                    # Remove negative and missing values; the usual clean column is used as is
+                    valid = rainfall_data >= 0
+                    if not valid.all():
+                        rainfall_data = rainfall_data[valid]
+                
+                risk_column = None
+                risk_counts = None
+                if 'flood_risk_level' in df.columns:
+                    risk_column = 'flood_risk_level'
+                    risk_counts = np.bincount(df['flood_risk_level'].to_numpy(dtype=np.int64), minlength=3)
+                elif 'flood_risk' in df.columns:
+                    risk_column = 'flood_risk'
+                    risk_counts = np.bincount(df['flood_risk'].to_numpy(dtype=np.int64), minlength=2)
+                
+                static_key = (None if rainfall_data is None else rainfall_data.tobytes(), risk_column,
+                              None if risk_counts is None else risk_counts.tobytes())
+                
+                if static_key != self._static_chart_key:
+                    self._static_chart_key = static_key
+                    full_redraw = True
+                    self.dashboard_axes[0,1].clear()
+                    self.dashboard_axes[1,0].clear()
+                    
+                    # Chart 2: Rainfall distribution (Top-Right)
+                    if rainfall_data is not None:
+                        self.dashboard_axes[0,1].hist(rainfall_data, bins=15, alpha=0.7, color='skyblue', edgecolor='black')
+                        self.dashboard_axes[0,1].set_title('Rainfall Distribution')
+                        self.dashboard_axes[0,1].set_xlabel('mm/h')
+                        self.dashboard_axes[0,1].set_ylabel('Frequency')
+                    
+                    # Chart 3: Risk levels (Bottom-Left)
+                    if risk_counts is not None:
+                        if risk_column == 'flood_risk_level':
+                            labels, colors = RISK_LEVEL_LABELS, RISK_LEVEL_COLORS
+                            title = 'Risk Level Distribution'
+                        else:
+                            labels, colors = FLOOD_RISK_LABELS, FLOOD_RISK_COLORS
+                            title = 'Flood Risk Distribution'
+                        
+                        # Only classes that actually occur get a wedge
+                        idx = np.flatnonzero(risk_counts)
+                        if len(idx) > 0:
+                            self.dashboard_axes[1,0].pie(risk_counts[idx], labels=labels[idx],
+                                                        colors=colors[idx], autopct='%1.1f%%', startangle=90)
+                            self.dashboard_axes[1,0].set_title(title)
+                
+                # Chart 4: Water level trend (Bottom-Right)
+                water_ax = self.dashboard_axes[1,1]
+                if 'water_level' in df.columns:
+                    water_levels = df['water_level'].to_numpy(copy=False)[-20:]
+                    
+                    # Alert levels are part of the axes decoration, so they are part of the key
+                    alerts = None
+                    alert_columns = ['alert_level_1', 'alert_level_2', 'alert_level_3']
+                    if all(c in df.columns for c in alert_columns):
+                        alert1, alert2, alert3 = df[alert_columns].iloc[0].to_numpy()
+                        alerts = (alert1, alert2, alert3)
+                    
+                    key = ('water_level', alerts)
+                    new_axes = key not in self._trend_lines
+                    full_redraw |= self.update_trend_line(water_ax, key, water_levels, 'r-o',
+                                                          'Water Level Trend (Last 20 Samples)', 'cm')
+                    
+                    if new_axes and alerts is not None:
+                        water_ax.axhline(y=alert1, color='green', linestyle='--', alpha=0.7, label='Low Alert')
+                        water_ax.axhline(y=alert2, color='yellow', linestyle='--', alpha=0.7, label='Moderate Alert')
+                        water_ax.axhline(y=alert3, color='red', linestyle='--', alpha=0.7, label='High Alert')
+                        water_ax.legend()
+                else:
+                    # Show humidity instead
+                    if 'humidity' in df.columns:
+                        humidity_data = df['humidity'].to_numpy(copy=False)[-20:]
+                        full_redraw |= self.update_trend_line(water_ax, 'humidity', humidity_data, 'g-o',
+                                                              'Humidity Trend', '%')
+                
+                # Blit just the trend lines when nothing else on the figure changed
+                trend_axes = [line.axes for line in self._trend_lines.values()]
+                if full_redraw or not self.dashboard_canvas.blit_animated(trend_axes):
+                    # Axes positions do not change after the first layout
+                    layout = not self._dashboard_laid_out
+                    self._dashboard_laid_out = True
+                    self.dashboard_canvas.draw_idle(layout=layout)
+                
         except Exception as e:
             print(f"Error updating charts: {e}")
             # Show error in first plot
             try:
-                self.dashboard_axes[0,0].text(0.5, 0.5, f'Error: {str(e)}', 
-                                            ha='center', va='center', transform=self.dashboard_axes[0,0].transAxes)
-                self.dashboard_canvas.draw()
+                self.show_dashboard_message(f'Error: {str(e)}')
             except:
                 pass
 
     def calculate_alert_level(self, water_level):
         """Calculate alert level based on water level"""
-        if water_level < 180:
-            return 0
-        elif water_level < 220:
-            return 1
-        elif water_level < 270:
-            return 2
-        else:
-            return 3
+        return bisect.bisect_right(ALERT_THRESHOLDS, water_level)
 
     def calculate_alert_level_numeric(self, water_level, risk_level):
         """Calculate numeric alert level (1-3) based on water level and risk"""
-        # Base calculation from water level
-        if water_level < 180:
-            base_level = 1  # Low alert
-        elif water_level < 220:
-            base_level = 2  # Moderate alert
-        else:
-            base_level = 3  # High alert
-        
-        # Adjust based on risk level
-        if risk_level == 'HIGH' and base_level < 3:
-            base_level += 1
-        elif risk_level == 'LOW' and base_level > 1:
-            base_level -= 1
+        # Base calculation from water level (1 = low, 2 = moderate, 3 = high alert)
+        base_level = bisect.bisect_right(ALERT_THRESHOLDS, water_level, hi=2) + 1
         
-        # Ensure level is within 1-3 range
-        return max(1, min(3, base_level))
+        # Adjust based on risk level and keep within 1-3 range
+        return max(1, min(3, base_level + RISK_ALERT_SHIFT.get(risk_level, 0)))
+
+    def calculate_alert_level_vec(self, water_levels):
+        """Vectorized calculate_alert_level for an array of water levels"""
+        return np.searchsorted(ALERT_THRESHOLDS, np.asarray(water_levels, dtype=float), side='right')
+
+    def calculate_alert_level_numeric_vec(self, water_levels, risk_levels):
+        """Vectorized calculate_alert_level_numeric for arrays of water and risk levels"""
+        base = np.searchsorted(ALERT_THRESHOLDS[:2], np.asarray(water_levels, dtype=float), side='right') + 1
+        risk_levels = np.asarray(risk_levels)
+        return np.select([risk_levels == 'HIGH', risk_levels == 'LOW'],
+                         [np.minimum(base + 1, 3), np.maximum(base - 1, 1)],
+                         default=base)
 
     def display_prediction_result(self, result, input_data):
         """Display prediction result in GUI"""
@@ -927,72 +1328,35 @@ Model: {'3 Levels' if river_count > 0 else '2 Levels'}
             if combined_score > 0:
                 probability = min(combined_score * 100, 99.99)
             else:
-                if risk_level == 'LOW':
-                    probability = 15.0
-                elif risk_level == 'MODERATE':
-                    probability = 50.0
-                elif risk_level == 'HIGH':
-                    probability = 85.0
-                else:
-                    probability = 0.0
+                probability = FALLBACK_PROB.get(risk_level, 0.0) * 100
             
             # Calculate alert level
             water_level = input_data.get('water_level', 0.0)
             alert_level = self.calculate_alert_level_numeric(water_level, risk_level)
-            alert_names = {1: "Low Alert", 2: "Moderate Alert", 3: "High Alert"}
             
-            # Format result text
-            result_str = f"""
-{'='*50}
-FLOOD RISK PREDICTION RESULT
-{'='*50}
-
-Location: {self.location_var.get()}
-Prediction Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-
-INPUT DATA:
------------
-Temperature: {input_data['temperature']:.1f}°C
-Humidity: {input_data['humidity']:.1f}%
-Pressure: {input_data['pressure']:.1f} hPa
-Rainfall (1h): {input_data['rainfall_1h']:.1f} mm
-Rainfall (3h): {input_data['rainfall_3h']:.1f} mm
-"""
+            # Format result text section by section and join once
+            parts = [self._RESULT_TEMPLATE.format(
+                rule=self._RULE, location=self.location_var.get(),
+                time=datetime.now().strftime('%Y-%m-%d %H:%M:%S'), **input_data)]
             
             if self.is_advanced and 'water_level' in input_data:
-                result_str += f"""
-Water Level: {input_data['water_level']:.1f} cm
-Flow Rate: {input_data['flow_rate']:.1f} m³/s
-Trend: {self.trend_var.get()}
-"""
+                parts.append(self._RIVER_TEMPLATE.format(trend=self.trend_var.get(), **input_data))
             
-            result_str += f"""
-PREDICTION RESULT:
-------------------
-Risk Level: {risk_level}
-Flood Probability: {probability:.2f}%
-Alert Level: Level {alert_level} - {alert_names[alert_level]}
-"""
+            parts.append(self._PREDICTION_TEMPLATE.format(
+                risk_level=risk_level, probability=probability,
+                alert_level=alert_level, alert_name=self.ALERT_NAMES[alert_level]))
             
             if weather_factor > 0 or river_factor > 0:
-                result_str += f"""
-RISK FACTORS:
--------------
-Weather Risk Factor: {weather_factor:.4f}
-River Risk Factor: {river_factor:.4f}
-Combined Risk Score: {combined_score:.4f}
-"""
+                parts.append(self._FACTORS_TEMPLATE.format(
+                    weather_factor=weather_factor, river_factor=river_factor,
+                    combined_score=combined_score))
             
             if 'recommendations' in result:
-                result_str += f"""
-RECOMMENDATIONS:
-----------------
-{result['recommendations']}
-"""
+                parts.append(self._RECOMMENDATIONS_TEMPLATE.format(recommendations=result['recommendations']))
             
-            result_str += f"\n{'='*50}"
+            parts.append(f"\n{self._RULE}")
             
-            self.result_text.insert(tk.END, result_str)
+            self.result_text.insert(tk.END, "".join(parts))
             
             # Update visual display with probability
             result['flood_probability'] = probability
@@ -1004,52 +1368,21 @@ RECOMMENDATIONS:
     def update_risk_visualization(self, result):
         """Update risk level visualization"""
         try:
-            # Clear previous widgets
-            for widget in self.risk_display_frame.winfo_children():
-                widget.destroy()
-            
             risk_level = result.get('risk_level', 'LOW')
             probability = result.get('probability_flood', 0)
             
-            # Color mapping
-            colors = {'LOW': '#27ae60', 'MODERATE': '#f39c12', 'HIGH': '#e74c3c'}
-            color = colors.get(risk_level, '#95a5a6')
-            
-            # Create risk level label
-            risk_label = tk.Label(self.risk_display_frame, 
-                                 text=risk_level,
-                                 font=('Arial', 48, 'bold'),
-                                 fg=color,
-                                 bg='white')
-            risk_label.pack(pady=20)
-            
-            # Create probability bar
-            prob_frame = ttk.Frame(self.risk_display_frame)
-            prob_frame.pack(fill=tk.X, padx=20, pady=10)
-            
-            ttk.Label(prob_frame, text="Flood Probability:", 
-                     font=('Arial', 12, 'bold')).pack()
-            
-            progress = ttk.Progressbar(prob_frame, length=300, mode='determinate')
-            progress['value'] = probability * 100
-            progress.pack(pady=5)
-            
-            ttk.Label(prob_frame, text=f"{probability:.1%}", 
-                     font=('Arial', 14, 'bold')).pack()
-            
-            # Add icon or additional info based on risk level
-            info_text = {
-                'LOW': '✓ Low flood risk\nContinue normal activities',
-                'MODERATE': '⚠ Moderate flood risk\nStay alert and monitor situation',
-                'HIGH': '⚠ High flood risk!\nPrepare for evacuation if needed'
-            }
+            color = self.RISK_COLORS.get(risk_level, '#95a5a6')
             
-            info_label = tk.Label(self.risk_display_frame,
-                                 text=info_text.get(risk_level, ''),
-                                 font=('Arial', 11),
-                                 fg=color,
-                                 justify=tk.CENTER)
-            info_label.pack(pady=10)
+            self.risk_label.config(text=risk_level, fg=color)
+            self.risk_progress['value'] = probability * 100
+            self.prob_value_label.config(text=f"{probability:.1%}")
+            self.risk_info_label.config(text=self.RISK_INFO.get(risk_level, ''), fg=color)
+            
+            # The widgets stay hidden until the first prediction
+            if not self.risk_label.winfo_manager():
+                self.risk_label.pack(pady=20)
+                self.prob_frame.pack(fill=tk.X, padx=20, pady=10)
+                self.risk_info_label.pack(pady=10)
             
         except Exception as e:
             print(f"Error updating risk visualization: {e}")
@@ -1091,394 +1424,390 @@ RECOMMENDATIONS:
                     'flow_rate_normal': self.flow_rate_var.get() / 1000.0,
                     'alert_level_exceeded': self.calculate_alert_level(water_level),
                     'trend_rising': 1 if self.trend_var.get() == 'rising' else 0,
-                    'trend_falling': 1 if self.trend_var.get() == 'falling' else 0,
-                })
-            
-            # Perform prediction
-            result = predict_flood_risk(self.model, self.features, input_data, self.is_advanced)
-            
-            if result:
-                self.display_prediction_result(result, input_data)
-                self.save_prediction_to_db(result, input_data)
-            else:
-                messagebox.showerror("Error", "Unable to perform prediction!")
-                
-        except Exception as e:
-            messagebox.showerror("Error", f"Prediction error: {str(e)}")
-            import traceback
-            print(traceback.format_exc())
-
-    def save_prediction_to_db(self, result, input_data):
-        """Save prediction result to database"""
-        try:
-            conn = get_connection()
-            if not conn:
-                return
-            
-            cursor = conn.cursor()
-            
-            # Extract values with defaults
-            location = self.location_var.get() if hasattr(self, 'location_var') else 'Unknown'
-            risk_level = result.get('risk_level', 'LOW')
-            
-            # Calculate probability based on risk level and factors
-            weather_factor = result.get('weather_factor', 0.0)
-            river_factor = result.get('river_factor', 0.0)
-            combined_score = result.get('combined_score', 0.0)
-            
-            # Calculate probability from combined score (0-1 range)
-            if combined_score > 0:
-                probability = min(combined_score, 0.9999)  # Max 99.99%
-            else:
-                # Fallback: calculate from risk level
-                if risk_level == 'LOW':
-                    probability = 0.15  # 15%
-                elif risk_level == 'MODERATE':
-                    probability = 0.50  # 50%
-                elif risk_level == 'HIGH':
-                    probability = 0.85  # 85%
-                else:
-                    probability = 0.0
-            
-            rainfall_1h = input_data.get('rainfall_1h', 0.0)
-            rainfall_3h = input_data.get('rainfall_3h', 0.0)
-            water_level = input_data.get('water_level', 0.0)
-            
-            # Calculate alert_level (1-3) based on water level and risk
-            alert_level = self.calculate_alert_level_numeric(water_level, risk_level)
-            
-            recommendations = result.get('recommendations', 'No recommendations available')
-            model_version = 'v1.0' if not self.is_advanced else 'v2.0-advanced'
-            
-            # Insert prediction with all individual columns
-            cursor.execute("""
-                INSERT INTO flood_predictions 
-                (location_name, prediction_time, risk_level, probability, 
-                 weather_factor, river_factor, combined_score,
-                 rainfall_1h, rainfall_3h, water_level, 
-                 alert_level_exceeded, recommendations, model_version)
-                VALUES (%s, NOW(), %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """, (
-                location,           # 1. location_name
-                risk_level,         # 2. risk_level
-                probability,        # 3. probability (0-1)
-                weather_factor,     # 4. weather_factor
-                river_factor,       # 5. river_factor
-                combined_score,     # 6. combined_score
-                rainfall_1h,        # 7. rainfall_1h
-                rainfall_3h,        # 8. rainfall_3h
-                water_level,        # 9. water_level
-                alert_level,        # 10. alert_level_exceeded (1-3)
-                recommendations,    # 11. recommendations
-                model_version       # 12. model_version
-            ))
-            
-            conn.commit()
-            cursor.close()
-            close_connection(conn)
-            
-            print(f"Prediction saved: {location}, Risk: {risk_level}, Probability: {probability*100:.1f}%, Alert Level: {alert_level}")
-            
-        except Exception as e:
-            print(f"Error saving prediction to DB: {e}")
-            import traceback
-            print(traceback.format_exc())
-            if conn:
-                try:
-                    conn.rollback()
-                    close_connection(conn)
-                except:
-                    pass
-
-    def train_prediction_model(self):
-        """Train prediction model"""
-        try:
-            if not IMPORT_SUCCESS:
-                messagebox.showerror("Error", "Import error - cannot train model")
-                return
-            
-            self.update_status("Training model...", True)
-            df = load_combined_data()
-            if df is None or len(df) == 0:
-                df = load_data_from_db()
-            
-            if df is None or len(df) == 0:
-                self.update_status("Model training failed")
-                messagebox.showerror("Error", "No data available for training")
-                return
+                    'trend_falling': 1 if self.trend_var.get() == 'falling' else 0,
+                })
             
-            train_data = generate_advanced_training_data(df)
-            result = train_model(train_data)
-            
-            if result is None:
-                raise ValueError("train_model returned None")
-            if not isinstance(result, (list, tuple)):
-                raise ValueError("train_model returned invalid type")
-            if len(result) == 2:
-                self.model, self.features = result
-            elif len(result) >= 3:
-                self.model, self.features, *_ = result
-            else:
-                raise ValueError("train_model returned insufficient values")
+            # Perform prediction
+            result = predict_flood_risk(self.model, self.features, input_data, self.is_advanced)
             
-            if self.model:
-                self.is_advanced = True
-                self.model_status_label.config(text="Trained (Advanced)", style='Success.TLabel')
-                self.update_status("Model trained successfully")
-                messagebox.showinfo("Success", "Model trained successfully!")
+            if result:
+                self.display_prediction_result(result, input_data)
+                self.save_prediction_to_db(result, input_data)
             else:
-                self.update_status("Model training failed")
-                messagebox.showerror("Error", "Model training failed")
+                messagebox.showerror("Error", "Unable to perform prediction!")
                 
         except Exception as e:
-            self.update_status("Model training failed")
-            messagebox.showerror("Error", f"Model training failed: {str(e)}")
+            messagebox.showerror("Error", f"Prediction error: {str(e)}")
             import traceback
             print(traceback.format_exc())
 
-    def evaluate_model(self):
-        """Evaluate model"""
+    def _build_prediction_row(self, result, input_data):
+        """Build the flood_predictions insert parameters for one prediction"""
+        # Extract values with defaults
+        location = self.selected_location() if hasattr(self, 'location_var') else 'Unknown'
+        risk_level = result.get('risk_level', 'LOW')
+        
+        # Calculate probability based on risk level and factors
+        weather_factor = result.get('weather_factor', 0.0)
+        river_factor = result.get('river_factor', 0.0)
+        combined_score = result.get('combined_score', 0.0)
+        
+        # Calculate probability from combined score (0-1 range)
+        if combined_score > 0:
+            probability = min(combined_score, 0.9999)  # Max 99.99%
+        else:
+            # Fallback: calculate from risk level
+            probability = FALLBACK_PROB.get(risk_level, 0.0)
+        
+        rainfall_1h = input_data.get('rainfall_1h', 0.0)
+        rainfall_3h = input_data.get('rainfall_3h', 0.0)
+        water_level = input_data.get('water_level', 0.0)
+        
+        # Calculate alert_level (1-3) based on water level and risk
+        alert_level = self.calculate_alert_level_numeric(water_level, risk_level)
+        
+        recommendations = result.get('recommendations', 'No recommendations available')
+        model_version = 'v1.0' if not self.is_advanced else 'v2.0-advanced'
+        
+        return (
+            location,           # 1. location_name
+            risk_level,         # 2. risk_level
+            probability,        # 3. probability (0-1)
+            weather_factor,     # 4. weather_factor
+            river_factor,       # 5. river_factor
+            combined_score,     # 6. combined_score
+            rainfall_1h,        # 7. rainfall_1h
+            rainfall_3h,        # 8. rainfall_3h
+            water_level,        # 9. water_level
+            alert_level,        # 10. alert_level_exceeded (1-3)
+            recommendations,    # 11. recommendations
+            model_version       # 12. model_version
+        )
+
+    def save_predictions_batch(self, rows):
+        """Insert prediction rows in one statement and one commit"""
         try:
-            if not IMPORT_SUCCESS:
-                messagebox.showerror("Error", "Import error - cannot evaluate model")
-                return
-            
-            if self.model is None:
-                messagebox.showwarning("Warning", "No model available. Please train a model first!")
-                return
-            
-            self.update_status("Evaluating model...", True)
-            df = load_combined_data()
-            if df is None or len(df) == 0:
-                df = load_data_from_db()
-            
-            if df is None or len(df) == 0:
-                self.update_status("Model evaluation failed")
-                messagebox.showerror("Error", "No data available for evaluation")
-                return
-            
-            train_data = generate_advanced_training_data(df)
-            
-            from sklearn.model_selection import train_test_split
-            from sklearn.metrics import classification_report, confusion_matrix
-            
-            X = train_data[self.features]
-            y = train_data['flood_risk_level']
-            
-            X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-            
-            y_pred = self.model.predict(X_test)
-            
-            report = classification_report(y_test, y_pred)
-            cm = confusion_matrix(y_test, y_pred)
-            
-            # Show results in messagebox
-            result_text = f"Model Evaluation Results:\n\n{report}\n\nConfusion Matrix:\n{cm}"
-            messagebox.showinfo("Model Evaluation", result_text)
-            
-            self.update_status("Model evaluated successfully")
+            with self.db_pool.acquire() as conn:
+                if not conn:
+                    return False
+                
+                cursor = conn.cursor()
+                cursor.executemany(self._INSERT_PREDICTION_SQL, rows)
+                conn.commit()
+                cursor.close()
+            # Report chart 3 counts the saved predictions
+            self.invalidate_report_cache()
+            return True
             
         except Exception as e:
-            self.update_status("Model evaluation failed")
-            messagebox.showerror("Error", f"Model evaluation failed: {str(e)}")
+            print(f"Error saving prediction to DB: {e}")
             import traceback
             print(traceback.format_exc())
+            return False
+
+    def save_prediction_to_db(self, result, input_data):
+        """Save prediction result to database"""
+        row = self._build_prediction_row(result, input_data)
+        if self.save_predictions_batch([row]):
+            location, risk_level, probability = row[:3]
+            alert_level = row[9]
+            print(f"Prediction saved: {location}, Risk: {risk_level}, Probability: {probability*100:.1f}%, Alert Level: {alert_level}")
+
+    def train_prediction_model(self):
+        """Train prediction model"""
+        if not IMPORT_SUCCESS:
+            messagebox.showerror("Error", "Import error - cannot train model")
+            return
+        
+        self.update_status("Training model...", True)
+        self.run_in_background(self.fit_model, self.apply_trained_model, self.on_training_error)
+
+    def load_training_data(self):
+        """Load data and build the advanced training set"""
+        df = load_combined_data()
+        if df is None or len(df) == 0:
+            df = load_data_from_db()
+        
+        if df is None or len(df) == 0:
+            raise ValueError("No data available")
+        
+        return generate_advanced_training_data(df)
+
+    def evaluation_set(self, model, train_data, features):
+        """Return (y_true, y_pred) for the rows the model did not fit on"""
+        y = train_data['flood_risk_level'].to_numpy()
+        
+        # train_model held these rows out; a fresh split here would mostly pick training rows
+        rows = getattr(model, '_eval_rows', None)
+        if rows is not None:
+            X_test = train_data[features].to_numpy(dtype=np.float32)[rows]
+            return y[rows], model.predict(X_test)
+        
+        # Small data is fitted in full, so each row is scored by the trees that did not see it
+        return y, model.classes_[np.argmax(model.oob_decision_function_, axis=1)]
+
+    def fit_model(self):
+        """Fit the model (runs on a worker thread)"""
+        train_data = self.load_training_data()
+        result = train_model(train_data)
+        
+        if result is None:
+            raise ValueError("train_model returned None")
+        if not isinstance(result, (list, tuple)):
+            raise ValueError("train_model returned invalid type")
+        if len(result) < 2:
+            raise ValueError("train_model returned insufficient values")
+        
+        model, features = result[0], result[1]
+        eval_set = self.evaluation_set(model, train_data, features) if model else None
+        return model, features, eval_set
+
+    def apply_trained_model(self, result):
+        """Store the trained model and report the outcome"""
+        self.model, self.features, self._eval_set = result
+        
+        if self.model:
+            self.is_advanced = True
+            self.model_status_label.config(text="Trained (Advanced)", style='Success.TLabel')
+            self.update_status("Model trained successfully")
+            messagebox.showinfo("Success", "Model trained successfully!")
+        else:
+            self.update_status("Model training failed")
+            messagebox.showerror("Error", "Model training failed")
+
+    def on_training_error(self, e):
+        """Report a failed training run"""
+        self.update_status("Model training failed")
+        messagebox.showerror("Error", f"Model training failed: {str(e)}")
+
+    def evaluate_model(self):
+        """Evaluate model"""
+        if not IMPORT_SUCCESS:
+            messagebox.showerror("Error", "Import error - cannot evaluate model")
+            return
+        
+        if self.model is None:
+            messagebox.showwarning("Warning", "No model available. Please train a model first!")
+            return
+        
+        self.update_status("Evaluating model...", True)
+        self.run_in_background(self.score_model, self.show_evaluation, self.on_evaluation_error)
+
+    def score_model(self):
+        """Build the evaluation report (runs on a worker thread)"""
+        from sklearn.metrics import classification_report, confusion_matrix
+        
+        # Scored once at training time on rows the model did not fit on
+        y_test, y_pred = self._eval_set
+        
+        report = classification_report(y_test, y_pred)
+        cm = confusion_matrix(y_test, y_pred)
+        
+        return f"Model Evaluation Results:\n\n{report}\n\nConfusion Matrix:\n{cm}"
+
+    def show_evaluation(self, result_text):
+        """Show evaluation results in a messagebox"""
+        messagebox.showinfo("Model Evaluation", result_text)
+        self.update_status("Model evaluated successfully")
+
+    def on_evaluation_error(self, e):
+        """Report a failed evaluation"""
+        self.update_status("Model evaluation failed")
+        messagebox.showerror("Error", f"Model evaluation failed: {str(e)}")
 
     # Data management methods
-    def refresh_rainfall_data(self):
-        """Refresh rainfall data display"""
+    def paged_scroll_command(self, scrollbar, load_more):
+        """yscrollcommand that also loads the next page when scrolled near the end"""
+        state = {'pending': False}
+        
+        def run_load_more():
+            state['pending'] = False
+            load_more()
+        
+        def command(first, last):
+            scrollbar.set(first, last)
+            if float(first) > 0 and float(last) >= 0.95 and not state['pending']:
+                state['pending'] = True
+                self.root.after_idle(run_load_more)
+        
+        return command
+
+    def page_offset(self, tree, append):
+        """Return the OFFSET of the page to load, or None when nothing should be loaded"""
+        state = self._pages.setdefault(str(tree), {'offset': 0, 'done': False, 'loading': False})
+        if not append:
+            state['loading'] = True
+            return 0
+        if state['done'] or state['loading']:
+            return None
+        state['loading'] = True
+        return state['offset']
+
+    def record_page(self, tree, offset, count):
+        """Remember how many rows a tree shows after loading a page"""
+        self._pages[str(tree)] = {'offset': offset + count, 'done': count < self._page_size,
+                                  'loading': False}
+
+    def fill_tree(self, tree, rows, clear=True):
+        """Show rows in a treeview, replacing its contents unless clear is False"""
+        if clear:
+            tree.delete(*tree.get_children())
+        
+        _ins = tree.insert
+        for values in rows:
+            _ins('', tk.END, values=values)
+
+    def load_page(self, tree, what, fetch, append, on_loaded=None):
+        """Fetch a page of rows on a database worker and show it in tree"""
+        if not IMPORT_SUCCESS:
+            return
+        
+        offset = self.page_offset(tree, append)
+        if offset is None:
+            return
+        
+        self.update_status(f"Loading {what}...", True)
+        self.run_in_background(lambda: fetch(offset),
+                               lambda rows: self.apply_page(tree, what, rows, offset, append, on_loaded),
+                               lambda e: self.on_page_error(tree, what, e),
+                               executor=self._db_executor)
+
+    def apply_page(self, tree, what, rows, offset, append, on_loaded=None):
+        """Show a fetched page unless a refresh replaced the tree meanwhile"""
+        state = self._pages[str(tree)]
+        if append and state['offset'] != offset:
+            return
+        
+        self.fill_tree(tree, rows, clear=not append)
+        self.record_page(tree, offset, len(rows))
+        self.update_status(f"Loaded {offset + len(rows)} {what} records")
+        if on_loaded:
+            on_loaded()
+
+    def on_page_error(self, tree, what, e):
+        """Report a failed page load"""
+        self._pages[str(tree)]['loading'] = False
+        self.update_status(f"Error loading {what}")
+        messagebox.showerror("Error", f"Error loading {what}: {str(e)}")
+
+    def refresh_rainfall_data(self, append=False):
+        """Refresh rainfall data display, or load the next page when append is True"""
+        self.load_page(self.rainfall_tree, "rainfall", self.fetch_rainfall_rows, append)
+
+    def fetch_rainfall_rows(self, offset):
+        """Query a page of display-ready rainfall rows (runs on a worker thread)"""
+        conn = get_connection()
+        if not conn:
+            raise ConnectionError("Cannot connect to database")
+        
         try:
-            if not IMPORT_SUCCESS:
-                return
-            
-            self.update_status("Loading rainfall data...", True)
-            
-            # Clear existing data
-            for item in self.rainfall_tree.get_children():
-                self.rainfall_tree.delete(item)
-            
-            conn = get_connection()
-            if not conn:
-                messagebox.showerror("Error", "Cannot connect to database")
-                return
-            
             cursor = conn.cursor()
             
-            # Query with JSON extraction
+            # Query the stored columns, converting Kelvin and formatting each cell server-side
             cursor.execute("""
                 SELECT 
                     location_name,
-                    created_at,
-                    JSON_EXTRACT(precipitation, '$.temperature') as temperature,
-                    JSON_EXTRACT(precipitation, '$.humidity') as humidity,
-                    JSON_EXTRACT(precipitation, '$.rainfall_1h') as rainfall_1h,
-                    JSON_EXTRACT(precipitation, '$.rainfall_3h') as rainfall_3h,
-                    JSON_EXTRACT(precipitation, '$.wind_speed') as wind_speed
+                    IFNULL(CAST(created_at AS CHAR), 'N/A'),
+                    IF(temperature, CONCAT(FORMAT(IF(temperature > 100, temperature - 273.15, temperature), 1), '°C'), 'N/A'),
+                    IF(humidity, CONCAT(FORMAT(humidity, 0), '%'), 'N/A'),
+                    IF(rainfall_1h, CONCAT(FORMAT(rainfall_1h, 1), 'mm'), '0.0mm'),
+                    IF(rainfall_3h, CONCAT(FORMAT(rainfall_3h, 1), 'mm'), '0.0mm'),
+                    IF(wind_speed, CONCAT(FORMAT(wind_speed, 1), 'km/h'), 'N/A')
                 FROM rainfall_data 
                 ORDER BY created_at DESC 
-                LIMIT 100
-            """)
+                LIMIT %s OFFSET %s
+            """, (self._page_size, offset))
             
             rows = cursor.fetchall()
-            
-            # Insert data into treeview
-            for row in rows:
-                location, time, temp, humidity, rain_1h, rain_3h, wind = row
-                
-                # Clean and convert values (remove quotes from JSON extraction)
-                def clean_value(val):
-                    if val is None or val == 'null':
-                        return None
-                    # Remove quotes if present
-                    if isinstance(val, str):
-                        val = val.strip('"')
-                    try:
-                        return float(val)
-                    except:
-                        return None
-                
-                temp = clean_value(temp)
-                humidity = clean_value(humidity)
-                rain_1h = clean_value(rain_1h)
-                rain_3h = clean_value(rain_3h)
-                wind = clean_value(wind)
-                
-                # Convert temperature from Kelvin to Celsius if needed
-                if temp and temp > 100:  # Likely in Kelvin
-                    temp = temp - 273.15
-                
-                display_row = (
-                    location,
-                    str(time)[:19] if time else 'N/A',
-                    f"{temp:.1f}°C" if temp else 'N/A',
-                    f"{humidity:.0f}%" if humidity else 'N/A',
-                    f"{rain_1h:.1f}mm" if rain_1h else '0.0mm',
-                    f"{rain_3h:.1f}mm" if rain_3h else '0.0mm',
-                    f"{wind:.1f}km/h" if wind else 'N/A'
-                )
-                self.rainfall_tree.insert('', tk.END, values=display_row)
-            
             cursor.close()
+        finally:
             close_connection(conn)
-            self.update_status(f"Loaded {len(rows)} rainfall records")
-            
-        except Exception as e:
-            self.update_status("Error loading rainfall data")
-            messagebox.showerror("Error", f"Error loading rainfall data: {str(e)}")
-            import traceback
-            print(traceback.format_exc())
+        
+        return rows
+
+    def refresh_river_data(self, append=False):
+        """Refresh river data, or load the next page when append is True"""
+        self.load_page(self.river_tree, "river", self.fetch_river_rows, append)
 
-    def refresh_river_data(self):
-        """Refresh river data"""
+    def fetch_river_rows(self, offset):
+        """Query a page of river rows (runs on a worker thread)"""
+        conn = get_connection()
+        if not conn:
+            raise ConnectionError("Cannot connect to database")
+        
         try:
-            if not IMPORT_SUCCESS:
-                return
-            
-            self.update_status("Loading river data...", True)
-            
-            # Clear existing data
-            for item in self.river_tree.get_children():
-                self.river_tree.delete(item)
-            
-            conn = get_connection()
-            if not conn:
-                messagebox.showerror("Error", "Cannot connect to database")
-                return
-            
             cursor = conn.cursor()
             cursor.execute("""
                 SELECT location_name, created_at, water_level, flow_rate, trend 
                 FROM river_level_data 
                 ORDER BY created_at DESC 
-                LIMIT 100
-            """)
+                LIMIT %s OFFSET %s
+            """, (self._page_size, offset))
             
             rows = cursor.fetchall()
-            for row in rows:
-                self.river_tree.insert('', tk.END, values=row)
-            
             cursor.close()
+        finally:
             close_connection(conn)
-            self.update_status(f"Loaded {len(rows)} river records")
-            
-        except Exception as e:
-            self.update_status("Error loading river data")
-            messagebox.showerror("Error", f"Error loading river data: {str(e)}")
+        
+        return rows
+
+    def refresh_predictions_data(self, append=False):
+        """Refresh predictions data, or load the next page when append is True"""
+        self.load_page(self.predictions_tree, "prediction", self.fetch_prediction_rows, append)
 
-    def refresh_predictions_data(self):
-        """Refresh predictions data"""
+    def fetch_prediction_rows(self, offset):
+        """Query a page of display-ready prediction rows (runs on a worker thread)"""
+        conn = get_connection()
+        if not conn:
+            raise ConnectionError("Cannot connect to database")
+        
         try:
-            if not IMPORT_SUCCESS:
-                return
-            
-            self.update_status("Loading predictions...", True)
-            
-            # Clear existing data
-            for item in self.predictions_tree.get_children():
-                self.predictions_tree.delete(item)
-            
-            conn = get_connection()
-            if not conn:
-                messagebox.showerror("Error", "Cannot connect to database")
-                return
-            
             cursor = conn.cursor()
             
-            # Query predictions from flood_predictions table
+            # Query predictions with each cell formatted server-side, like the rainfall page
             cursor.execute("""
                 SELECT 
                     location_name,
-                    prediction_time,
-                    risk_level,
-                    probability,
-                    water_level,
-                    rainfall_1h,
-                    rainfall_3h,
-                    alert_level_exceeded,
-                    model_version
+                    IFNULL(CAST(prediction_time AS CHAR), 'N/A'),
+                    IFNULL(NULLIF(risk_level, ''), 'N/A'),
+                    IF(probability, CONCAT(ROUND(probability * 100, 1), '%'), 'N/A'),
+                    IF(water_level, CONCAT(ROUND(water_level, 0), 'cm'), 'N/A'),
+                    IF(rainfall_1h, CONCAT(ROUND(rainfall_1h, 1), 'mm'), '0.0mm'),
+                    IF(rainfall_3h, CONCAT(ROUND(rainfall_3h, 1), 'mm'), '0.0mm'),
+                    IF(alert_level_exceeded,
+                       CONCAT('L', alert_level_exceeded, ' - ',
+                              IFNULL(ELT(alert_level_exceeded, 'Low', 'Moderate', 'High'), 'N/A')),
+                       'N/A'),
+                    IFNULL(NULLIF(model_version, ''), 'N/A')
                 FROM flood_predictions 
                 ORDER BY prediction_time DESC 
-                LIMIT 100
-            """)
+                LIMIT %s OFFSET %s
+            """, (self._page_size, offset))
             
             rows = cursor.fetchall()
-            
-            # Alert level names
-            alert_names = {1: "Low", 2: "Moderate", 3: "High"}
-            
-            # Insert data into treeview
-            for row in rows:
-                location, time, risk, prob, water, rain_1h, rain_3h, alert_level, version = row
-                
-                display_row = (
-                    location,
-                    str(time)[:19] if time else 'N/A',
-                    risk or 'N/A',
-                    f"{float(prob)*100:.1f}%" if prob else 'N/A',
-                    f"{float(water):.0f}cm" if water else 'N/A',
-                    f"{float(rain_1h):.1f}mm" if rain_1h else '0.0mm',
-                    f"{float(rain_3h):.1f}mm" if rain_3h else '0.0mm',
-                    f"L{alert_level} - {alert_names.get(alert_level, 'N/A')}" if alert_level else 'N/A',
-                    version or 'N/A'
-                )
-                self.predictions_tree.insert('', tk.END, values=display_row)
-            
             cursor.close()
+        finally:
             close_connection(conn)
-            self.update_status(f"Loaded {len(rows)} prediction records")
-            
-        except Exception as e:
-            self.update_status("Error loading predictions")
-            messagebox.showerror("Error", f"Error loading predictions: {str(e)}")
-            import traceback
-            print(traceback.format_exc())
+        
+        return rows
 
     def refresh_all_data(self):
         """Refresh all data views"""
         try:
-            self.refresh_rainfall_data()
-            self.refresh_river_data()
-            self.refresh_predictions_data()
+            views = ((self.rainfall_tree, "rainfall", self.fetch_rainfall_rows),
+                     (self.river_tree, "river", self.fetch_river_rows),
+                     (self.predictions_tree, "prediction", self.fetch_prediction_rows))
+            remaining = [len(views)]
+            
+            def view_loaded():
+                remaining[0] -= 1
+                if remaining[0] == 0:
+                    self.update_status("All data refreshed")
+            
+            # The three queries are independent, so they run side by side on the
+            # database workers (and pooled connections) instead of one after another
+            for tree, what, fetch in views:
+                self.load_page(tree, what, fetch, False, view_loaded)
             self.refresh_dashboard()
         except Exception as e:
             messagebox.showerror("Error", f"Error refreshing data: {str(e)}")
@@ -1498,17 +1827,20 @@ RECOMMENDATIONS:
                 messagebox.showerror("Error", "Cannot connect to database")
                 return
             
-            cursor = conn.cursor()
-            cursor.execute("""
-                DELETE FROM flood_predictions 
-                WHERE prediction_time < DATE_SUB(NOW(), INTERVAL 30 DAY)
-            """)
-            deleted_count = cursor.rowcount
-            conn.commit();
-            
-            cursor.close()
-            close_connection(conn);
+            try:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    DELETE FROM flood_predictions 
+                    WHERE prediction_time < DATE_SUB(NOW(), INTERVAL 30 DAY)
+                """)
+                deleted_count = cursor.rowcount
+                conn.commit();
+                
+                cursor.close()
+            finally:
+                close_connection(conn)
             
+            self.invalidate_report_cache()
             messagebox.showinfo("Success", f"Deleted {deleted_count} old predictions")
             self.refresh_predictions_data();
             
@@ -1523,9 +1855,9 @@ RECOMMENDATIONS:
             
             def run_crawler():
                 try:
-                    # Use the correct filename: rainfall_crawler.py
-                    subprocess.run([sys.executable, "rainfall_crawler.py"], check=True)
+                    rainfall_crawler.main(self._http_session)
                     self.root.after(0, lambda: self.update_status("Weather data crawled successfully"))
+                    self.root.after(0, self.invalidate_report_cache)
                     self.root.after(0, self.refresh_rainfall_data)
                 except Exception as e:
                     self.root.after(0, lambda: messagebox.showerror("Error", f"Weather crawl failed: {str(e)}"))
@@ -1546,9 +1878,9 @@ RECOMMENDATIONS:
             
             def run_crawler():
                 try:
-                    # Use the correct filename: river_level_crawler.py
-                    subprocess.run([sys.executable, "river_level_crawler.py"], check=True)
+                    river_level_crawler.main()
                     self.root.after(0, lambda: self.update_status("River data crawled successfully"))
+                    self.root.after(0, self.invalidate_report_cache)
                     self.root.after(0, self.refresh_river_data)
                 except Exception as e:
                     self.root.after(0, lambda: messagebox.showerror("Error", f"River crawl failed: {str(e)}"))
@@ -1576,6 +1908,8 @@ RECOMMENDATIONS:
             
             self.update_status("Setting up database...", True)
             setup_database()
+            self._summary_sql = None
+            self.invalidate_report_cache()
             self.update_status("Database setup complete")
             messagebox.showinfo("Success", "Database setup successfully!")
             self.check_database_connection()
@@ -1611,45 +1945,76 @@ RECOMMENDATIONS:
 
     def cleanup_database(self):
         """Cleanup old data from database"""
+        if not IMPORT_SUCCESS:
+            return
+        
+        response = messagebox.askyesno("Confirm", "Delete data older than 90 days?")
+        if not response:
+            return
+        
+        self.update_status("Cleaning up old data...", True)
+        
+        # Each table is cleaned on its own worker; report once all are done
+        tables = tuple(self._CLEANUP_CONDITIONS)
+        deleted = {}
+        
+        def table_done(table, count):
+            deleted[table] = count
+            if len(deleted) == len(tables):
+                self.show_cleanup_result(deleted)
+        
+        for table in tables:
+            self.run_in_background(lambda t=table: self.delete_old_rows(t),
+                                   lambda count, t=table: table_done(t, count),
+                                   lambda e: self.on_database_error("Cleanup", e),
+                                   executor=self._db_executor)
+
+    def delete_old_rows(self, table, batch_size=10000):
+        """Delete rows older than 90 days in batches, then optimize the table (runs on a worker thread)"""
+        conn = get_connection()
+        if not conn:
+            raise ConnectionError("Cannot connect to database")
+        
         try:
-            if not IMPORT_SUCCESS:
-                return
-            
-            response = messagebox.askyesno("Confirm", "Delete data older than 90 days?")
-            if not response:
-                return
-            
-            conn = get_connection()
-            if not conn:
-                messagebox.showerror("Error", "Cannot connect to database")
-                return
-            
             cursor = conn.cursor()
             
-            # Delete old rainfall data
-            cursor.execute("""
-                DELETE FROM rainfall_data 
-                WHERE created_at < DATE_SUB(NOW(), INTERVAL 90 DAY)
-            """)
-            rainfall_deleted = cursor.rowcount
-            
-            # Delete old river data
-            cursor.execute("""
-                DELETE FROM river_level_data 
-                WHERE created_at < DATE_SUB(NOW(), INTERVAL 90 DAY)
-            """)
-            river_deleted = cursor.rowcount
+            # Short transactions keep locks and undo log small on large tables
+            total = 0
+            while True:
+                cursor.execute(f"""
+                    DELETE FROM {table} 
+                    WHERE {self._CLEANUP_CONDITIONS[table]}
+                    LIMIT %s
+                """, (batch_size,))
+                count = cursor.rowcount
+                conn.commit()
+                total += count
+                if count < batch_size:
+                    break
+            
+            # Reclaim the space freed by the deletes
+            if total:
+                cursor.execute(f"OPTIMIZE TABLE {table}")
+                cursor.fetchall()
             
-            conn.commit()
             cursor.close()
+        finally:
             close_connection(conn)
-            
-            messagebox.showinfo("Success", 
-                              f"Deleted {rainfall_deleted} rainfall records\n"
-                              f"Deleted {river_deleted} river records")
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"Cleanup failed: {str(e)}")
+        
+        return total
+
+    def show_cleanup_result(self, deleted):
+        """Report how many rows the cleanup removed"""
+        self.invalidate_report_cache()
+        self.update_status("Cleanup completed")
+        messagebox.showinfo("Success", 
+                          f"Deleted {deleted['rainfall_data']} rainfall records\n"
+                          f"Deleted {deleted['river_level_data']} river records")
+
+    def on_database_error(self, action, e):
+        """Report a failed database maintenance action"""
+        self.update_status(f"{action} failed")
+        messagebox.showerror("Error", f"{action} failed: {str(e)}")
 
     def backup_database(self):
         """Backup database"""
@@ -1676,55 +2041,74 @@ RECOMMENDATIONS:
 
     def clear_all_data(self):
         """Clear all data from database"""
+        response = messagebox.askyesnocancel("Warning", 
+            "This will delete ALL data from database. Are you absolutely sure?")
+        if not response:
+            return
+        
+        if not IMPORT_SUCCESS:
+            return
+        
+        self.update_status("Clearing all data...", True)
+        self.run_in_background(self.truncate_tables, self.show_clear_result,
+                               lambda e: self.on_database_error("Clear data", e),
+                               executor=self._db_executor)
+
+    def truncate_tables(self):
+        """Empty every data table (runs on a worker thread)"""
+        conn = get_connection()
+        if not conn:
+            raise ConnectionError("Cannot connect to database")
+        
         try:
-            response = messagebox.askyesnocancel("Warning", 
-                "This will delete ALL data from database. Are you absolutely sure?")
-            if not response:
-                return
-            
-            if not IMPORT_SUCCESS:
-                return
-            
-            conn = get_connection()
-            if not conn:
-                return
-            
             cursor = conn.cursor()
             cursor.execute("TRUNCATE TABLE rainfall_data")
             cursor.execute("TRUNCATE TABLE river_level_data")
             cursor.execute("TRUNCATE TABLE flood_predictions")
+            cursor.execute("TRUNCATE TABLE daily_correlation")
             conn.commit()
             
             cursor.close()
+        finally:
             close_connection(conn)
-            
-            messagebox.showinfo("Success", "All data cleared")
-            self.refresh_all_data()
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"Clear data failed: {str(e)}")
+
+    def show_clear_result(self, _):
+        """Confirm the tables were emptied and reload the views"""
+        self.invalidate_report_cache()
+        self.update_status("All data cleared")
+        messagebox.showinfo("Success", "All data cleared")
+        self.refresh_all_data()
 
     def optimize_database(self):
         """Optimize database tables"""
+        if not IMPORT_SUCCESS:
+            return
+        
+        self.update_status("Optimizing database...", True)
+        self.run_in_background(self.optimize_tables, self.show_optimize_result,
+                               lambda e: self.on_database_error("Optimization", e),
+                               executor=self._db_executor)
+
+    def optimize_tables(self):
+        """Run OPTIMIZE TABLE on every data table (runs on a worker thread)"""
+        conn = get_connection()
+        if not conn:
+            raise ConnectionError("Cannot connect to database")
+        
         try:
-            if not IMPORT_SUCCESS:
-                return
-            
-            conn = get_connection()
-            if not conn:
-                return
-            
             cursor = conn.cursor()
             cursor.execute("OPTIMIZE TABLE rainfall_data, river_level_data, flood_predictions")
+            cursor.fetchall()
             conn.commit()
             
             cursor.close()
+        finally:
             close_connection(conn)
-            
-            messagebox.showinfo("Success", "Database optimized")
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"Optimization failed: {str(e)}")
+
+    def show_optimize_result(self, _):
+        """Confirm the tables were optimized"""
+        self.update_status("Database optimized")
+        messagebox.showinfo("Success", "Database optimized")
 
     # Reports methods
     def generate_reports(self):
@@ -1735,114 +2119,195 @@ RECOMMENDATIONS:
             
             self.update_status("Generating reports...", True)
             
+            # Reuse the last result sets for this range while they are fresh
+            range_key = self.date_range_var.get()
+            cached = self._report_cache.get(range_key)
+            if cached and time.monotonic() - cached[1] < self.REPORT_CACHE_TTL:
+                self.draw_reports(cached[0])
+                return
+            
             # Get time range
-            start_date = self.report_start_date.get_date()
-            end_date = self.report_end_date.get_date()
+            start_date, end_date = self.report_date_range()
+            version = self._report_cache_version
             
-            conn = get_connection()
-            if not conn:
-                messagebox.showerror("Error", "Cannot connect to database")
-                return
+            def apply_report_data(data):
+                if version == self._report_cache_version:
+                    self._report_cache[range_key] = (data, time.monotonic())
+                self.draw_reports(data)
             
+            self.run_in_background(lambda: self.fetch_report_data(start_date, end_date),
+                                   apply_report_data, self.on_report_error,
+                                   executor=self._db_executor)
+            
+        except Exception as e:
+            import traceback
+            print(traceback.format_exc())
+            self.on_report_error(e)
+
+    def invalidate_report_cache(self):
+        """Forget cached report data after the underlying tables change"""
+        self._report_cache.clear()
+        self._report_cache_version += 1
+
+    def report_date_range(self):
+        """Return the (start, end) datetimes for the selected report time range"""
+        end_date = datetime.now()
+        days = DATE_RANGE_DAYS.get(self.date_range_var.get())
+        if days is None:
+            return datetime(1970, 1, 2), end_date
+        return end_date - timedelta(days=days), end_date
+
+    def fetch_report_data(self, start_date, end_date):
+        """Query the four report datasets in one round trip (runs on a worker thread)"""
+        conn = get_connection()
+        if not conn:
+            raise ConnectionError("Cannot connect to database")
+        
+        try:
             cursor = conn.cursor()
             
-            # Clear previous plots
-            for ax in self.reports_axes.flat:
-                ax.clear()
+            # All four statements go out together; each result set is read back in order
+            # (multi-statement execute/nextset needs mysql-connector-python 9.2+)
+            cursor.execute(";".join(self._REPORT_QUERIES), (start_date, end_date) * len(self._REPORT_QUERIES))
+            results = [cursor.fetchall()]
+            while cursor.nextset():
+                results.append(cursor.fetchall())
+            
+            cursor.close()
+        finally:
+            close_connection(conn)
+        
+        rainfall_data, level_data, risk_data, correlation_data = results
+        return {
+            'rainfall': rainfall_data,
+            'level': level_data,
+            'risk': risk_data,
+            'correlation': correlation_data
+        }
+
+    def draw_reports(self, data):
+        """Plot fetched report data on the reports figure"""
+        with self.reports_canvas.mutating():
+            axes = self.reports_axes
+            previous = dict(self._report_artists)
             
             # Chart 1: Daily average rainfall
-            cursor.execute(f"""
-                SELECT DATE(created_at) as date, 
-                       AVG(CAST(JSON_EXTRACT(precipitation, '$.rainfall_1h') AS DECIMAL(10,2))) as avg_rainfall
-                FROM rainfall_data 
-                WHERE created_at BETWEEN '{start_date}' AND '{end_date}'
-                GROUP BY DATE(created_at)
-                ORDER BY date
-            """)
-            rainfall_data = cursor.fetchall()
-            
-            if rainfall_data:
-                dates = [row[0] for row in rainfall_data]
-                rainfall = [float(row[1]) if row[1] else 0 for row in rainfall_data]
-                self.reports_axes[0, 0].plot(dates, rainfall, marker='o')
-                self.reports_axes[0, 0].set_title('Daily Average Rainfall')
-                self.reports_axes[0, 0].set_ylabel('Rainfall (mm)')
-                self.reports_axes[0, 0].tick_params(axis='x', rotation=45)
+            rainfall_data = data['rainfall']
+            dates = [row[0] for row in rainfall_data]
+            rainfall = [float(row[1]) if row[1] else 0 for row in rainfall_data]
+            redraw = self.update_report_line(axes[0, 0], 'rainfall', dates, rainfall,
+                                               'Daily Average Rainfall', 'Rainfall (mm)')
             
             # Chart 2: Average water level by location
-            cursor.execute(f"""
-                SELECT location_name, AVG(water_level) as avg_level
-                FROM river_data 
-                WHERE created_at BETWEEN '{start_date}' AND '{end_date}'
-                GROUP BY location_name
-                ORDER BY avg_level DESC
-            """)
-            level_data = cursor.fetchall()
-            
-            
-            if level_data:
-                locations = [row[0] for row in level_data]
-                levels = [float(row[1]) if row[1] else 0 for row in level_data]
-                self.reports_axes[0, 1].bar(locations, levels)
-                self.reports_axes[0, 1].set_title('Average Water Level by Location')
-                self.reports_axes[0, 1].set_ylabel('Water Level (cm)')
-                self.reports_axes[0, 1].tick_params(axis='x', rotation=45)
+            level_data = data['level']
+            locations = [row[0] for row in level_data]
+            levels = [float(row[1]) if row[1] else 0 for row in level_data]
+            redraw |= self.update_report_bars(axes[0, 1], 'level', locations, levels,
+                                                'Average Water Level by Location', 'Water Level (cm)',
+                                                rotate=True)
             
             # Chart 3: Flood risk distribution
-            cursor.execute(f"""
-                SELECT risk_level, COUNT(*) as count
-                FROM predictions 
-                WHERE prediction_time BETWEEN '{start_date}' AND '{end_date}'
-                GROUP BY risk_level
-            """)
-            risk_data = cursor.fetchall()
-            
-            if risk_data:
-                risk_levels = [row[0] for row in risk_data]
-                counts = [row[1] for row in risk_data]
-                colors = {'Low': 'green', 'Medium': 'yellow', 'High': 'orange', 'Critical': 'red'}
-                bar_colors = [colors.get(level, 'gray') for level in risk_levels]
-                self.reports_axes[1, 0].bar(risk_levels, counts, color=bar_colors)
-                self.reports_axes[1, 0].set_title('Flood Risk Distribution')
-                self.reports_axes[1, 0].set_ylabel('Number of Predictions')
+            risk_data = data['risk']
+            risk_levels = [row[0] for row in risk_data]
+            counts = [row[1] for row in risk_data]
+            colors = {'LOW': 'green', 'MODERATE': 'orange', 'HIGH': 'red'}
+            bar_colors = [colors.get(level, 'gray') for level in risk_levels]
+            redraw |= self.update_report_bars(axes[1, 0], 'risk', risk_levels, counts,
+                                                'Flood Risk Distribution', 'Number of Predictions',
+                                                colors=bar_colors)
             
             # Chart 4: Correlation between rainfall and water level
-            cursor.execute(f"""
-                SELECT 
-                    r.location_name,
-                    CAST(JSON_EXTRACT(rf.precipitation, '$.rainfall_1h') AS DECIMAL(10,2)) as rainfall,
-                    r.water_level
-                FROM river_data r
-                LEFT JOIN rainfall_data rf ON r.location_name = rf.location_name 
-                    AND DATE(r.created_at) = DATE(rf.created_at)
-                WHERE r.created_at BETWEEN '{start_date}' AND '{end_date}'
-                    AND JSON_EXTRACT(rf.precipitation, '$.rainfall_1h') IS NOT NULL
-                LIMIT 100
-            """)
-            correlation_data = cursor.fetchall()
-            
-            if correlation_data:
-                rainfall_vals = [float(row[1]) if row[1] else 0 for row in correlation_data]
-                water_vals = [float(row[2]) if row[2] else 0 for row in correlation_data]
-                self.reports_axes[1, 1].scatter(rainfall_vals, water_vals, alpha=0.5)
-                self.reports_axes[1, 1].set_title('Rainfall vs Water Level')
-                self.reports_axes[1, 1].set_xlabel('Rainfall (mm)')
-                self.reports_axes[1, 1].set_ylabel('Water Level (cm)')
-            
-            cursor.close()
-            close_connection(conn)
-            
-            # Update display
-            self.reports_fig.tight_layout()
-            self.reports_canvas.draw()
-            
-            self.update_status("Reports generated successfully")
-            
-        except Exception as e:
-            self.update_status("Report generation failed")
-            messagebox.showerror("Error", f"Report generation failed: {str(e)}")
-            import traceback
-            print(traceback.format_exc())
+            correlation_data = data['correlation']
+            rainfall_vals = [float(row[1]) if row[1] else 0 for row in correlation_data]
+            water_vals = [float(row[2]) if row[2] else 0 for row in correlation_data]
+            redraw |= self.update_report_scatter(axes[1, 1], 'correlation', rainfall_vals, water_vals)
+            
+            # Blit just the data artists when no chart was rebuilt or rescaled
+            charted_axes = [ax for ax in axes.flat if any(a.get_animated() for a in ax.get_children())]
+            if redraw or not self.reports_canvas.blit_animated(charted_axes):
+                # Labels only move when a chart was rebuilt
+                relayout = self._report_artists.keys() != previous.keys() or any(
+                    self._report_artists[key] is not artist for key, artist in previous.items())
+                self.reports_canvas.draw_idle(layout=relayout)
+            
+        self.update_status("Reports generated successfully")
+
+    def clear_report_axes(self, ax, key):
+        """Empty a report chart that has no data; returns True if the axes need a full redraw"""
+        if self._report_artists.pop(key, None) is None:
+            return False
+        ax.clear()
+        return True
+
+    def update_report_line(self, ax, key, x, y, title, ylabel):
+        """Update the report line in place, creating it on first use; returns True if the axes need a full redraw"""
+        if not x:
+            return self.clear_report_axes(ax, key)
+        
+        line = self._report_artists.get(key)
+        if line is not None:
+            limits = (ax.get_xlim(), ax.get_ylim())
+            line.set_data(x, y)
+            ax.relim()
+            ax.autoscale_view()
+            return (ax.get_xlim(), ax.get_ylim()) != limits
+        
+        ax.clear()
+        self._report_artists[key], = ax.plot(x, y, marker='o', animated=True)
+        ax.set_title(title)
+        ax.set_ylabel(ylabel)
+        ax.tick_params(axis='x', rotation=45)
+        return True
+
+    def update_report_bars(self, ax, key, labels, heights, title, ylabel, colors=None, rotate=False):
+        """Resize report bars in place while the categories are unchanged; returns True if the axes need a full redraw"""
+        if not labels:
+            return self.clear_report_axes(ax, key)
+        
+        cached = self._report_artists.get(key)
+        if cached is not None and cached[0] == labels:
+            limits = ax.get_ylim()
+            for bar, height in zip(cached[1], heights):
+                bar.set_height(height)
+            ax.relim()
+            ax.autoscale_view()
+            return ax.get_ylim() != limits
+        
+        ax.clear()
+        self._report_artists[key] = (labels, ax.bar(labels, heights, color=colors, animated=True))
+        ax.set_title(title)
+        ax.set_ylabel(ylabel)
+        if rotate:
+            ax.tick_params(axis='x', rotation=45)
+        return True
+
+    def update_report_scatter(self, ax, key, x, y):
+        """Move the report scatter points in place, creating them on first use; returns True if the axes need a full redraw"""
+        if not x:
+            return self.clear_report_axes(ax, key)
+        
+        offsets = np.column_stack((x, y))
+        points = self._report_artists.get(key)
+        if points is not None:
+            limits = (ax.get_xlim(), ax.get_ylim())
+            points.set_offsets(offsets)
+            # relim() skips collections, so rebuild the data limits from the points
+            ax.ignore_existing_data_limits = True
+            ax.update_datalim(offsets)
+            ax.autoscale_view()
+            return (ax.get_xlim(), ax.get_ylim()) != limits
+        
+        ax.clear()
+        self._report_artists[key] = ax.scatter(x, y, alpha=0.5, animated=True)
+        ax.set_title('Rainfall vs Water Level')
+        ax.set_xlabel('Rainfall (mm)')
+        ax.set_ylabel('Water Level (cm)')
+        return True
+
+    def on_report_error(self, e):
+        """Report a failed report generation"""
+        self.update_status("Report generation failed")
+        messagebox.showerror("Error", f"Report generation failed: {str(e)}")
 
     def export_report(self):
         """Export report to PDF"""
@@ -1867,30 +2332,62 @@ RECOMMENDATIONS:
                 if not IMPORT_SUCCESS:
                     return
                 
+                # Write-only workbooks stream rows to a temporary file instead of keeping every cell
+                from openpyxl import Workbook
+                
                 conn = get_connection()
                 if not conn:
                     return
                 
-                # Create Excel writer
-                with pd.ExcelWriter(filename, engine='openpyxl') as writer:
-                    # Export rainfall data
-                    rainfall_df = pd.read_sql("SELECT * FROM rainfall_data ORDER BY created_at DESC LIMIT 1000", conn)
-                    rainfall_df.to_excel(writer, sheet_name='Rainfall Data', index=False)
-                    
-                    # Export river data
-                    river_df = pd.read_sql("SELECT * FROM river_level_data ORDER BY created_at DESC LIMIT 1000", conn)
-                    river_df.to_excel(writer, sheet_name='River Data', index=False)
-                    
-                    # Export predictions
-                    pred_df = pd.read_sql("SELECT * FROM flood_predictions ORDER BY prediction_time DESC LIMIT 1000", conn)
-                    pred_df.to_excel(writer, sheet_name='Predictions', index=False)
+                try:
+                    workbook = Workbook(write_only=True)
+                    truncated = [
+                        sheet_name for query, sheet_name in (
+                            ("SELECT * FROM rainfall_data ORDER BY created_at DESC", 'Rainfall Data'),
+                            ("SELECT * FROM river_level_data ORDER BY created_at DESC", 'River Data'),
+                            ("SELECT * FROM flood_predictions ORDER BY prediction_time DESC", 'Predictions'),
+                        )
+                        if not self.export_sheet(workbook, conn, query, sheet_name)
+                    ]
+                    workbook.save(filename)
+                finally:
+                    close_connection(conn)
                 
-                close_connection(conn)
-                messagebox.showinfo("Success", f"Data exported to {filename}")
+                message = f"Data exported to {filename}"
+                if truncated:
+                    message += (f"\n\nOnly the newest {EXCEL_MAX_ROWS - 1} rows fit in: "
+                                f"{', '.join(truncated)}")
+                messagebox.showinfo("Success", message)
                 
         except Exception as e:
             messagebox.showerror("Error", f"Excel export failed: {str(e)}")
 
+    def export_sheet(self, workbook, conn, query, sheet_name, chunksize=5000):
+        """Append a query result to a new sheet row by row; returns False if it hit Excel's row limit"""
+        sheet = workbook.create_sheet(sheet_name)
+        
+        # Unbuffered cursor: rows stay on the server until each fetchmany asks for them
+        cursor = conn.cursor(buffered=False)
+        try:
+            cursor.execute(query)
+            sheet.append([column[0] for column in cursor.description])
+            
+            room = EXCEL_MAX_ROWS - 1
+            while room:
+                rows = cursor.fetchmany(min(chunksize, room))
+                if not rows:
+                    return True
+                for row in rows:
+                    sheet.append(row)
+                room -= len(rows)
+            
+            return cursor.fetchone() is None
+        finally:
+            # Rows past the limit are left on the server; read them off before the cursor closes
+            if conn.unread_result:
+                conn.consume_results()
+            cursor.close()
+
     # Settings methods
     def test_db_connection(self):
         """Test database connection with current settings"""
@@ -4,38 +4,119 @@
 import pandas as pd
 import numpy as np
 from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score, classification_report
 import json
+import os
+import glob
+import hashlib
+import sys
+import joblib
+from functools import lru_cache
 from datetime import datetime
 from setup_db import get_connection, close_connection
 
-def load_combined_data():
-    """Load combined data from 2 tables: weather + river water level"""
+# orjson writes JSON several times faster than the json module
+try:
+    import orjson
+    
+    def json_dumps(obj):
+        """Serialize obj to a JSON string, non-ASCII text unescaped"""
+        return orjson.dumps(obj).decode()
+except ImportError:
+    def json_dumps(obj):
+        """Serialize obj to a JSON string, non-ASCII text unescaped"""
+        return json.dumps(obj, ensure_ascii=False)
+
+# Trained models saved by main(), one file per training data fingerprint
+MODEL_DIR = 'models'
+
+# Set once a save has seen the flood_predictions table; until then each save looks it up
+_TABLE_EXISTS = False
+
+WEATHER_FIELDS = ['temperature', 'humidity', 'pressure', 'rainfall_1h', 'rainfall_3h', 'wind_speed']
+
+# WEATHER_FIELDS from rainfall_data r's generated columns: Kelvin to Celsius and
+# Pa to hPa where needed, missing values as 0
+WEATHER_SELECT = """CASE WHEN r.temperature > 100 THEN r.temperature - 273.15
+                 ELSE COALESCE(r.temperature, 0) END as temperature,
+            COALESCE(r.humidity, 0) as humidity,
+            CASE WHEN r.pressure > 50000 THEN r.pressure / 100
+                 ELSE COALESCE(r.pressure, 0) END as pressure,
+            COALESCE(r.rainfall_1h, 0) as rainfall_1h,
+            COALESCE(r.rainfall_3h, 0) as rainfall_3h,
+            COALESCE(r.wind_speed, 0) as wind_speed"""
+
+# Model inputs of the advanced (weather + river) and basic (weather only) models
+ADVANCED_FEATURES = WEATHER_FIELDS + [
+    'water_level', 'water_level_ratio', 'flow_rate_normal', 'alert_level_exceeded',
+    'trend_rising', 'trend_falling'
+]
+BASIC_FEATURES = WEATHER_FIELDS
+
+# Flood probability bands of the basic model: below 0.2 SAFE, below 0.4 LOW, ...
+RISK_TEXT_THRESHOLDS = np.array([0.2, 0.4, 0.6, 0.8])
+RISK_TEXTS = np.array(['SAFE', 'LOW', 'MODERATE', 'HIGH', 'VERY HIGH'])
+RISK_TEXT_COLORS = np.array(['green', 'yellow', 'orange', 'red', 'darkred'])
+WARNING_THRESHOLDS = np.array([0.4, 0.6])
+
+# Report line for each warning_levels() code
+WARNING_MESSAGES = (
+    "",
+    "  Monitor: Monitor weather conditions",
+    "  WARNING: High flood risk! Prepare preventive measures"
+)
+
+# Numeric columns selected by load_combined_data
+COMBINED_FLOAT_FIELDS = ['latitude', 'longitude'] + WEATHER_FIELDS + [
+    'water_level', 'water_level_ratio', 'normal_level', 'alert_level_1', 'alert_level_2',
+    'alert_level_3', 'flow_rate', 'flow_rate_normal'
+]
+COMBINED_INT_FIELDS = ['alert_level_exceeded', 'trend_rising', 'trend_falling']
+
+# Column dtypes of the load_combined_data and load_data_from_db query results
+COMBINED_DTYPES = dict.fromkeys(COMBINED_FLOAT_FIELDS, np.float32)
+COMBINED_DTYPES.update(dict.fromkeys(COMBINED_INT_FIELDS, np.int8))
+WEATHER_DTYPES = dict.fromkeys(['latitude', 'longitude'] + WEATHER_FIELDS, np.float32)
+
+# Column layout of generate_advanced_training_data's synthetic frame
+SYNTHETIC_FLOAT_FIELDS = COMBINED_FLOAT_FIELDS
+SYNTHETIC_INT_FIELDS = COMBINED_INT_FIELDS + ['flood_risk_level']
+SYNTHETIC_LEVELS = {'normal_level': 150.0, 'alert_level_1': 180.0, 'alert_level_2': 220.0, 'alert_level_3': 270.0}
+
+def load_combined_data(conn=None):
+    """Load combined data from 2 tables: weather + river water level (on conn if given)"""
+    own_conn = conn is None
     try:
-        conn = get_connection()
+        if own_conn:
+            conn = get_connection()
         if not conn:
             print("Cannot connect to database")
             return None
-            
-        cursor = conn.cursor()
         
-        # Query to combine weather and water level data
-        query = """
+        # Query to combine weather and water level data. Units, alert level and river
+        # indices are derived in the SELECT; weather comes from rainfall_data's generated columns
+        query = f"""
         SELECT 
             r.location_name,
-            r.latitude, r.longitude,
-            r.precipitation,
-            r.created_at as weather_time,
             rl.river_name,
+            r.latitude, r.longitude,
+            {WEATHER_SELECT},
             rl.water_level,
+            CASE WHEN rl.normal_level > 0 THEN rl.water_level / rl.normal_level
+                 ELSE 1 END as water_level_ratio,
             rl.normal_level,
             rl.alert_level_1,
             rl.alert_level_2, 
             rl.alert_level_3,
-            rl.flow_rate,
-            rl.trend,
-            rl.created_at as river_time
+            COALESCE(rl.flow_rate, 0) as flow_rate,
+            COALESCE(rl.flow_rate, 0) / 1000 as flow_rate_normal,
+            CASE WHEN rl.water_level >= rl.alert_level_3 THEN 3
+                 WHEN rl.water_level >= rl.alert_level_2 THEN 2
+                 WHEN rl.water_level >= rl.alert_level_1 THEN 1
+                 ELSE 0 END as alert_level_exceeded,
+            COALESCE(rl.trend = 'rising', 0) as trend_rising,
+            COALESCE(rl.trend = 'falling', 0) as trend_falling,
+            r.created_at
         FROM rainfall_data r
         LEFT JOIN river_level_data rl ON r.location_name = rl.location_name
         WHERE rl.water_level IS NOT NULL
@@ -43,125 +124,76 @@ def load_combined_data():
         ORDER BY r.created_at DESC
         """
         
-        cursor.execute(query)
-        results = cursor.fetchall()
-        
-        combined_data = []
-        for row in results:
-            (location_name, lat, lon, precipitation_json, weather_time, 
-             river_name, water_level, normal_level, alert1, alert2, alert3, 
-             flow_rate, trend, river_time) = row
-            
-            # Decode weather data
-            weather_data = json.loads(precipitation_json)
-            
-            # Convert units if necessary
-            temp = weather_data.get('temperature', 0)
-            if temp > 100:
-                temp = temp - 273.15
-                
-            pressure = weather_data.get('pressure', 0)
-            if pressure > 50000:
-                pressure = pressure / 100
-            
-            # Calculate additional indices
-            water_level_ratio = water_level / normal_level if normal_level > 0 else 1
-            flow_rate_normal = flow_rate / 1000 if flow_rate else 0
-            
-            # Determine current alert level
-            alert_level_exceeded = 0
-            if water_level >= alert3:
-                alert_level_exceeded = 3
-            elif water_level >= alert2:
-                alert_level_exceeded = 2
-            elif water_level >= alert1:
-                alert_level_exceeded = 1
-            
-            combined_data.append({
-                'location_name': location_name,
-                'river_name': river_name,
-                'latitude': lat,
-                'longitude': lon,
-                'temperature': float(temp),
-                'humidity': float(weather_data.get('humidity', 0)),
-                'pressure': float(pressure),
-                'rainfall_1h': float(weather_data.get('rainfall_1h', 0)),
-                'rainfall_3h': float(weather_data.get('rainfall_3h', 0)),
-                'wind_speed': float(weather_data.get('wind_speed', 0)),
-                'water_level': float(water_level),
-                'water_level_ratio': float(water_level_ratio),
-                'normal_level': float(normal_level),
-                'alert_level_1': float(alert1),
-                'alert_level_2': float(alert2),
-                'alert_level_3': float(alert3),
-                'flow_rate': float(flow_rate) if flow_rate else 0,
-                'flow_rate_normal': float(flow_rate_normal),
-                'alert_level_exceeded': int(alert_level_exceeded),
-                'trend_rising': 1 if trend == 'rising' else 0,
-                'trend_falling': 1 if trend == 'falling' else 0,
-                'created_at': weather_time
-            })
+        # Type each streamed chunk as it arrives so only one raw chunk is held at a time
+        try:
+            frames = list(read_chunks(conn, query, COMBINED_DTYPES))
+        finally:
+            if own_conn:
+                close_connection(conn)
         
-        cursor.close()
-        close_connection(conn)
+        if not frames:
+            return pd.DataFrame()
         
-        return pd.DataFrame(combined_data)
+        return pd.concat(frames, ignore_index=True)
         
     except Exception as e:
         print(f"Error loading data: {e}")
         return None
 
-def load_data_from_db():
-    """Load data from database (weather only) - for backward compatibility"""
+def read_chunks(conn, query, dtypes, chunksize=10000):
+    """Yield a query result as DataFrames of up to chunksize rows from an unbuffered cursor"""
+    # Unbuffered cursor: rows stay on the server until each fetchmany asks for them
+    cursor = conn.cursor(buffered=False)
+    try:
+        cursor.execute(query)
+        columns = [column[0] for column in cursor.description]
+        
+        while True:
+            rows = cursor.fetchmany(chunksize)
+            if not rows:
+                break
+            
+            # Transpose to columns and fill each typed column straight from the row values
+            # (DECIMAL values arrive as Decimal objects); other columns are left to pandas
+            yield pd.DataFrame({
+                name: np.array(values, dtype=dtypes[name]) if name in dtypes else list(values)
+                for name, values in zip(columns, zip(*rows))
+            }, copy=False)
+    finally:
+        # A consumer that stopped early leaves rows on the server; read them off so the
+        # cursor can close and the (pooled) connection can run its next query
+        if conn.unread_result:
+            conn.consume_results()
+        cursor.close()
+
+def load_data_from_db(conn=None):
+    """Load data from database (weather only) - for backward compatibility (on conn if given)"""
+    own_conn = conn is None
     try:
-        conn = get_connection()
+        if own_conn:
+            conn = get_connection()
         if not conn:
             print("Cannot connect to database")
             return None
-            
-        cursor = conn.cursor()
         
-        query = """
-        SELECT location_name, latitude, longitude, precipitation, created_at
-        FROM rainfall_data
-        ORDER BY created_at DESC
+        query = f"""
+        SELECT r.location_name, r.latitude, r.longitude,
+            {WEATHER_SELECT},
+            r.created_at
+        FROM rainfall_data r
+        ORDER BY r.created_at DESC
         """
         
-        cursor.execute(query)
-        results = cursor.fetchall()
-        
-        data = []
-        for row in results:
-            location_name, lat, lon, precipitation_json, created_at = row
-            precipitation_data = json.loads(precipitation_json)
-            
-            # Convert temperature from Kelvin to Celsius if needed
-            temp = precipitation_data.get('temperature', 0)
-            if temp > 100:
-                temp = temp - 273.15
-            
-            # Convert pressure from Pa to hPa if needed
-            pressure = precipitation_data.get('pressure', 0)
-            if pressure > 50000:
-                pressure = pressure / 100
-            
-            data.append({
-                'location_name': location_name,
-                'latitude': lat,
-                'longitude': lon,
-                'temperature': float(temp),
-                'humidity': float(precipitation_data.get('humidity', 0)),
-                'pressure': float(pressure),
-                'rainfall_1h': float(precipitation_data.get('rainfall_1h', 0)),
-                'rainfall_3h': float(precipitation_data.get('rainfall_3h', 0)),
-                'wind_speed': float(precipitation_data.get('wind_speed', 0)),
-                'created_at': created_at
-            })
+        try:
+            frames = list(read_chunks(conn, query, WEATHER_DTYPES))
+        finally:
+            if own_conn:
+                close_connection(conn)
         
-        cursor.close()
-        close_connection(conn)
+        if not frames:
+            return pd.DataFrame()
         
-        return pd.DataFrame(data)
+        return pd.concat(frames, ignore_index=True)
         
     except Exception as e:
         print(f"Error loading data: {e}")
@@ -180,106 +212,96 @@ def generate_advanced_training_data(real_df):
         avg_temp, avg_humidity, avg_pressure = 26.0, 75.0, 1013.0
         avg_water_level = 200.0
     
-    synthetic_data = []
-    
-    # 1. LOW RISK - Low risk (60 samples)
-    print("Generating data: LOW risk...")
-    for i in range(60):
-        sample = {
-            'location_name': f'Low_Risk_{i}',
-            'river_name': f'River_{i%7}',
-            'latitude': 10.0 + np.random.uniform(-5, 5),
-            'longitude': 106.0 + np.random.uniform(-5, 5),
-            'temperature': avg_temp + np.random.uniform(-2, 3),
-            'humidity': np.random.uniform(40, 75),
-            'pressure': avg_pressure + np.random.uniform(0, 15),
-            'rainfall_1h': np.random.uniform(0, 8),
-            'rainfall_3h': np.random.uniform(0, 20),
-            'wind_speed': np.random.uniform(3, 15),
-            'water_level': np.random.uniform(80, 140),
-            'water_level_ratio': np.random.uniform(0.6, 0.9),
-            'normal_level': 150.0,
-            'alert_level_1': 180.0,
-            'alert_level_2': 220.0,
-            'alert_level_3': 270.0,
-            'flow_rate': np.random.uniform(200, 600),
-            'flow_rate_normal': np.random.uniform(0.2, 0.6),
-            'alert_level_exceeded': 0,
-            'trend_rising': np.random.choice([0, 1], p=[0.7, 0.3]),
-            'trend_falling': np.random.choice([0, 1], p=[0.5, 0.5]),
-            'flood_risk_level': 0  # LOW
-        }
-        synthetic_data.append(sample)
-    
-    # 2. MODERATE RISK - Moderate risk (50 samples)  
-    print("Generating data: MODERATE risk...")
-    for i in range(50):
-        alert_exceeded = np.random.choice([0, 1, 2], p=[0.3, 0.5, 0.2])
-        
-        sample = {
-            'location_name': f'Moderate_Risk_{i}',
-            'river_name': f'River_{i%7}',
-            'latitude': 10.0 + np.random.uniform(-5, 5),
-            'longitude': 106.0 + np.random.uniform(-5, 5),
-            'temperature': avg_temp + np.random.uniform(-3, 1),
-            'humidity': np.random.uniform(70, 90),
-            'pressure': avg_pressure + np.random.uniform(-10, 5),
-            'rainfall_1h': np.random.uniform(5, 18),
-            'rainfall_3h': np.random.uniform(15, 40),
-            'wind_speed': np.random.uniform(8, 25),
-            'water_level': np.random.uniform(160, 240),
-            'water_level_ratio': np.random.uniform(0.9, 1.4),
-            'normal_level': 150.0,
-            'alert_level_1': 180.0,
-            'alert_level_2': 220.0,
-            'alert_level_3': 270.0,
-            'flow_rate': np.random.uniform(500, 1200),
-            'flow_rate_normal': np.random.uniform(0.5, 1.2),
-            'alert_level_exceeded': alert_exceeded,
-            'trend_rising': np.random.choice([0, 1], p=[0.4, 0.6]),
-            'trend_falling': np.random.choice([0, 1], p=[0.7, 0.3]),
-            'flood_risk_level': 1  # MODERATE
-        }
-        synthetic_data.append(sample)
-    
-    # 3. HIGH RISK - High risk (40 samples)
-    print("Generating data: HIGH risk...")
-    for i in range(40):
-        alert_exceeded = np.random.choice([2, 3], p=[0.4, 0.6])
-        
-        sample = {
-            'location_name': f'High_Risk_{i}',
-            'river_name': f'River_{i%7}',
-            'latitude': 10.0 + np.random.uniform(-5, 5),
-            'longitude': 106.0 + np.random.uniform(-5, 5),
-            'temperature': avg_temp + np.random.uniform(-5, -1),
-            'humidity': np.random.uniform(85, 99),
-            'pressure': np.random.uniform(980, 1005),
-            'rainfall_1h': np.random.uniform(15, 50),
-            'rainfall_3h': np.random.uniform(35, 100),
-            'wind_speed': np.random.uniform(20, 60),
-            'water_level': np.random.uniform(240, 320),
-            'water_level_ratio': np.random.uniform(1.4, 2.1),
-            'normal_level': 150.0,
-            'alert_level_1': 180.0,
-            'alert_level_2': 220.0,
-            'alert_level_3': 270.0,
-            'flow_rate': np.random.uniform(1200, 3000),
-            'flow_rate_normal': np.random.uniform(1.2, 3.0),
-            'alert_level_exceeded': alert_exceeded,
-            'trend_rising': np.random.choice([0, 1], p=[0.2, 0.8]),
-            'trend_falling': np.random.choice([0, 1], p=[0.9, 0.1]),
-            'flood_risk_level': 2  # HIGH
-        }
-        synthetic_data.append(sample)
+    # Fixed seed: the same real data always gives the same training set
+    rng = np.random.default_rng(42)
+    
+    tiers = [
+        # 1. LOW RISK - Low risk (60 samples)
+        ('LOW', 60, 'Low_Risk', 0, {
+            'temperature': (avg_temp - 2, avg_temp + 3),
+            'humidity': (40, 75),
+            'pressure': (avg_pressure, avg_pressure + 15),
+            'rainfall_1h': (0, 8),
+            'rainfall_3h': (0, 20),
+            'wind_speed': (3, 15),
+            'water_level': (80, 140),
+            'water_level_ratio': (0.6, 0.9),
+            'flow_rate': (200, 600),
+            'flow_rate_normal': (0.2, 0.6),
+        }, [0], [1.0], 0.3, 0.5),
+        # 2. MODERATE RISK - Moderate risk (50 samples)
+        ('MODERATE', 50, 'Moderate_Risk', 1, {
+            'temperature': (avg_temp - 3, avg_temp + 1),
+            'humidity': (70, 90),
+            'pressure': (avg_pressure - 10, avg_pressure + 5),
+            'rainfall_1h': (5, 18),
+            'rainfall_3h': (15, 40),
+            'wind_speed': (8, 25),
+            'water_level': (160, 240),
+            'water_level_ratio': (0.9, 1.4),
+            'flow_rate': (500, 1200),
+            'flow_rate_normal': (0.5, 1.2),
+        }, [0, 1, 2], [0.3, 0.5, 0.2], 0.6, 0.3),
+        # 3. HIGH RISK - High risk (40 samples)
+        ('HIGH', 40, 'High_Risk', 2, {
+            'temperature': (avg_temp - 5, avg_temp - 1),
+            'humidity': (85, 99),
+            'pressure': (980, 1005),
+            'rainfall_1h': (15, 50),
+            'rainfall_3h': (35, 100),
+            'wind_speed': (20, 60),
+            'water_level': (240, 320),
+            'water_level_ratio': (1.4, 2.1),
+            'flow_rate': (1200, 3000),
+            'flow_rate_normal': (1.2, 3.0),
+        }, [2, 3], [0.4, 0.6], 0.8, 0.1),
+    ]
     
-    print(f"Generated {len(synthetic_data)} training data samples")
+    # One preallocated array per column; each tier fills its own slice
+    n_total = sum(tier[1] for tier in tiers)
+    columns = {name: np.empty(n_total, dtype=np.float32) for name in SYNTHETIC_FLOAT_FIELDS}
+    # Reference levels are the same for every synthetic river
+    for name, value in SYNTHETIC_LEVELS.items():
+        columns[name] = np.full(n_total, value, dtype=np.float32)
+    columns.update({name: np.empty(n_total, dtype=np.int8) for name in SYNTHETIC_INT_FIELDS})
+    
+    start = 0
+    for label, n, prefix, risk_level, ranges, alert_levels, alert_p, rising_p, falling_p in tiers:
+        print(f"Generating data: {label} risk...")
+        _synthetic_risk_tier(rng, columns, slice(start, start + n), risk_level, ranges,
+                             alert_levels, alert_p, rising_p, falling_p)
+        start += n
+    
+    # Names are '<prefix>_<index within tier>'; repeated names are stored once as categories
+    tier_index = np.concatenate([np.arange(tier[1]) for tier in tiers])
+    prefixes = np.repeat([f'{tier[2]}_' for tier in tiers], [tier[1] for tier in tiers])
+    synthetic_df = pd.DataFrame({
+        'location_name': pd.Categorical(np.char.add(prefixes, tier_index.astype(str))),
+        'river_name': pd.Categorical.from_codes(tier_index % 7, [f'River_{i}' for i in range(7)]),
+        **columns
+    }, copy=False)
+    print(f"Generated {len(synthetic_df)} training data samples")
     
-    synthetic_df = pd.DataFrame(synthetic_data)
     synthetic_df['created_at'] = pd.Timestamp.now()
     
     return synthetic_df
 
+def _synthetic_risk_tier(rng, columns, rows, risk_level, ranges, alert_levels, alert_p, rising_p, falling_p):
+    """Fill the rows slice of the synthetic column arrays with samples of one risk level"""
+    n = rows.stop - rows.start
+    
+    # One (n x features) uniform draw covers every ranged feature plus the coordinates
+    features = list(ranges) + ['latitude', 'longitude']
+    low, high = np.array(list(ranges.values()) + [(5, 15), (101, 111)], dtype=float).T
+    draws = rng.uniform(low, high, (n, len(features)))
+    for j, feature in enumerate(features):
+        columns[feature][rows] = draws[:, j]
+    
+    columns['alert_level_exceeded'][rows] = rng.choice(alert_levels, size=n, p=alert_p)
+    columns['trend_rising'][rows] = rng.random(n) < rising_p
+    columns['trend_falling'][rows] = rng.random(n) < falling_p
+    columns['flood_risk_level'][rows] = risk_level
+
 def create_flood_labels(df):
     """Create flood risk labels with 3 levels based on real-world rules"""
     
@@ -287,55 +309,62 @@ def create_flood_labels(df):
     has_river_data = 'water_level' in df.columns and 'alert_level_exceeded' in df.columns
     
     if has_river_data:
-        # Use advanced rules with water level data
-        df['flood_risk_level'] = 0  # Default LOW
-        
+        # Use advanced rules with water level data, on NumPy arrays pulled out once
+        r1 = df['rainfall_1h'].to_numpy()
+        r3 = df['rainfall_3h'].to_numpy()
+        alert = df['alert_level_exceeded'].to_numpy()
+        ratio = df['water_level_ratio'].to_numpy()
+        rising = df['trend_rising'].to_numpy() == 1
+        humidity = df['humidity'].to_numpy()
+        pressure = df['pressure'].to_numpy()
+        
+        # Each rule is OR-ed into its mask in place, so only the comparisons allocate.
+        # Plain NumPy on purpose: numexpr was several times slower on these boolean chains
         # Conditions for HIGH RISK (2)
-        high_conditions = (
-            (df['rainfall_1h'] > 20) |
-            (df['rainfall_3h'] > 45) |
-            (df['alert_level_exceeded'] >= 3) |
-            ((df['water_level_ratio'] > 1.5) & (df['trend_rising'] == 1)) |
-            ((df['rainfall_1h'] > 15) & (df['alert_level_exceeded'] >= 2)) |
-            ((df['humidity'] > 90) & (df['pressure'] < 1000) & (df['rainfall_1h'] > 10))
-        )
+        high_conditions = r1 > 20
+        high_conditions |= r3 > 45
+        high_conditions |= alert >= 3
+        high_conditions |= (ratio > 1.5) & rising
+        high_conditions |= (r1 > 15) & (alert >= 2)
+        high_conditions |= (humidity > 90) & (pressure < 1000) & (r1 > 10)
         
         # Conditions for MODERATE RISK (1)  
-        moderate_conditions = (
-            ((df['rainfall_1h'] > 10) & (df['rainfall_1h'] <= 20)) |
-            ((df['rainfall_3h'] > 25) & (df['rainfall_3h'] <= 45)) |
-            (df['alert_level_exceeded'] == 2) |
-            ((df['alert_level_exceeded'] == 1) & (df['trend_rising'] == 1)) |
-            ((df['water_level_ratio'] > 1.2) & (df['water_level_ratio'] <= 1.5)) |
-            ((df['humidity'] > 85) & (df['rainfall_1h'] > 5)) |
-            ((df['pressure'] < 1005) & (df['rainfall_1h'] > 8))
-        )
-        
-        # Apply labels
-        df.loc[high_conditions, 'flood_risk_level'] = 2
-        df.loc[moderate_conditions & (df['flood_risk_level'] != 2), 'flood_risk_level'] = 1
+        moderate_conditions = (r1 > 10) & (r1 <= 20)
+        moderate_conditions |= (r3 > 25) & (r3 <= 45)
+        moderate_conditions |= alert == 2
+        moderate_conditions |= (alert == 1) & rising
+        moderate_conditions |= (ratio > 1.2) & (ratio <= 1.5)
+        moderate_conditions |= (humidity > 85) & (r1 > 5)
+        moderate_conditions |= (pressure < 1005) & (r1 > 8)
+        
+        # Apply labels (default LOW) straight into one int8 array: HIGH wins over MODERATE
+        labels = moderate_conditions.view(np.int8).copy()
+        labels[high_conditions] = 2
+        df['flood_risk_level'] = labels
         
     else:
-        # Use basic rules with only weather data
-        df['flood_risk'] = 0  # Maintain backward compatibility
+        # Use basic rules with only weather data: any rule holding means flood risk (1)
+        r1 = df['rainfall_1h'].to_numpy()
+        humidity = df['humidity'].to_numpy()
+        pressure = df['pressure'].to_numpy()
         
         # Rainfall > 15mm/h or > 30mm/3h: high risk
-        df.loc[(df['rainfall_1h'] > 15) | (df['rainfall_3h'] > 30), 'flood_risk'] = 1
+        flood = (r1 > 15) | (df['rainfall_3h'].to_numpy() > 30)
         
         # High humidity + moderate rain: moderate risk
-        df.loc[(df['humidity'] > 85) & (df['rainfall_1h'] > 8), 'flood_risk'] = 1
+        flood |= (humidity > 85) & (r1 > 8)
         
         # Low pressure + rain: storm condition
-        df.loc[(df['pressure'] < 1005) & (df['rainfall_1h'] > 10), 'flood_risk'] = 1
+        flood |= (pressure < 1005) & (r1 > 10)
         
         # Strong wind + rain: increased risk
-        df.loc[(df['wind_speed'] > 20) & (df['rainfall_1h'] > 5), 'flood_risk'] = 1
+        flood |= (df['wind_speed'].to_numpy() > 20) & (r1 > 5)
         
         # If no rain, still risky under bad conditions
-        df.loc[(df['humidity'] > 90) & (df['pressure'] < 1000), 'flood_risk'] = 1
+        flood |= (humidity > 90) & (pressure < 1000)
         
-        # Convert to integer
-        df['flood_risk'] = df['flood_risk'].astype(int)
+        # Column name kept for backward compatibility
+        df['flood_risk'] = flood.view(np.int8)
     
     return df
 
@@ -352,26 +381,29 @@ def train_model(df):
     
     if has_river_data:
         # Advanced model with water level data
-        features = [
-            'temperature', 'humidity', 'pressure', 'rainfall_1h', 'rainfall_3h', 'wind_speed',
-            'water_level', 'water_level_ratio', 'flow_rate_normal', 'alert_level_exceeded',
-            'trend_rising', 'trend_falling'
-        ]
+        features = list(ADVANCED_FEATURES)
         target = 'flood_risk_level'
         is_advanced = True
     else:
         # Basic model with only weather data
-        features = ['temperature', 'humidity', 'pressure', 'rainfall_1h', 'rainfall_3h', 'wind_speed']
+        features = list(BASIC_FEATURES)
         target = 'flood_risk'
         is_advanced = False
     
-    # Ensure numerical data
+    # Ensure numerical data. Loaded and synthetic columns are already float32/int8,
+    # so only convert what is not numeric and only fill what can hold NaN
     for feature in features:
         if feature in df.columns:
-            df[feature] = pd.to_numeric(df[feature], errors='coerce').fillna(0)
+            column = df[feature]
+            if not pd.api.types.is_numeric_dtype(column):
+                df[feature] = pd.to_numeric(column, errors='coerce').fillna(0)
+            elif pd.api.types.is_float_dtype(column) and column.isna().any():
+                df[feature] = column.fillna(0)
     
-    X = df[features]
-    y = df[target].astype(int)
+    # Trees split on float32 anyway, so hand them a float32 array and skip the float64 copy.
+    # Fitting on a plain array also lets predict_flood_risk pass one without a feature-name check.
+    X = df[features].to_numpy(dtype=np.float32)
+    y = df[target].astype(np.int8)
     
     # Statistics distribution
     if is_advanced:
@@ -384,48 +416,62 @@ def train_model(df):
         print(f"Label distribution: No flood={sum(y==0)}, Flood={sum(y==1)}")
         print(f"Flood ratio: {sum(y==1)/len(y)*100:.1f}%")
     
-    # Split data
-    if len(df) > 80 and len(y.unique()) > 1:
-        try:
-            X_train, X_test, y_train, y_test = train_test_split(
-                X, y, test_size=0.2, random_state=42, stratify=y
-            )
-        except:
-            X_train, X_test, y_train, y_test = train_test_split(
-                X, y, test_size=0.2, random_state=42
-            )
+    # Hold out a test set only for large data; otherwise the out-of-bag samples do the job
+    use_split = len(df) > 1000 and len(y.unique()) > 1
+    if use_split:
+        train, test = _stratified_split(y.to_numpy(), 0.2, np.random.default_rng(42))
+        X_train, X_test, y_train, y_test = X[train], X[test], y.iloc[train], y.iloc[test]
     else:
-        X_train, X_test = X, X
-        y_train, y_test = y, y
+        X_train, y_train = X, y
     
-    # Train model
+    # Train model. A random forest because predict_batch walks its flattened trees and its
+    # out-of-bag score stands in for a held-out split on small data
     if is_advanced:
         model = RandomForestClassifier(
-            n_estimators=150,
-            max_depth=10,
+            n_estimators=50,
+            max_depth=6,
             min_samples_split=3,
             min_samples_leaf=1,
             random_state=42,
-            class_weight='balanced'
+            class_weight='balanced',
+            max_features='sqrt',
+            min_impurity_decrease=1e-4,
+            n_jobs=-1,
+            oob_score=not use_split
         )
     else:
         model = RandomForestClassifier(
-            n_estimators=100,
-            max_depth=8,
+            n_estimators=50,
+            max_depth=6,
             min_samples_split=5,
             min_samples_leaf=2,
             random_state=42,
-            class_weight='balanced'
+            class_weight='balanced',
+            max_features='sqrt',
+            min_impurity_decrease=1e-4,
+            n_jobs=-1,
+            oob_score=not use_split
         )
     
     try:
         model.fit(X_train, y_train)
+        clear_prediction_cache()
         
-        # Evaluate
-        y_pred = model.predict(X_test)
-        accuracy = accuracy_score(y_test, y_pred)
+        # Compile the forest for predict_batch now rather than on the first prediction
+        model._flat_forest = flatten_forest(model)
+        # Rows of df the score below is measured on; None when it is out-of-bag
+        model._eval_rows = test if use_split else None
         
-        print(f"Model accuracy: {accuracy:.3f}")
+        # Evaluate
+        if use_split:
+            y_pred = model.predict(X_test)
+            accuracy = accuracy_score(y_test, y_pred)
+            print(f"Model accuracy: {accuracy:.3f}")
+        else:
+            # Out-of-bag votes come with the fit, no second pass over the data
+            y_test = y_train
+            y_pred = model.classes_[np.argmax(model.oob_decision_function_, axis=1)]
+            print(f"Model accuracy (out-of-bag): {model.oob_score_:.3f}")
         
         # Detailed report
         if is_advanced:
@@ -444,8 +490,9 @@ def train_model(df):
         }).sort_values('importance', ascending=False)
         
         print("\nFeature importance levels:")
-        for _, row in feature_importance.head(8).iterrows():
-            print(f"  {row['feature']}: {row['importance']:.3f}")
+        top = feature_importance.head(8)
+        for feature, importance in zip(top['feature'], top['importance']):
+            print(f"  {feature}: {importance:.3f}")
         
         return model, features, is_advanced
         
@@ -453,164 +500,295 @@ def train_model(df):
         print(f"Error training model: {e}")
         return None, None, False
 
+def _stratified_split(y, test_size, rng):
+    """(train, test) index arrays holding test_size of every class in the test part"""
+    train, test = [], []
+    for label in np.unique(y):
+        rows = rng.permutation(np.flatnonzero(y == label))
+        n_test = int(len(rows) * test_size)
+        test.append(rows[:n_test])
+        train.append(rows[n_test:])
+    return np.concatenate(train), np.concatenate(test)
+
 def predict_flood_risk(model, features, weather_data, is_advanced=False):
-    """Predict flood risk"""
+    """Predict flood risk (repeated identical inputs are answered from a cache)"""
     if model is None:
         return None
     
     try:
-        # Create DataFrame
-        input_data = pd.DataFrame([weather_data])
-        
-        # Predict
-        prediction = model.predict(input_data[features])[0]
-        probabilities = model.predict_proba(input_data[features])[0]
-        
-        if is_advanced:
-            # 3-level result
-            risk_labels = ['LOW', 'MODERATE', 'HIGH']
-            risk_colors = ['green', 'orange', 'red']
-            
-            result = {
-                'risk_level': risk_labels[prediction],
-                'risk_numeric': int(prediction),
-                'probabilities': {},
-                'confidence': float(max(probabilities)),
-                'color': risk_colors[prediction]
-            }
-            
-            # Process probabilities according to actual classes
-            for i, label in enumerate(risk_labels):
-                if i < len(probabilities):
-                    result['probabilities'][label] = float(probabilities[i])
-                else:
-                    result['probabilities'][label] = 0.0
-        else:
-            # 2-level result (backward compatibility)
-            result = {
-                'flood_risk': int(prediction),
-                'probability_no_flood': float(probabilities[0]),
-                'probability_flood': float(probabilities[1]) if len(probabilities) > 1 else 1-probabilities[0],
-                'confidence': float(max(probabilities))
-            }
-        
-        return result
+        values = tuple(float(weather_data[f]) for f in features)
+        prediction, probabilities = _cached_prediction(model, tuple(features), values)
+        return risk_result(prediction, probabilities, is_advanced)
         
     except Exception as e:
         print(f"Error predicting: {e}")
         return None
 
+@lru_cache(maxsize=1024)
+def _cached_prediction(model, features, values):
+    """Predicted class and class probabilities for one row of feature values"""
+    predictions, probabilities = predict_batch(model, np.array([values], dtype=np.float32))
+    return predictions[0], tuple(probabilities[0])
+
+def clear_prediction_cache():
+    """Forget cached predictions, e.g. after a model was trained or loaded"""
+    _cached_prediction.cache_clear()
+
+def predict_batch(model, X):
+    """Return (predicted classes, class probabilities) for a float32 (rows x features) array"""
+    # Flatten the forest once per model, then walk it with NumPy instead of sklearn's predict path
+    forest = getattr(model, '_flat_forest', None)
+    if forest is None:
+        forest = model._flat_forest = flatten_forest(model)
+    
+    # Predict (predict() is the argmax of predict_proba, so walk the trees once)
+    probabilities = forest_predict_proba(forest, X)
+    return model.classes_[np.argmax(probabilities, axis=1)], probabilities
+
+def flatten_forest(model):
+    """Pack the trees of a fitted forest into padded (trees x nodes) arrays"""
+    trees = [estimator.tree_ for estimator in model.estimators_]
+    n_nodes = max(tree.node_count for tree in trees)
+    
+    # Padding nodes are leaves (left == -1) that are never reached
+    forest = {
+        'feature': np.zeros((len(trees), n_nodes), dtype=np.intp),
+        'threshold': np.zeros((len(trees), n_nodes), dtype=np.float32),
+        'left': np.full((len(trees), n_nodes), -1, dtype=np.intp),
+        'right': np.full((len(trees), n_nodes), -1, dtype=np.intp),
+        'value': np.zeros((len(trees), n_nodes, len(model.classes_)), dtype=np.float32),
+        'depth': max(tree.max_depth for tree in trees)
+    }
+    
+    for i, tree in enumerate(trees):
+        count = tree.node_count
+        forest['feature'][i, :count] = tree.feature
+        # Round thresholds down to float32: for float32 inputs x <= t and x <= t32 then agree exactly
+        threshold = tree.threshold.astype(np.float32)
+        forest['threshold'][i, :count] = np.where(threshold > tree.threshold,
+                                                  np.nextafter(threshold, np.float32(-np.inf)), threshold)
+        forest['left'][i, :count] = tree.children_left
+        forest['right'][i, :count] = tree.children_right
+        # Leaf class fractions, as each tree's predict_proba reports them
+        value = tree.value[:, 0, :]
+        totals = value.sum(axis=1, keepdims=True)
+        forest['value'][i, :count] = np.divide(value, totals, out=np.zeros_like(value), where=totals > 0)
+    
+    return forest
+
+def forest_predict_proba(forest, X):
+    """Average leaf class fractions over all trees, walking every tree one level per step"""
+    n_trees = forest['left'].shape[0]
+    rows = np.arange(len(X))[:, None]
+    trees = np.arange(n_trees)[None, :]
+    node = np.zeros((len(X), n_trees), dtype=np.intp)
+    
+    for _ in range(forest['depth']):
+        left = forest['left'][trees, node]
+        go_left = X[rows, forest['feature'][trees, node]] <= forest['threshold'][trees, node]
+        child = np.where(go_left, left, forest['right'][trees, node])
+        node = np.where(left == -1, node, child)
+    
+    return forest['value'][trees, node].mean(axis=1)
+
+def risk_result(prediction, probabilities, is_advanced=False):
+    """Build the result dict for one predicted row"""
+    if is_advanced:
+        # 3-level result
+        risk_labels = ['LOW', 'MODERATE', 'HIGH']
+        risk_colors = ['green', 'orange', 'red']
+        
+        result = {
+            'risk_level': risk_labels[prediction],
+            'risk_numeric': int(prediction),
+            'probabilities': {},
+            'confidence': float(max(probabilities)),
+            'color': risk_colors[prediction]
+        }
+        
+        # Process probabilities according to actual classes
+        for i, label in enumerate(risk_labels):
+            if i < len(probabilities):
+                result['probabilities'][label] = float(probabilities[i])
+            else:
+                result['probabilities'][label] = 0.0
+    else:
+        # 2-level result (backward compatibility)
+        result = {
+            'flood_risk': int(prediction),
+            'probability_no_flood': float(probabilities[0]),
+            'probability_flood': float(probabilities[1]) if len(probabilities) > 1 else 1-probabilities[0],
+            'confidence': float(max(probabilities))
+        }
+    
+    return result
+
 def get_risk_level_text(probability_or_level, is_advanced=False):
-    """Convert result to descriptive text"""
+    """Convert result to descriptive text (a flood probability may also be an array of them)"""
     if is_advanced:
         # Already has text from advanced model
         return probability_or_level, "auto"
     else:
-        # Convert probability to level (old model)
-        if probability_or_level < 0.2:
-            return "SAFE", "green"
-        elif probability_or_level < 0.4:
-            return "LOW", "yellow"
-        elif probability_or_level < 0.6:
-            return "MODERATE", "orange"
-        elif probability_or_level < 0.8:
-            return "HIGH", "red"
+        # Convert probability to level (old model): count the thresholds at or below it
+        level = np.searchsorted(RISK_TEXT_THRESHOLDS, probability_or_level, side='right')
+        return RISK_TEXTS[level], RISK_TEXT_COLORS[level]
+
+def warning_levels(probability_or_level, is_advanced=False):
+    """Warning code per row (0 none, 1 monitor, 2 high risk) for an array of results"""
+    if is_advanced:
+        # Predicted risk levels LOW/MODERATE/HIGH are the codes themselves
+        return np.asarray(probability_or_level, dtype=np.int8)
+    else:
+        # Flood probability above 0.4 needs monitoring, above 0.6 is high risk
+        return np.searchsorted(WARNING_THRESHOLDS, probability_or_level, side='left').astype(np.int8)
+
+def save_prediction_result(location_name, prediction_data, input_data, is_advanced=False, conn=None):
+    """Save prediction result to database (on conn if given)"""
+    return save_prediction_results([prediction_row(location_name, prediction_data, input_data, is_advanced)], conn)
+
+def prediction_row(location_name, prediction_data, input_data, is_advanced=False):
+    """Build the flood_predictions row for one prediction result"""
+    # Generate recommendations based on result
+    if is_advanced:
+        risk_level = prediction_data['risk_level']
+        if risk_level == 'HIGH':
+            recommendations = [
+                "Evacuate residents in danger zones",
+                "Prepare emergency relief supplies", 
+                "Continuously monitor water levels",
+                "Activate emergency response team"
+            ]
+        elif risk_level == 'MODERATE':
+            recommendations = [
+                "Closely monitor weather developments",
+                "Prepare response measures",
+                "Notify residents in low-lying areas",
+                "Check drainage systems"
+            ]
         else:
-            return "VERY HIGH", "darkred"
+            recommendations = [
+                "Continue monitoring weather updates",
+                "Maintain normal operations"
+            ]
+        
+        probability = prediction_data['probabilities'][risk_level]
+    else:
+        # Old model
+        if prediction_data['probability_flood'] > 0.6:
+            risk_level = 'HIGH'
+            recommendations = ["High flood risk warning", "Prepare response measures"]
+        elif prediction_data['probability_flood'] > 0.4:
+            risk_level = 'MODERATE'  
+            recommendations = ["Monitor situation", "Check drainage systems"]
+        else:
+            risk_level = 'LOW'
+            recommendations = ["Continue monitoring"]
+        
+        probability = prediction_data['probability_flood']
+    
+    return (
+        location_name,
+        risk_level,
+        probability,
+        0.5,  # Weather factor placeholder
+        0.5,  # River factor placeholder
+        prediction_data.get('confidence', 0.5),
+        input_data.get('rainfall_1h', 0),
+        input_data.get('rainfall_3h', 0),
+        input_data.get('water_level', 0),
+        input_data.get('alert_level_exceeded', 0),
+        json_dumps(recommendations),
+        'integrated_v1.0'
+    )
 
-def save_prediction_result(location_name, prediction_data, input_data, is_advanced=False):
-    """Save prediction result to database"""
+def save_prediction_results(rows, conn=None):
+    """Save prediction_row() tuples with one INSERT and one commit (on conn if given)"""
+    global _TABLE_EXISTS
+    own_conn = conn is None
     try:
-        conn = get_connection()
+        if own_conn:
+            conn = get_connection()
         if not conn:
             return False
-            
-        cursor = conn.cursor()
         
-        # Generate recommendations based on result
-        if is_advanced:
-            risk_level = prediction_data['risk_level']
-            if risk_level == 'HIGH':
-                recommendations = [
-                    "Evacuate residents in danger zones",
-                    "Prepare emergency relief supplies", 
-                    "Continuously monitor water levels",
-                    "Activate emergency response team"
-                ]
-            elif risk_level == 'MODERATE':
-                recommendations = [
-                    "Closely monitor weather developments",
-                    "Prepare response measures",
-                    "Notify residents in low-lying areas",
-                    "Check drainage systems"
-                ]
-            else:
-                recommendations = [
-                    "Continue monitoring weather updates",
-                    "Maintain normal operations"
-                ]
-            
-            probability = prediction_data['probabilities'][risk_level]
-        else:
-            # Old model
-            if prediction_data['probability_flood'] > 0.6:
-                risk_level = 'HIGH'
-                recommendations = ["High flood risk warning", "Prepare response measures"]
-            elif prediction_data['probability_flood'] > 0.4:
-                risk_level = 'MODERATE'  
-                recommendations = ["Monitor situation", "Check drainage systems"]
-            else:
-                risk_level = 'LOW'
-                recommendations = ["Continue monitoring"]
+        try:
+            cursor = conn.cursor()
             
-            probability = prediction_data['probability_flood']
-        
-        # Check if table exists
-        cursor.execute("SHOW TABLES LIKE 'flood_predictions'")
-        table_exists = cursor.fetchone() is not None
-        
-        if table_exists:
-            query = """
-            INSERT INTO flood_predictions 
-            (location_name, risk_level, probability, weather_factor, river_factor, 
-             combined_score, rainfall_1h, rainfall_3h, water_level, alert_level_exceeded,
-             recommendations, model_version)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """
+            # Look for the table until it has been seen once (database setup may create it later)
+            if not _TABLE_EXISTS:
+                cursor.execute("SHOW TABLES LIKE 'flood_predictions'")
+                _TABLE_EXISTS = cursor.fetchone() is not None
             
-            values = (
-                location_name,
-                risk_level,
-                probability,
-                0.5,  # Weather factor placeholder
-                0.5,  # River factor placeholder
-                prediction_data.get('confidence', 0.5),
-                input_data.get('rainfall_1h', 0),
-                input_data.get('rainfall_3h', 0),
-                input_data.get('water_level', 0),
-                input_data.get('alert_level_exceeded', 0),
-                json.dumps(recommendations, ensure_ascii=False),
-                'integrated_v1.0'
-            )
+            if _TABLE_EXISTS and rows:
+                query = """
+                INSERT INTO flood_predictions 
+                (location_name, risk_level, probability, weather_factor, river_factor, 
+                 combined_score, rainfall_1h, rainfall_3h, water_level, alert_level_exceeded,
+                 recommendations, model_version)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                """
+                
+                # executemany rewrites this into a single multi-row INSERT
+                cursor.executemany(query, rows)
+                conn.commit()
             
-            cursor.execute(query, values)
-            conn.commit()
-        
-        cursor.close()
-        close_connection(conn)
+            cursor.close()
+        finally:
+            if own_conn:
+                close_connection(conn)
         return True
         
     except Exception as e:
         print(f"Error saving prediction result: {e}")
         return False
 
-def main():
-    print("=== INTEGRATED FLOOD PREDICTION SYSTEM ===")
-    print("Automatically detects data type and selects appropriate model")
+def data_fingerprint(df):
+    """Short hash of a training frame's contents (created_at, stamped at load time, excluded)"""
+    content = df.drop(columns='created_at', errors='ignore')
+    digest = hashlib.sha256(','.join(content.columns).encode())
+    digest.update(pd.util.hash_pandas_object(content, index=False).to_numpy().tobytes())
+    return digest.hexdigest()[:16]
+
+def model_path(fingerprint):
+    """Where the model trained on data with this fingerprint is saved"""
+    return os.path.join(MODEL_DIR, f'{fingerprint}.joblib')
+
+def save_model(model, features, is_advanced, path):
+    """Save a trained model and its feature list with joblib, replacing older saved models"""
+    try:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        for old_path in glob.glob(os.path.join(os.path.dirname(path) or '.', '*.joblib')):
+            if old_path != path:
+                os.remove(old_path)
+        joblib.dump({'model': model, 'features': features, 'is_advanced': is_advanced}, path, compress=3)
+        return True
+    except Exception as e:
+        print(f"Error saving model: {e}")
+        return False
+
+def load_model(path):
+    """Load (model, features, is_advanced) saved by save_model, or None"""
+    if not os.path.exists(path):
+        return None
     
+    try:
+        saved = joblib.load(path)
+        clear_prediction_cache()
+        return saved['model'], saved['features'], saved['is_advanced']
+    except Exception as e:
+        print(f"Error loading model: {e}")
+        return None
+
+def train_from_database(conn=None):
+    """Load data, add synthetic samples and train; returns (model, features, is_advanced)"""
+    df, use_advanced = load_training_data(conn)
+    return train_from_data(df, use_advanced)
+
+def load_training_data(conn=None):
+    """Load real data (on conn if given), label it and add synthetic samples; returns (df, use_advanced)"""
     # Try loading combined data first
     print("Checking combined data (weather + river water level)...")
-    combined_df = load_combined_data()
+    combined_df = load_combined_data(conn)
     
     if combined_df is not None and len(combined_df) > 0:
         print(f"Found {len(combined_df)} combined data records")
@@ -630,7 +808,7 @@ def main():
         print("Using basic model with 2 risk levels")
         
         # Load basic weather data
-        real_df = load_data_from_db()
+        real_df = load_data_from_db(conn)
         if real_df is None:
             real_df = pd.DataFrame()
         
@@ -640,46 +818,53 @@ def main():
         if len(real_df) > 0:
             real_df = create_flood_labels(real_df)
         
-        # Generate basic training data (from old code)
-        synthetic_data = []
+        # Generate basic training data (from old code), seeded like the advanced set
+        rng = np.random.default_rng(42)
         
         # Generate heavy rain causing flood data
-        for i in range(30):
-            sample = {
-                'location_name': f'Heavy_Rain_{i}',
-                'latitude': 10.0 + np.random.uniform(-5, 5),
-                'longitude': 106.0 + np.random.uniform(-5, 5),
-                'temperature': 26.0 + np.random.uniform(-3, 2),
-                'humidity': np.random.uniform(80, 98),
-                'pressure': 1013.0 + np.random.uniform(-15, 5),
-                'rainfall_1h': np.random.uniform(20, 50),
-                'rainfall_3h': np.random.uniform(40, 100),
-                'wind_speed': np.random.uniform(15, 35),
-                'flood_risk': 1
-            }
-            synthetic_data.append(sample)
+        n = 30
+        flood_df = pd.DataFrame({
+            'location_name': [f'Heavy_Rain_{i}' for i in range(n)],
+            'latitude': 10.0 + rng.uniform(-5, 5, n),
+            'longitude': 106.0 + rng.uniform(-5, 5, n),
+            'temperature': 26.0 + rng.uniform(-3, 2, n),
+            'humidity': rng.uniform(80, 98, n),
+            'pressure': 1013.0 + rng.uniform(-15, 5, n),
+            'rainfall_1h': rng.uniform(20, 50, n),
+            'rainfall_3h': rng.uniform(40, 100, n),
+            'wind_speed': rng.uniform(15, 35, n),
+            'flood_risk': np.ones(n, dtype=np.int8)
+        })
         
         # Generate no-flood data
-        for i in range(40):
-            sample = {
-                'location_name': f'No_Flood_{i}',
-                'latitude': 10.0 + np.random.uniform(-5, 5),
-                'longitude': 106.0 + np.random.uniform(-5, 5),
-                'temperature': 26.0 + np.random.uniform(-2, 3),
-                'humidity': np.random.uniform(40, 85),
-                'pressure': 1013.0 + np.random.uniform(-5, 15),
-                'rainfall_1h': np.random.uniform(0, 12),
-                'rainfall_3h': np.random.uniform(0, 25),
-                'wind_speed': np.random.uniform(3, 20),
-                'flood_risk': 0
-            }
-            synthetic_data.append(sample)
-        
-        synthetic_df = pd.DataFrame(synthetic_data)
+        n = 40
+        no_flood_df = pd.DataFrame({
+            'location_name': [f'No_Flood_{i}' for i in range(n)],
+            'latitude': 10.0 + rng.uniform(-5, 5, n),
+            'longitude': 106.0 + rng.uniform(-5, 5, n),
+            'temperature': 26.0 + rng.uniform(-2, 3, n),
+            'humidity': rng.uniform(40, 85, n),
+            'pressure': 1013.0 + rng.uniform(-5, 15, n),
+            'rainfall_1h': rng.uniform(0, 12, n),
+            'rainfall_3h': rng.uniform(0, 25, n),
+            'wind_speed': rng.uniform(3, 20, n),
+            'flood_risk': np.zeros(n, dtype=np.int8)
+        })
+        
+        synthetic_df = pd.concat([flood_df, no_flood_df], ignore_index=True)
         synthetic_df['created_at'] = pd.Timestamp.now()
     
     # Combine data
     if len(real_df) > 0:
+        # Give both frames the same columns and float widths so concat stacks them block by block
+        columns = synthetic_df.columns.union(real_df.columns, sort=False)
+        real_df = real_df.reindex(columns=columns)
+        synthetic_df = synthetic_df.reindex(columns=columns)
+        real_df = real_df.astype({
+            c: synthetic_df[c].dtype for c in columns
+            if real_df[c].dtype != synthetic_df[c].dtype
+            and pd.api.types.is_float_dtype(real_df[c]) and pd.api.types.is_float_dtype(synthetic_df[c])
+        })
         df = pd.concat([real_df, synthetic_df], ignore_index=True)
         print(f"Combined: {len(real_df)} real + {len(synthetic_df)} synthetic = {len(df)} total")
     else:
@@ -695,101 +880,127 @@ def main():
     if 'water_level' in df.columns:
         print(f"  - Average water level: {df['water_level'].mean():.1f}cm")
     
-    # Train model
+    return df, use_advanced
+
+def train_from_data(df, use_advanced):
+    """Train on a load_training_data() frame; returns (model, features, is_advanced)"""
     result = train_model(df)
     if len(result) == 3:
-        model, features, is_advanced = result
+        return result
+    
+    model, features = result
+    return model, features, use_advanced
+
+def main(retrain=False):
+    print("=== INTEGRATED FLOOD PREDICTION SYSTEM ===")
+    print("Automatically detects data type and selects appropriate model")
+    
+    # Both loaders run on one borrowed connection
+    conn = get_connection()
+    try:
+        df, use_advanced = load_training_data(conn)
+    finally:
+        close_connection(conn)
+    
+    # Reuse the model saved for exactly this training data unless asked to retrain
+    path = model_path(data_fingerprint(df))
+    saved = None if retrain else load_model(path)
+    if saved:
+        model, features, is_advanced = saved
+        print(f"Loaded model trained on the same data from {path} (use --retrain to train a new one)")
     else:
-        model, features = result
-        is_advanced = use_advanced
+        model, features, is_advanced = train_from_data(df, use_advanced)
+        if model is not None and save_model(model, features, is_advanced, path):
+            print(f"Model saved to {path}")
     
     if model is not None:
         print(f"\n=== TEST PREDICTION ({'ADVANCED' if is_advanced else 'BASIC'}) ===")
         
+        # Test scenarios: one row per scenario, columns in ADVANCED_FEATURES / BASIC_FEATURES order
         if is_advanced:
-            # Test scenarios for advanced model
-            test_scenarios = [
-                {
-                    'name': 'Clear weather - Normal water level',
-                    'temperature': 28, 'humidity': 60, 'pressure': 1015,
-                    'rainfall_1h': 0, 'rainfall_3h': 0, 'wind_speed': 8,
-                    'water_level': 120, 'water_level_ratio': 0.8, 'flow_rate_normal': 0.4,
-                    'alert_level_exceeded': 0, 'trend_rising': 0, 'trend_falling': 0
-                },
-                {
-                    'name': 'Moderate rain - Rising water level',
-                    'temperature': 25, 'humidity': 80, 'pressure': 1008,
-                    'rainfall_1h': 12, 'rainfall_3h': 28, 'wind_speed': 15,
-                    'water_level': 190, 'water_level_ratio': 1.1, 'flow_rate_normal': 0.8,
-                    'alert_level_exceeded': 1, 'trend_rising': 1, 'trend_falling': 0
-                },
-                {
-                    'name': 'Heavy rain - Exceeded alert level 2',
-                    'temperature': 23, 'humidity': 92, 'pressure': 1002,
-                    'rainfall_1h': 25, 'rainfall_3h': 55, 'wind_speed': 25,
-                    'water_level': 240, 'water_level_ratio': 1.6, 'flow_rate_normal': 1.5,
-                    'alert_level_exceeded': 2, 'trend_rising': 1, 'trend_falling': 0
-                }
+            scenario_features = ADVANCED_FEATURES
+            names = [
+                'Clear weather - Normal water level',
+                'Moderate rain - Rising water level',
+                'Heavy rain - Exceeded alert level 2'
             ]
+            scenarios = np.array([
+                [28, 60, 1015, 0, 0, 8, 120, 0.8, 0.4, 0, 0, 0],
+                [25, 80, 1008, 12, 28, 15, 190, 1.1, 0.8, 1, 1, 0],
+                [23, 92, 1002, 25, 55, 25, 240, 1.6, 1.5, 2, 1, 0]
+            ], dtype=np.float32)
         else:
-            # Test scenarios for basic model  
-            test_scenarios = [
-                {
-                    'name': 'Sunny weather',
-                    'temperature': 29.0, 'humidity': 65, 'pressure': 1015,
-                    'rainfall_1h': 0, 'rainfall_3h': 0, 'wind_speed': 8
-                },
-                {
-                    'name': 'Light rain',
-                    'temperature': 27.0, 'humidity': 75, 'pressure': 1012,
-                    'rainfall_1h': 4, 'rainfall_3h': 10, 'wind_speed': 12
-                },
-                {
-                    'name': 'Heavy rain',
-                    'temperature': 24.0, 'humidity': 92, 'pressure': 1004,
-                    'rainfall_1h': 22, 'rainfall_3h': 50, 'wind_speed': 28
-                }
-            ]
+            scenario_features = BASIC_FEATURES
+            names = ['Sunny weather', 'Light rain', 'Heavy rain']
+            scenarios = np.array([
+                [29.0, 65, 1015, 0, 0, 8],
+                [27.0, 75, 1012, 4, 10, 12],
+                [24.0, 92, 1004, 22, 50, 28]
+            ], dtype=np.float32)
+        
+        # Run tests: pick the model's feature columns and predict every scenario in one call
+        X = scenarios[:, [scenario_features.index(f) for f in features]]
+        rainfall = X[:, features.index('rainfall_1h')]
+        
+        try:
+            predictions, probabilities = predict_batch(model, X)
+        except Exception as e:
+            print(f"Error predicting: {e}")
+            predictions = None
         
-        # Run tests
-        for scenario in test_scenarios:
-            name = scenario.pop('name')
-            result = predict_flood_risk(model, features, scenario, is_advanced)
+        if predictions is not None:
+            confidence = probabilities.max(axis=1)
             
-            if result:
-                if is_advanced:
-                    print(f"\n{name}:")
-                    if 'water_level' in scenario:
-                        print(f"  Data: Rainfall {scenario['rainfall_1h']}mm/h, Water level {scenario['water_level']}cm")
+            # Collect the whole report and write it to stdout once
+            out = []
+            
+            if is_advanced:
+                risk_labels = ['LOW', 'MODERATE', 'HIGH']
+                warning_codes = warning_levels(predictions, is_advanced)
+                water_level = X[:, features.index('water_level')] if 'water_level' in features else None
+                
+                for i, name in enumerate(names):
+                    risk_level = risk_labels[predictions[i]]
+                    out.append(f"\n{name}:")
+                    if water_level is not None:
+                        out.append(f"  Data: Rainfall {rainfall[i]:g}mm/h, Water level {water_level[i]:g}cm")
                     else:
-                        print(f"  Data: Rainfall {scenario['rainfall_1h']}mm/h")
-                    print(f"  Result: RISK {result['risk_level']}")
-                    print(f"  Probabilities per level:")
-                    for level, prob in result['probabilities'].items():
-                        print(f"    {level}: {prob:.1%}")
-                    print(f"  Confidence: {result['confidence']:.1%}")
+                        out.append(f"  Data: Rainfall {rainfall[i]:g}mm/h")
+                    out.append(f"  Result: RISK {risk_level}")
+                    out.append(f"  Probabilities per level:")
+                    for level, label in enumerate(risk_labels):
+                        prob = probabilities[i, level] if level < probabilities.shape[1] else 0.0
+                        out.append(f"    {label}: {prob:.1%}")
+                    out.append(f"  Confidence: {confidence[i]:.1%}")
                     
                     # Warning
-                    if result['risk_level'] == 'HIGH':
-                        print(f"  WARNING: High flood risk! Prepare preventive measures")
-                    elif result['risk_level'] == 'MODERATE':
-                        print(f"  Monitor: Monitor weather conditions")
-                        
+                    if warning_codes[i]:
+                        out.append(WARNING_MESSAGES[warning_codes[i]])
+            else:
+                if probabilities.shape[1] > 1:
+                    probability_flood = probabilities[:, 1]
                 else:
-                    risk_text, color = get_risk_level_text(result['probability_flood'], is_advanced)
-                    print(f"\n{name}:")
-                    print(f"  Data: Rainfall {scenario['rainfall_1h']:.1f}mm/h")
-                    print(f"  Result: RISK {risk_text}")
-                    print(f"  Flood probability: {result['probability_flood']:.1%}")
-                    print(f"  Confidence: {result['confidence']:.1%}")
+                    probability_flood = 1 - probabilities[:, 0]
+                
+                # Classify every scenario at once
+                risk_texts, colors = get_risk_level_text(probability_flood, is_advanced)
+                warning_codes = warning_levels(probability_flood, is_advanced)
+                
+                for i, name in enumerate(names):
+                    out.append(f"\n{name}:")
+                    out.append(f"  Data: Rainfall {rainfall[i]:.1f}mm/h")
+                    out.append(f"  Result: RISK {risk_texts[i]}")
+                    out.append(f"  Flood probability: {probability_flood[i]:.1%}")
+                    out.append(f"  Confidence: {confidence[i]:.1%}")
                     
                     # Warning
-                    if result['probability_flood'] > 0.6:
-                        print(f"  WARNING: High flood risk! Prepare preventive measures")
-                    elif result['probability_flood'] > 0.4:
-                        print(f"  Monitor: Monitor weather conditions")
+                    if warning_codes[i]:
+                        out.append(WARNING_MESSAGES[warning_codes[i]])
+            
+            sys.stdout.write("\n".join(out) + "\n")
+            sys.stdout.flush()
     
     print(f"\nCompleted prediction system ({'advanced' if is_advanced else 'basic'})")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main(retrain='--retrain' in sys.argv)
\ No newline at end of file
@@ -2,9 +2,9 @@ import os
 import json
 import requests
 import random  # Add this import for random data generation
-from datetime import datetime
+from datetime import date, datetime
 from dotenv import load_dotenv
-from setup_db import get_connection, close_connection
+from setup_db import get_connection, close_connection, refresh_daily_correlation
 import time
 
 # Load environment variables from .env
@@ -25,8 +25,8 @@ LOCATIONS = [
 
 def check_and_cleanup_database():
     """Check and clean up database if needed"""
+    conn = get_connection()
     try:
-        conn = get_connection()
         if not conn:
             return False
             
@@ -61,17 +61,18 @@ def check_and_cleanup_database():
             print(f"Cleaned up old records while keeping 3 newest per location per day")
         
         cursor.close()
-        close_connection(conn)
         return True
         
     except Exception as e:
         print(f"Error cleaning database: {e}")
         return False
+    finally:
+        close_connection(conn)
 
 def check_daily_record_count(location_name):
     """Check how many records exist for this location today"""
+    conn = get_connection()
     try:
-        conn = get_connection()
         if not conn:
             return 0
             
@@ -87,18 +88,19 @@ def check_daily_record_count(location_name):
         count = cursor.fetchone()[0]
         
         cursor.close()
-        close_connection(conn)
         
         return count
         
     except Exception as e:
         print(f"Error checking daily record count: {e}")
         return 0
+    finally:
+        close_connection(conn)
 
 def cleanup_excess_daily_records(location_name):
     """Keep only 3 newest records per location per day"""
+    conn = get_connection()
     try:
-        conn = get_connection()
         if not conn:
             return False
             
@@ -127,15 +129,16 @@ def cleanup_excess_daily_records(location_name):
             print(f"Cleaned up {deleted_count} excess records for {location_name}")
         
         cursor.close()
-        close_connection(conn)
         return True
         
     except Exception as e:
         print(f"Error cleaning up excess records: {e}")
         return False
+    finally:
+        close_connection(conn)
 
-def fetch_windy_data(lat, lon):
-    """Call Windy API to fetch weather data"""
+def fetch_windy_data(lat, lon, session=None):
+    """Call Windy API to fetch weather data (over session's kept-alive connections if given)"""
     if not WINDY_API_KEY:
         print("Error: WINDY_API_KEY not found in environment variables")
         return None
@@ -152,7 +155,7 @@ def fetch_windy_data(lat, lon):
     }
 
     try:
-        resp = requests.post(url, headers=headers, json=payload, timeout=20)
+        resp = (session or requests).post(url, headers=headers, json=payload, timeout=20)
         if resp.status_code != 200:
             print(f"API error {resp.status_code}: {resp.text}")
             return None
@@ -236,35 +239,41 @@ def process_windy_response(data):
 
 def save_to_database(location_name, lat, lon, precipitation_data):
     """Save data to database"""
+    saved = save_batch_to_database([(location_name, lat, lon, precipitation_data)])
+    if saved:
+        print(f"Data saved for {location_name}")
+    return saved
+
+def save_batch_to_database(rows):
+    """Save (location_name, lat, lon, precipitation_data) rows with one INSERT and one commit"""
+    conn = get_connection()
     try:
-        conn = get_connection()
         if not conn:
             print("Cannot connect to database")
             return False
             
         cursor = conn.cursor()
         
-        precipitation_json = json.dumps(precipitation_data)
-        
         query = """
         INSERT INTO rainfall_data (location_name, latitude, longitude, precipitation, created_at)
         VALUES (%s, %s, %s, %s, NOW())
         """
         
-        cursor.execute(query, (location_name, lat, lon, precipitation_json))
+        # executemany rewrites this into a single multi-row INSERT
+        values = [(name, lat, lon, json.dumps(data)) for name, lat, lon, data in rows]
+        cursor.executemany(query, values)
         conn.commit()
         
-        print(f"Data saved for {location_name}")
-        
         cursor.close()
-        close_connection(conn)
         return True
         
     except Exception as e:
         print(f"Error saving to database: {e}")
         return False
+    finally:
+        close_connection(conn)
 
-def main():
+def main(session=None):
     print("Starting to crawl data from Windy API...")
     
     # Step 1: Check and clean up database
@@ -288,6 +297,12 @@ def main():
     # Step 4: Crawl data
     MIN_DAILY_RECORDS = 3  # Minimum 3 records per day per location
     
+    # One session for every location so the API connection is reused
+    if session is None:
+        session = requests.Session()
+    
+    # Fetch every location first, then write them all in one batch
+    rows = []
     for location in LOCATIONS:
         print(f"\nCrawling data for {location['name']}...")
         
@@ -296,28 +311,29 @@ def main():
         print(f"Current records today for {location['name']}: {daily_count}")
         
         # Always crawl new data
-        weather_data = fetch_windy_data(location['lat'], location['lon'])
+        weather_data = fetch_windy_data(location['lat'], location['lon'], session)
         if weather_data:
-            saved = save_to_database(
-                location['name'], 
-                location['lat'], 
-                location['lon'], 
-                weather_data
-            )
-            
-            if saved:
-                # After saving, check if we have more than 3 records and clean up
-                new_count = check_daily_record_count(location['name'])
-                if new_count > MIN_DAILY_RECORDS:
-                    cleanup_excess_daily_records(location['name'])
-                    print(f"Kept only {MIN_DAILY_RECORDS} newest records for {location['name']}")
-            else:
-                print(f"Cannot save data for {location['name']}")
+            rows.append((location['name'], location['lat'], location['lon'], weather_data))
         else:
             print(f"No data received from Windy API for {location['name']}")
         
         time.sleep(2)  # Avoid spamming API
     
+    if rows and save_batch_to_database(rows):
+        print(f"\nData saved for {len(rows)} locations")
+        
+        # After saving, check if we have more than 3 records and clean up
+        for name, _, _, _ in rows:
+            new_count = check_daily_record_count(name)
+            if new_count > MIN_DAILY_RECORDS:
+                cleanup_excess_daily_records(name)
+                print(f"Kept only {MIN_DAILY_RECORDS} newest records for {name}")
+    elif rows:
+        print(f"Cannot save data for {len(rows)} locations")
+    
+    # Roll today's readings into the daily correlation table used by reports
+    refresh_daily_correlation(date.today())
+    
     print("\nData crawling completed!")
 
 if __name__ == "__main__":
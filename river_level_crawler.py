@@ -1,9 +1,9 @@
 import json
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 import random
 import math
-from setup_db import get_connection, close_connection
+from setup_db import get_connection, close_connection, refresh_daily_correlation
 import time
 
 # Updated RIVER_STATIONS with more realistic levels and lower volatility
@@ -117,8 +117,8 @@ RIVER_STATIONS = [
 
 def check_and_cleanup_database():
     """Check and clean up database if needed"""
+    conn = get_connection()
     try:
-        conn = get_connection()
         if not conn:
             return False
             
@@ -154,17 +154,18 @@ def check_and_cleanup_database():
             print(f"Cleaned up old records while keeping 3 newest per location per day")
         
         cursor.close()
-        close_connection(conn)
         return True
         
     except Exception as e:
         print(f"Error cleaning database: {e}")
         return False
+    finally:
+        close_connection(conn)
 
 def check_daily_record_count(location_name, river_name):
     """Check how many records exist for this location and river today"""
+    conn = get_connection()
     try:
-        conn = get_connection()
         if not conn:
             return 0
             
@@ -180,18 +181,19 @@ def check_daily_record_count(location_name, river_name):
         count = cursor.fetchone()[0]
         
         cursor.close()
-        close_connection(conn)
         
         return count
         
     except Exception as e:
         print(f"Error checking daily record count: {e}")
         return 0
+    finally:
+        close_connection(conn)
 
 def cleanup_excess_daily_records(location_name, river_name):
     """Keep only 3 newest records per location per day"""
+    conn = get_connection()
     try:
-        conn = get_connection()
         if not conn:
             return False
             
@@ -220,12 +222,13 @@ def cleanup_excess_daily_records(location_name, river_name):
             print(f"Cleaned up {deleted_count} excess records for {location_name} - {river_name}")
         
         cursor.close()
-        close_connection(conn)
         return True
         
     except Exception as e:
         print(f"Error cleaning up excess records: {e}")
         return False
+    finally:
+        close_connection(conn)
 
 def get_seasonal_factor():
     """Calculate seasonal factor (rainy/dry season)"""
@@ -431,8 +434,8 @@ def calculate_natural_flow_change(prev_level, station):
 
 def get_latest_weather_data(location_name):
     """Retrieve the latest weather data from the database"""
+    conn = get_connection()
     try:
-        conn = get_connection()
         if not conn:
             return None
             
@@ -451,7 +454,6 @@ def get_latest_weather_data(location_name):
         result = cursor.fetchone()
         
         cursor.close()
-        close_connection(conn)
         
         if result:
             # CHUYỂN ĐỔI TẤT CẢ DECIMAL THÀNH FLOAT
@@ -493,11 +495,13 @@ def get_latest_weather_data(location_name):
     except Exception as e:
         print(f"Error retrieving weather data: {e}")
         return None
+    finally:
+        close_connection(conn)
 
 def get_previous_river_level(location_name, river_name):
     """Retrieve the previous river level to determine trend"""
+    conn = get_connection()
     try:
-        conn = get_connection()
         if not conn:
             return None
             
@@ -514,7 +518,6 @@ def get_previous_river_level(location_name, river_name):
         result = cursor.fetchone()
         
         cursor.close()
-        close_connection(conn)
         
         if result:
             # CHUYỂN ĐỔI DECIMAL THÀNH FLOAT
@@ -527,6 +530,8 @@ def get_previous_river_level(location_name, river_name):
     except Exception as e:
         print(f"Error retrieving previous water level: {e}")
         return None
+    finally:
+        close_connection(conn)
 
 def simulate_river_level(station, weather_data):
     """Simulate river water level with smoothing for realistic changes"""
@@ -634,8 +639,15 @@ def simulate_river_level(station, weather_data):
 
 def save_river_level_data(station, river_data):
     """Save river water level data to the database"""
+    saved = save_river_level_batch([(station, river_data)])
+    if saved:
+        print(f"Successfully saved water level data for {station['location_name']} - {station['river_name']}")
+    return saved
+
+def save_river_level_batch(readings):
+    """Save (station, river_data) readings with one INSERT and one commit"""
+    conn = get_connection()
     try:
-        conn = get_connection()
         if not conn:
             print("Cannot connect to database")
             return False
@@ -650,7 +662,7 @@ def save_river_level_data(station, river_data):
         VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, NOW())
         """
         
-        values = (
+        values = [(
             station['location_name'],
             station['river_name'],
             station['latitude'],
@@ -663,20 +675,20 @@ def save_river_level_data(station, river_data):
             river_data['flow_rate'],
             river_data['trend'],
             'simulated_advanced'
-        )
-        
-        cursor.execute(query, values)
-        conn.commit();
+        ) for station, river_data in readings]
         
-        print(f"Successfully saved water level data for {station['location_name']} - {station['river_name']}")
+        # executemany rewrites this into a single multi-row INSERT
+        cursor.executemany(query, values)
+        conn.commit()
         
         cursor.close()
-        close_connection(conn)
         return True
         
     except Exception as e:
         print(f"Error saving water level data: {e}")
         return False
+    finally:
+        close_connection(conn)
 
 def main():
     print("=== STARTING RIVER WATER LEVEL CRAWL (ADVANCED) ===")
@@ -699,7 +711,8 @@ def main():
     total_stations = len(RIVER_STATIONS)
     MIN_DAILY_RECORDS = 3  # Minimum 3 records per day per location
     
-    # Crawl data for each measurement station
+    # Crawl data for each measurement station, then write all readings in one batch
+    readings = []
     for i, station in enumerate(RIVER_STATIONS, 1):
         print(f"\n[{i}/{total_stations}] Processing {station['location_name']} - {station['river_name']}...")
         
@@ -740,20 +753,7 @@ def main():
             else:
                 print(f"  Normal")
             
-            # Save to database
-            saved = save_river_level_data(station, river_data)
-            
-            if saved:
-                success_count += 1
-                print(f"  Saved successfully")
-                
-                # After saving, check if we have more than 3 records and clean up
-                new_count = check_daily_record_count(station['location_name'], station['river_name'])
-                if new_count > MIN_DAILY_RECORDS:
-                    cleanup_excess_daily_records(station['location_name'], station['river_name'])
-                    print(f"  Kept only {MIN_DAILY_RECORDS} newest records for {station['location_name']} - {station['river_name']}")
-            else:
-                print(f"  Failed to save data")
+            readings.append((station, river_data))
             
         except Exception as e:
             print(f"  Error processing {station['location_name']}: {e}")
@@ -762,6 +762,23 @@ def main():
         delay = np.random.uniform(1, 3)
         time.sleep(delay)
     
+    # Save to database
+    if readings and save_river_level_batch(readings):
+        success_count = len(readings)
+        print(f"\nSaved {success_count} readings successfully")
+        
+        # After saving, check if we have more than 3 records and clean up
+        for station, _ in readings:
+            new_count = check_daily_record_count(station['location_name'], station['river_name'])
+            if new_count > MIN_DAILY_RECORDS:
+                cleanup_excess_daily_records(station['location_name'], station['river_name'])
+                print(f"  Kept only {MIN_DAILY_RECORDS} newest records for {station['location_name']} - {station['river_name']}")
+    elif readings:
+        print(f"\nFailed to save data")
+    
+    # Roll today's readings into the daily correlation table used by reports
+    refresh_daily_correlation(date.today())
+    
     print(f"\n=== COMPLETED RIVER WATER LEVEL CRAWL ===")
     print(f"Success: {success_count}/{total_stations} stations")
     print(f"Completion time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
@@ -1,5 +1,9 @@
 import os
+import threading
+from datetime import date
+from contextlib import contextmanager
 import mysql.connector
+from mysql.connector import pooling
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -12,6 +16,17 @@ DB_CONF = {
     "autocommit": True
 }
 
+# Stored columns generated from rainfall_data.precipitation: (name, JSON key)
+# DOUBLE keeps the JSON values at full precision; Windy reports rainfall as small as 0.0003
+RAINFALL_COLUMNS = [
+    ("temperature", "temperature"),
+    ("humidity", "humidity"),
+    ("pressure", "pressure"),
+    ("rainfall_1h", "rainfall_1h"),
+    ("rainfall_3h", "rainfall_3h"),
+    ("wind_speed", "wind_speed"),
+]
+
 def create_database():
     """Create the windy_data database if it doesn't exist"""
     try:
@@ -93,13 +108,32 @@ def create_tables():
             recommendations TEXT COMMENT 'Khuyến nghị hành động',
             model_version VARCHAR(20) DEFAULT 'v1.0',
             INDEX idx_location_time (location_name, prediction_time),
+            INDEX idx_prediction_time (prediction_time),
             INDEX idx_risk_level (risk_level)
         )
         """
         
+        # Bảng tổng hợp theo ngày cho biểu đồ tương quan mưa - mực nước
+        daily_correlation_table = """
+        CREATE TABLE IF NOT EXISTS daily_correlation (
+            location_name VARCHAR(100) NOT NULL,
+            day DATE NOT NULL,
+            avg_rainfall DECIMAL(6, 2),
+            avg_water DECIMAL(6, 2),
+            PRIMARY KEY (location_name, day),
+            INDEX idx_day (day)
+        )
+        """
+        
         cursor.execute(rainfall_table)
         cursor.execute(river_level_table)
         cursor.execute(flood_prediction_table)
+        cursor.execute(daily_correlation_table)
+        add_rainfall_columns(cursor)
+        # Newest-first listings scan this backwards instead of sorting the table
+        add_index(cursor, 'flood_predictions', 'idx_prediction_time', 'prediction_time')
+        # Backfill the daily rollup from whatever is already stored
+        update_daily_correlation(cursor)
         
         print("All tables created successfully")
         
@@ -112,8 +146,95 @@ def create_tables():
     
     return True
 
+def add_rainfall_columns(cursor):
+    """Add the generated precipitation columns (widening older DECIMAL ones) and their index to rainfall_data"""
+    cursor.execute("""
+        SELECT column_name, data_type FROM information_schema.columns
+        WHERE table_schema = DATABASE() AND table_name = 'rainfall_data'
+    """)
+    existing = {name: data_type.lower() for name, data_type in cursor.fetchall()}
+    
+    for name, key in RAINFALL_COLUMNS:
+        # Columns created as DECIMAL by an older setup are widened to DOUBLE in place
+        action = "ADD" if name not in existing else "MODIFY" if existing[name] != 'double' else None
+        if action:
+            cursor.execute(f"""
+                ALTER TABLE rainfall_data {action} COLUMN {name} DOUBLE
+                GENERATED ALWAYS AS (CAST(JSON_UNQUOTE(JSON_EXTRACT(precipitation, '$.{key}')) AS DOUBLE)) STORED
+            """)
+            print(f"{'Added' if action == 'ADD' else 'Widened'} column rainfall_data.{name}")
+    
+    add_index(cursor, 'rainfall_data', 'idx_date_rainfall', 'created_at, rainfall_1h')
+
+def add_index(cursor, table, index_name, columns):
+    """Add an index to an existing table unless it is already there"""
+    cursor.execute("""
+        SELECT COUNT(*) FROM information_schema.statistics
+        WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s
+    """, (table, index_name))
+    if cursor.fetchone()[0] == 0:
+        cursor.execute(f"ALTER TABLE {table} ADD INDEX {index_name} ({columns})")
+        print(f"Added index {table}.{index_name}")
+
+def update_daily_correlation(cursor, since=None):
+    """Recompute daily_correlation for every day on or after since (all days if None)"""
+    since = since or date(1970, 1, 2)
+    cursor.execute("""
+        INSERT INTO daily_correlation (location_name, day, avg_rainfall, avg_water)
+        SELECT w.location_name, w.day, rf.avg_rainfall, w.avg_water
+        FROM (
+            SELECT location_name, DATE(created_at) AS day, AVG(water_level) AS avg_water
+            FROM river_level_data
+            WHERE created_at >= %s
+            GROUP BY location_name, DATE(created_at)
+        ) w
+        JOIN (
+            SELECT location_name, DATE(created_at) AS day, AVG(rainfall_1h) AS avg_rainfall
+            FROM rainfall_data
+            WHERE created_at >= %s AND rainfall_1h IS NOT NULL
+            GROUP BY location_name, DATE(created_at)
+        ) rf ON rf.location_name = w.location_name AND rf.day = w.day
+        ON DUPLICATE KEY UPDATE avg_rainfall = rf.avg_rainfall, avg_water = w.avg_water
+    """, (since, since))
+
+def refresh_daily_correlation(since=None):
+    """Update the daily rainfall/water level rollup after new data is stored"""
+    conn = get_connection()
+    try:
+        if not conn:
+            return False
+        
+        cursor = conn.cursor()
+        
+        # Databases set up before the rollup existed have neither the table nor the
+        # generated rainfall_1h column it reads; skip until Setup Database is re-run
+        cursor.execute("""
+            SELECT COUNT(*) FROM information_schema.tables
+            WHERE table_schema = DATABASE() AND table_name = 'daily_correlation'
+        """)
+        if cursor.fetchone()[0] == 0:
+            print("Skipping daily correlation update: run Setup Database to create daily_correlation")
+            cursor.close()
+            return False
+        
+        update_daily_correlation(cursor, since)
+        conn.commit()
+        
+        cursor.close()
+        return True
+        
+    except mysql.connector.Error as err:
+        print(f"Error updating daily correlation: {err}")
+        return False
+    finally:
+        close_connection(conn)
+
 def get_connection():
-    """Get connection to windy_data database"""
+    """Get connection to windy_data database (borrowed from DB_POOL when one is free)"""
+    return DB_POOL.get_connection()
+
+def connect():
+    """Open a dedicated connection to windy_data database"""
     try:
         db_conf_with_db = DB_CONF.copy()
         db_conf_with_db['database'] = 'windy_data'
@@ -124,14 +245,72 @@ def get_connection():
         return None
 
 def close_connection(conn):
-    """Close database connection"""
-    if conn and conn.is_connected():
+    """Close database connection (pooled connections go back to the pool)"""
+    if conn:
+        try:
+            # A query that failed midway can leave rows unread; the pool hands the
+            # connection out again as it is, so drain them first
+            if conn.unread_result:
+                conn.consume_results()
+        except mysql.connector.Error:
+            pass
         conn.close()
 
+class DBPool:
+    """Pool of open connections to the windy_data database"""
+    
+    def __init__(self, pool_size=5, pool_name="gui", reset_session=False):
+        self.pool_size = pool_size
+        self.pool_name = pool_name
+        self.reset_session = reset_session
+        self._pool = None
+        self._lock = threading.Lock()
+    
+    def _get_pool(self):
+        """Create the underlying pool on first use"""
+        with self._lock:
+            if self._pool is None:
+                db_conf_with_db = DB_CONF.copy()
+                db_conf_with_db['database'] = 'windy_data'
+                self._pool = pooling.MySQLConnectionPool(pool_name=self.pool_name,
+                                                         pool_size=self.pool_size,
+                                                         pool_reset_session=self.reset_session,
+                                                         **db_conf_with_db)
+        return self._pool
+    
+    def get_connection(self):
+        """Borrow a connection, or open a dedicated one when every pooled connection is in use"""
+        try:
+            return self._get_pool().get_connection()
+        except pooling.PoolError:
+            # Every pooled connection is checked out; a leak shows up here first
+            print(f"Connection pool '{self.pool_name}' exhausted ({self.pool_size} in use), "
+                  f"opening a dedicated connection")
+            return connect()
+        except mysql.connector.Error as err:
+            print(f"Error connecting to database: {err}")
+            return None
+    
+    @contextmanager
+    def acquire(self):
+        """Borrow a connection (None if unavailable) and return it to the pool"""
+        conn = self.get_connection()
+        try:
+            yield conn
+        except Exception:
+            if conn:
+                conn.rollback()
+            raise
+        finally:
+            close_connection(conn)
+
+# Shared by the GUI and its worker threads; sized to cover both executors
+DB_POOL = DBPool(pool_size=8, pool_name="fp")
+
 def test_connection():
     """Test the database connection and show tables"""
+    conn = get_connection()
     try:
-        conn = get_connection()
         if not conn:
             return False
             
@@ -144,11 +323,12 @@ def test_connection():
             print(f"  - {table[0]}")
             
         cursor.close()
-        close_connection(conn)
         
     except mysql.connector.Error as err:
         print(f"Error testing connection: {err}")
         return False
+    finally:
+        close_connection(conn)
     
     return True
 
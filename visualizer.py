@@ -5,11 +5,13 @@ from setup_db import get_connection
 
 def get_recent_rows(limit=50):
     conn = get_connection()
-    cur = conn.cursor(dictionary=True)
-    cur.execute("SELECT id, location_name, precipitation, created_at FROM rainfall_data ORDER BY created_at DESC LIMIT %s", (limit,))
-    rows = cur.fetchall()
-    cur.close()
-    conn.close()
+    try:
+        cur = conn.cursor(dictionary=True)
+        cur.execute("SELECT id, location_name, precipitation, created_at FROM rainfall_data ORDER BY created_at DESC LIMIT %s", (limit,))
+        rows = cur.fetchall()
+        cur.close()
+    finally:
+        conn.close()
     return rows
 
 def extract_series(precip_json):
@@ -25,19 +27,22 @@ def extract_series(precip_json):
     return ts, vals
 
 def build_dataframe(rows):
-    records = []
+    locations, times, rain = [], [], []
     for r in rows:
         ts, vals = extract_series(r["precipitation"])
-        for t, v in zip(ts, vals):
-            # Windy ts typically epoch seconds
-            try:
-                t_dt = pd.to_datetime(t, unit="s")
-            except:
-                t_dt = pd.to_datetime(t)
-            records.append({"location": r["location_name"], "time": t_dt, "rain_mm": float(v) if v is not None else 0.0})
-    if not records:
+        n = min(len(ts), len(vals))
+        locations.extend([r["location_name"]] * n)
+        times.extend(ts[:n])
+        rain.extend(vals[:n])
+    if not times:
         return pd.DataFrame(columns=["location", "time", "rain_mm"])
-    df = pd.DataFrame(records)
+    # Convert all timestamps and values at once; Windy ts typically epoch seconds
+    try:
+        time = pd.to_datetime(times, unit="s")
+    except (ValueError, TypeError):
+        time = pd.to_datetime(times)
+    df = pd.DataFrame({"location": locations, "time": time,
+                       "rain_mm": pd.Series(rain, dtype=float).fillna(0.0)})
     return df
 
 def plot_timeseries(df):